@@ -1,14 +1,37 @@
 # app/celery_app.py
 from celery import Celery
+from celery.signals import worker_init, worker_shutdown
+from kombu import Queue
+from kombu.serialization import register
+import logging
+import orjson
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.config import load_env
+
+load_env()
+
+logger = logging.getLogger(__name__)
 
 # Redis connection
 # REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+# Single submissions go to the interactive queue, /jobs/batch to the batch
+# queue, so a large backfill can't sit in front of a job someone is waiting on
+INTERACTIVE_QUEUE = "jobs_interactive"
+BATCH_QUEUE = "jobs_batch"
+
+# orjson encodes/decodes the (fairly large) pipeline results several times
+# faster than the stdlib json serializer; "json" stays accepted so messages
+# and results written before the switch still decode
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
 
 celery_app = Celery(
     "job_bot",
@@ -19,14 +42,60 @@ celery_app = Celery(
 
 # Celery config
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],
+    result_accept_content=["orjson", "json"],
+    result_serializer="orjson",
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     task_time_limit=1800,  # 30 min hard limit
     task_soft_time_limit=1500,  # 25 min soft limit
     result_expires=3600,  # Results expire after 1 hour
-    worker_pool="solo",  # Use solo pool instead of prefork (fixes event loop issues)
+    # Pipeline is I/O-bound (scraping, LLM, Notion, Supabase), so use threads
+    # instead of prefork; tasks share one worker event loop (app/tasks.py)
+    worker_pool="threads",
+    worker_concurrency=int(os.getenv("CELERY_CONCURRENCY", "16")),
+    # Enough broker connections for every worker thread plus publishers
+    broker_pool_limit=32,
+    # Workers consume the queues in this order: batch jobs only run while no
+    # interactive job is waiting ("celery" drains messages sent before the split)
+    task_queues=(Queue(INTERACTIVE_QUEUE), Queue(BATCH_QUEUE), Queue("celery")),
+    task_default_queue=INTERACTIVE_QUEUE,
+    broker_transport_options={"queue_order_strategy": "priority"},
+    # Don't reserve a backlog of batch jobs ahead of later interactive ones
+    worker_prefetch_multiplier=1,
 )
+
+
+@worker_init.connect
+def _warm_browser(**kwargs):
+    """Launch the shared Chromium before the first job arrives."""
+    from services.browser_pool_service import warm_browser
+
+    try:
+        warm_browser()
+    except Exception as e:
+        # Not fatal: the pool launches lazily on first use
+        logger.warning(f"Browser warm-up failed: {e}")
+
+
+@worker_init.connect
+def _warm_master_resume(**kwargs):
+    """Read the master resume once so the first tailoring call hits the cache."""
+    from services.llm_resume_service import load_master_resume
+
+    try:
+        load_master_resume()
+    except Exception as e:
+        logger.warning(f"Master resume warm-up failed: {e}")
+
+
+@worker_shutdown.connect
+def _close_browser(**kwargs):
+    from services.browser_pool_service import close_browser
+
+    try:
+        close_browser()
+    except Exception as e:
+        logger.warning(f"Browser shutdown failed: {e}")
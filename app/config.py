@@ -0,0 +1,38 @@
+# app/config.py
+import logging
+import os
+
+from dotenv import load_dotenv
+
+# Defensive map (avoids invalid strings breaking logging)
+LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+}
+
+
+def load_env():
+    """
+    Load .env into the environment once per process tree.
+    DOTENV_LOADED is inherited by forked/spawned workers, so they skip re-parsing.
+    """
+    if os.getenv("DOTENV_LOADED") != "1":
+        load_dotenv(override=False)
+        os.environ["DOTENV_LOADED"] = "1"
+
+
+def configure_logging():
+    """
+    Set up root logging from LOG_LEVEL. Called once, from the API entrypoint.
+    """
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+
+    logging.basicConfig(
+        level=LOG_LEVELS.get(log_level, logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    logging.getLogger("app.main").debug("🔧 Logging level set to: %s", log_level)
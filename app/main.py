@@ -1,43 +1,56 @@
 # app/main.py
-from fastapi import FastAPI
 import logging
-import os
+import time
 
-from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 
-# Load environment variables
-load_dotenv()
+from app.config import load_env, configure_logging
 
-# # Set up logging
-# logging.basicConfig(
-#     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-# )
+# Load environment variables before any service reads them at import
+load_env()
+configure_logging()
 
-# Set up logging level from environment
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+from app.routes import router
+from services.http_client_service import get_http, close_http
+from services.cache_service import close_async_redis
 
-# Defensive map (avoids invalid strings breaking logging)
-LOG_LEVELS = {
-    "CRITICAL": logging.CRITICAL,
-    "ERROR": logging.ERROR,
-    "WARNING": logging.WARNING,
-    "INFO": logging.INFO,
-    "DEBUG": logging.DEBUG,
-}
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=LOG_LEVELS.get(log_level, logging.INFO),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Requests slower than this are logged (replaces the per-request access log)
+SLOW_REQUEST_SECONDS = 1.0
 
-print(f"🔧 Logging level set to: {log_level}")
+app = FastAPI(title="Job Bot API", default_response_class=ORJSONResponse)
 
+app.include_router(router)
 
-app = FastAPI(title="Job Bot API")
 
-from app.routes import router
-
-app.include_router(router)
+@app.middleware("http")
+async def log_slow_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    if elapsed > SLOW_REQUEST_SECONDS:
+        logger.warning(
+            "🐢 Slow request: %s %s took %.2fs (status %s)",
+            request.method,
+            request.url.path,
+            elapsed,
+            response.status_code,
+        )
+    return response
+
+
+@app.on_event("startup")
+async def _init_http_client():
+    # Warm the shared HTTP client on the server's event loop
+    get_http()
+
+
+@app.on_event("shutdown")
+async def _close_clients():
+    await close_http()
+    await close_async_redis()
 
 
 @app.get("/ping")
@@ -1,63 +1,171 @@
 # app/routes.py
+from collections import Counter
 from typing import List
+import asyncio
+import re
 import time
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel, HttpUrl
+from uuid import uuid4
+import orjson
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from app.celery_app import BATCH_QUEUE, celery_app
+from app.schemas import JobURLInput, JobBatchInput, JobAddResponse
 from app.tasks import process_job_task
-from celery.result import AsyncResult
+from services.duplicate_checker_service import check_jobs_exist_batch
+from services.cache_service import (
+    get_async_redis,
+    async_cache_get_json,
+    async_cache_set_json,
+)
+from celery import group
+from celery.result import GroupResult
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-class JobURLInput(BaseModel):
-    url: HttpUrl
-    force_playwright: bool = False
+@router.post(
+    "/jobs/add",
+    status_code=202,
+    response_model=JobAddResponse,
+    response_model_exclude_none=True,
+)
+async def add_job(
+    job_input: JobURLInput, background_tasks: BackgroundTasks
+) -> JobAddResponse:
+    """
+    Submit a job for async processing
+    Returns 202 Accepted immediately with job_id; poll check_status_url for progress
+    """
+    try:
+        logger.info(f"Queueing job: {job_input.url_str}")
+
+        # Queue the task after the response is sent; the id is generated here so
+        # the client can start polling right away (it reads as pending until then)
+        task_id = uuid4().hex
+        background_tasks.add_task(
+            _publish,
+            process_job_task.signature(
+                args=[
+                    job_input.url_str,
+                    job_input.force_playwright,
+                    job_input.force_refresh,
+                ],
+                task_id=task_id,
+            ),
+            [task_id],
+        )
 
+        return JobAddResponse(
+            status="queued",
+            job_id=task_id,
+            message="Job queued for processing",
+            url=job_input.url_str,
+            check_status_url=f"/jobs/{task_id}/status",
+        )
 
-class JobBatchInput(BaseModel):
-    urls: List[HttpUrl]
-    force_playwright: bool = False
+    except Exception:
+        logger.exception("add_job failed")
+        raise HTTPException(status_code=500, detail="internal error")
 
 
-@router.post("/jobs/add")
-async def add_job(job_input: JobURLInput):
+def _publish(signature, task_ids: List[str]):
     """
-    Submit a job for async processing
-    Returns immediately with job_id
+    Send a task/group to the broker (runs in the threadpool after the response).
+    If the broker is unreachable the jobs are marked failed so polling clients
+    see the error instead of a job that stays pending forever.
     """
     try:
-        logger.info(f"Queueing job: {job_input.url}")
+        result = signature.apply_async()
+        if isinstance(result, GroupResult):
+            # Store the group's membership for /groups/{group_id}/status
+            result.save()
+    except Exception as e:
+        logger.exception("Failed to publish %d job(s)", len(task_ids))
+        for task_id in task_ids:
+            celery_app.backend.mark_as_failure(task_id, e)
 
-        # Queue the task
-        task = process_job_task.apply_async(
-            args=[str(job_input.url), job_input.force_playwright]
-        )
 
-        return {
-            "status": "queued",
-            "job_id": task.id,
-            "message": "Job queued for processing",
-            "url": str(job_input.url),
-            "check_status_url": f"/jobs/{task.id}/status",
-        }
+async def _prewarm_duplicate_cache(urls: List[str]):
+    """
+    Warm the duplicate cache for a batch with one OR-filtered Notion query per
+    100 URLs, so most of the tasks' own checks are cache hits. Best effort:
+    tasks that start first simply query Notion themselves.
+    """
+    try:
+        await check_jobs_exist_batch(urls)
+    except Exception:
+        logger.exception("Duplicate cache prewarm failed for %d job(s)", len(urls))
 
-    except Exception as e:
-        logger.error(f"Error queueing job: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+
+# Celery states after which a job's meta never changes again
+TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+# Upper bound for ?wait= long-polling on the status endpoint
+MAX_STATUS_WAIT_SECONDS = 30
+
+
+async def _read_task_meta(job_id: str) -> dict | None:
+    """Read a task's result meta with a single GET (None if unknown/queued)."""
+    backend = celery_app.backend
+    raw_meta = await get_async_redis().get(backend.get_key_for_task(job_id))
+    return backend.decode_result(raw_meta) if raw_meta else None
+
+
+async def _wait_for_task_meta(job_id: str, timeout: float) -> dict | None:
+    """
+    Wait until the task reaches a terminal state (or timeout), returning the
+    latest meta seen. The Redis result backend publishes every stored meta on
+    the channel named after its key (no keyspace notifications needed), so
+    this replaces client-side polling with one SUBSCRIBE.
+    """
+    backend = celery_app.backend
+    key = backend.get_key_for_task(job_id)
+
+    pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(key)
+
+        # Re-read after subscribing so an update landing in between isn't missed
+        meta = await _read_task_meta(job_id)
+        if meta and meta["status"] in TERMINAL_STATES:
+            return meta
+
+        # Progress updates arrive on the same channel; keep reading until a
+        # terminal state or the deadline. get_message also returns None for the
+        # (ignored) subscribe confirmation, hence the loop.
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = await pubsub.get_message(timeout=remaining)
+            if message:
+                meta = backend.decode_result(message["data"])
+                if meta["status"] in TERMINAL_STATES:
+                    return meta
+        return meta
+    finally:
+        await pubsub.aclose()
 
 
 @router.get("/jobs/{job_id}/status")
-async def get_job_status(job_id: str):
+async def get_job_status(job_id: str, wait: float = 0):
     """
     Check detailed status of a queued/processing job
     Returns stage, progress, and result information
+
+    Pass ?wait=<seconds> to hold the request until the job finishes (capped at
+    30s) instead of polling repeatedly; the latest progress is returned on timeout.
     """
     try:
-        task_result = AsyncResult(job_id)
+        meta = await _read_task_meta(job_id)
+
+        if wait > 0 and (meta is None or meta["status"] not in TERMINAL_STATES):
+            meta = await _wait_for_task_meta(job_id, min(wait, MAX_STATUS_WAIT_SECONDS))
+
+        # Read the meta once into locals instead of re-fetching per attribute
+        state = meta["status"] if meta else "PENDING"
+        info = meta.get("result") if meta else None
 
-        if task_result.state == "PENDING":
+        if state == "PENDING":
             return {
                 "job_id": job_id,
                 "status": "pending",
@@ -66,9 +174,9 @@ async def get_job_status(job_id: str):
                 "progress": 0,
             }
 
-        elif task_result.state in ["STARTED", "PROCESSING"]:
+        elif state in ["STARTED", "PROCESSING"]:
             # Get custom metadata from task
-            info = task_result.info or {}
+            info = info or {}
             stage = info.get("stage", "unknown")
             progress = info.get("progress", 0)
 
@@ -81,8 +189,8 @@ async def get_job_status(job_id: str):
                 "meta": info,  # Include full metadata for debugging
             }
 
-        elif task_result.state == "SUCCESS":
-            result = task_result.result
+        elif state == "SUCCESS":
+            result = info
 
             # Determine result_status from result dict
             result_status = None
@@ -99,8 +207,8 @@ async def get_job_status(job_id: str):
                 "message": "Job completed successfully",
             }
 
-        elif task_result.state == "FAILURE":
-            error_info = str(task_result.info)
+        elif state == "FAILURE":
+            error_info = str(celery_app.backend.exception_to_python(info))
             return {
                 "job_id": job_id,
                 "status": "failed",
@@ -114,52 +222,59 @@ async def get_job_status(job_id: str):
             # Handle any other Celery states (RETRY, REVOKED, etc.)
             return {
                 "job_id": job_id,
-                "status": task_result.state.lower(),
-                "stage": task_result.state.lower(),
-                "message": f"Job is {task_result.state}",
+                "status": state.lower(),
+                "stage": state.lower(),
+                "message": f"Job is {state}",
                 "progress": 0,
             }
 
-    except Exception as e:
-        logger.error(f"Error checking job status: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("get_job_status failed")
+        raise HTTPException(status_code=500, detail="internal error")
 
 
 @router.post("/jobs/batch")
-async def add_job_batch(batch_input: JobBatchInput):
+async def add_job_batch(batch_input: JobBatchInput, background_tasks: BackgroundTasks):
     """
     Queue multiple jobs at once.
     Returns immediately with all job_ids for tracking.
     """
-    job_results = []
-    success_count = 0
+    urls = [str(url) for url in batch_input.urls]
+    task_ids = [uuid4().hex for _ in urls]
 
-    logger.info(f"Queueing batch of {len(batch_input.urls)} jobs")
+    logger.info(f"Queueing batch of {len(urls)} jobs")
 
-    for url in batch_input.urls:
-        try:
-            task = process_job_task.apply_async(
-                args=[str(url), batch_input.force_playwright]
-            )
-            job_results.append(
-                {
-                    "job_id": task.id,
-                    "url": str(url),
-                    "status": "queued",
-                    "status_url": f"/jobs/{task.id}/status",
-                }
-            )
-            success_count += 1
-            logger.info(f"Queued job {task.id} for {url}")
-
-        except Exception as e:
-            logger.error(f"Failed to queue {url}: {e}")
-            job_results.append(
-                {"url": str(url), "error": str(e), "status": "failed_to_queue"}
-            )
+    job_results = [
+        {
+            "job_id": task_id,
+            "url": url,
+            "status": "queued",
+            "status_url": f"/jobs/{task_id}/status",
+        }
+        for task_id, url in zip(task_ids, urls)
+    ]
+    success_count = len(job_results)
+
+    # Ids are generated locally; the whole batch is published as one group
+    # through a single producer/connection after the response is sent
+    group_id = uuid4().hex
+    batch_group = group(
+        process_job_task.signature(
+            args=[url, batch_input.force_playwright, batch_input.force_refresh],
+            task_id=task_id,
+            queue=BATCH_QUEUE,
+        )
+        for task_id, url in zip(task_ids, urls)
+    )
+    # Background tasks run in order: publish first so a slow or failing
+    # Notion lookup can never keep the group from being queued
+    background_tasks.add_task(_publish, batch_group.set(task_id=group_id), task_ids)
+    background_tasks.add_task(_prewarm_duplicate_cache, urls)
 
     return {
         "status": "batch_queued",
+        "group_id": group_id,
+        "group_status_url": f"/groups/{group_id}/status",
         "total_submitted": len(batch_input.urls),
         "total_queued": success_count,
         "total_failed": len(batch_input.urls) - success_count,
@@ -168,34 +283,54 @@ async def add_job_batch(batch_input: JobBatchInput):
     }
 
 
-@router.post("/jobs/batch/status")
-async def get_batch_status(job_ids: List[str]):
-    """
-    Check status of multiple jobs at once
-    Returns summary stats and basic status for each job
+# Celery writes "status" first in the stored meta, so a short prefix is enough
+META_STATUS_PREFIX_BYTES = 64
+META_STATUS_RE = re.compile(rb'"status":\s*"([A-Z_]+)"')
 
-    For detailed status (stage, progress), use individual /jobs/{job_id}/status endpoint
+
+def _normalize_state(state: str) -> str:
+    """Map a Celery state to the batch endpoint's status vocabulary."""
+    if state == "PENDING":
+        return "pending"
+    elif state in ["STARTED", "PROCESSING"]:
+        return "processing"
+    elif state == "SUCCESS":
+        return "success"
+    elif state == "FAILURE":
+        return "failure"
+    else:
+        return state.lower()
+
+
+def _summarize_counts(counts: Counter) -> dict:
+    return {
+        "completed": counts["success"],
+        "failed": counts["failure"],
+        "processing": counts["processing"],
+        "pending": counts["pending"],
+        "error": counts["error"],
+    }
+
+
+async def _collect_job_statuses(job_ids: List[str], counts: Counter) -> list[dict]:
+    """
+    Read every job's state with one MGET instead of a GET per AsyncResult.
+    Tallies each normalized status into counts in the same pass.
     """
+    backend = celery_app.backend
+    raw_metas = await get_async_redis().mget(
+        [backend.get_key_for_task(jid) for jid in job_ids]
+    )
+
     results = []
 
-    for job_id in job_ids:
+    for job_id, raw_meta in zip(job_ids, raw_metas):
         try:
-            task_result = AsyncResult(job_id)
-
-            # Get basic state
-            state = task_result.state
+            # Celery has no record of unknown/queued tasks, same as AsyncResult
+            state = backend.decode_result(raw_meta)["status"] if raw_meta else "PENDING"
 
             # Normalize state to standard status
-            if state == "PENDING":
-                status = "pending"
-            elif state in ["STARTED", "PROCESSING"]:
-                status = "processing"
-            elif state == "SUCCESS":
-                status = "success"
-            elif state == "FAILURE":
-                status = "failure"
-            else:
-                status = state.lower()
+            status = _normalize_state(state)
 
             results.append(
                 {
@@ -207,22 +342,65 @@ async def get_batch_status(job_ids: List[str]):
 
         except Exception as e:
             logger.error(f"Error checking status for job {job_id}: {e}")
+            status = "error"
             results.append(
                 {
                     "job_id": job_id,
-                    "status": "error",
+                    "status": status,
                     "error": str(e),
                 }
             )
 
+        counts[status] += 1
+
+    return results
+
+
+@router.post("/jobs/batch/status")
+async def get_batch_status(job_ids: List[str], summary_only: bool = False):
+    """
+    Check status of multiple jobs at once
+    Returns summary stats and basic status for each job
+
+    Pass ?summary_only=true to get just the counts; only the first bytes of
+    each job's result are read instead of the full (possibly large) blob.
+
+    For detailed status (stage, progress), use individual /jobs/{job_id}/status endpoint
+    """
+    counts = Counter()
+
+    if summary_only:
+        backend = celery_app.backend
+        pipe = get_async_redis().pipeline(transaction=False)
+        for job_id in job_ids:
+            key = backend.get_key_for_task(job_id)
+            pipe.getrange(key, 0, META_STATUS_PREFIX_BYTES - 1)
+        prefixes = await pipe.execute()
+
+        for prefix in prefixes:
+            # Missing key reads as b"": Celery has no record of queued tasks
+            match = META_STATUS_RE.search(prefix) if prefix else None
+            if prefix and not match:
+                counts["error"] += 1
+                continue
+            state = match.group(1).decode() if match else "PENDING"
+            counts[_normalize_state(state)] += 1
+
+        status_counts = _summarize_counts(counts)
+        return {
+            "total": len(job_ids),
+            "summary": status_counts,
+            "completed": status_counts["completed"],
+            "failed": status_counts["failed"],
+            "processing": status_counts["processing"],
+            "pending": status_counts["pending"],
+            "message": f"Summary retrieved for {len(job_ids)} jobs",
+        }
+
+    results = await _collect_job_statuses(job_ids, counts)
+
     # Calculate summary statistics
-    status_counts = {
-        "completed": len([r for r in results if r["status"] == "success"]),
-        "failed": len([r for r in results if r["status"] == "failure"]),
-        "processing": len([r for r in results if r["status"] == "processing"]),
-        "pending": len([r for r in results if r["status"] == "pending"]),
-        "error": len([r for r in results if r["status"] == "error"]),
-    }
+    status_counts = _summarize_counts(counts)
 
     return {
         "total": len(job_ids),
@@ -236,6 +414,37 @@ async def get_batch_status(job_ids: List[str]):
     }
 
 
+@router.get("/groups/{group_id}/status")
+async def get_group_status(group_id: str):
+    """
+    Check status of a batch submitted via /jobs/batch using its group_id
+    Resolves the group's job ids once, then reads all states with one MGET
+    """
+    group_result = await asyncio.to_thread(
+        GroupResult.restore, group_id, app=celery_app
+    )
+    if group_result is None:
+        # The group meta is saved right after publishing, so it may not exist yet
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    job_ids = [result.id for result in group_result.results]
+    counts = Counter()
+    results = await _collect_job_statuses(job_ids, counts)
+    status_counts = _summarize_counts(counts)
+
+    finished = status_counts["completed"] + status_counts["failed"] + counts["revoked"]
+
+    return {
+        "group_id": group_id,
+        "total": len(job_ids),
+        "ready": finished == len(job_ids),
+        "completed_count": status_counts["completed"],
+        "summary": status_counts,
+        "jobs": results,
+        "message": f"{finished}/{len(job_ids)} jobs finished",
+    }
+
+
 @router.post("/jobs/{job_id}/retry")
 async def retry_job(job_id: str):
     """
@@ -245,12 +454,13 @@ async def retry_job(job_id: str):
     Client should re-submit via /jobs/add endpoint with the original URL.
     """
     try:
-        task_result = AsyncResult(job_id)
+        meta = await _read_task_meta(job_id)
+        state = meta["status"] if meta else "PENDING"
 
-        if task_result.state != "FAILURE":
+        if state != "FAILURE":
             raise HTTPException(
                 status_code=400,
-                detail=f"Job is {task_result.state}, not failed. Only failed jobs can be retried.",
+                detail=f"Job is {state}, not failed. Only failed jobs can be retried.",
             )
 
         # Celery doesn't store original task args by default
@@ -259,7 +469,7 @@ async def retry_job(job_id: str):
             "status": "retry_not_supported",
             "message": "Please resubmit the job URL via POST /jobs/add endpoint",
             "job_id": job_id,
-            "current_state": task_result.state,
+            "current_state": state,
             "suggestion": "Use the original URL and POST to /jobs/add to queue a new job",
         }
 
@@ -276,23 +486,24 @@ async def cancel_job(job_id: str):
     Cancel a pending or running job
     """
     try:
-        task_result = AsyncResult(job_id)
+        meta = await _read_task_meta(job_id)
+        state = meta["status"] if meta else "PENDING"
 
-        if task_result.state in ["PENDING", "STARTED", "PROCESSING"]:
-            # Revoke the task
-            task_result.revoke(terminate=True)
+        if state in ["PENDING", "STARTED", "PROCESSING"]:
+            # Revoke the task (broadcast to workers, off the event loop)
+            await asyncio.to_thread(celery_app.control.revoke, job_id, terminate=True)
 
             return {
                 "status": "cancelled",
                 "job_id": job_id,
-                "message": f"Job cancelled (was {task_result.state})",
+                "message": f"Job cancelled (was {state})",
             }
         else:
             return {
                 "status": "cannot_cancel",
                 "job_id": job_id,
-                "current_state": task_result.state,
-                "message": f"Job is {task_result.state} and cannot be cancelled",
+                "current_state": state,
+                "message": f"Job is {state} and cannot be cancelled",
             }
 
     except Exception as e:
@@ -300,34 +511,47 @@ async def cancel_job(job_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Everything but the timestamp is static, so the body is serialized once and
+# the timestamp is spliced onto the end per request
+HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "mode": "async",
+    "components": {
+        "task_queue": "celery+redis",
+        "extractors": ["crawl4ai", "playwright+llm"],
+        "duplicate_check": "enabled",
+        "smart_filters": ["job_unavailable", "visa_restricted"],
+        "resume_tailoring": "enabled (match_score >= 70)",
+        "cover_letter_tailoring": "enabled (match_score >= 70)",
+        "pdf_compilation": "enabled",
+        "storage": "supabase",
+        "notion_integration": "enabled",
+    },
+    "endpoints": {
+        "queue_single": "POST /jobs/add",
+        "queue_batch": "POST /jobs/batch",
+        "check_status": "GET /jobs/{job_id}/status",
+        "batch_status": "POST /jobs/batch/status",
+        "group_status": "GET /groups/{group_id}/status",
+        "cancel_job": "DELETE /jobs/{job_id}",
+    },
+}
+_HEALTH_BODY_PREFIX = orjson.dumps(HEALTH_PAYLOAD)[:-1] + b',"timestamp":'
+
+
 @router.get("/health")
 async def health_check():
     """
     Health check endpoint with system information
     """
-    return {
-        "status": "healthy",
-        "timestamp": time.time(),
-        "mode": "async",
-        "components": {
-            "task_queue": "celery+redis",
-            "extractors": ["crawl4ai", "playwright+llm"],
-            "duplicate_check": "enabled",
-            "smart_filters": ["job_unavailable", "visa_restricted"],
-            "resume_tailoring": "enabled (match_score >= 70)",
-            "cover_letter_tailoring": "enabled (match_score >= 70)",
-            "pdf_compilation": "enabled",
-            "storage": "supabase",
-            "notion_integration": "enabled",
-        },
-        "endpoints": {
-            "queue_single": "POST /jobs/add",
-            "queue_batch": "POST /jobs/batch",
-            "check_status": "GET /jobs/{job_id}/status",
-            "batch_status": "POST /jobs/batch/status",
-            "cancel_job": "DELETE /jobs/{job_id}",
-        },
-    }
+    return Response(
+        content=_HEALTH_BODY_PREFIX + orjson.dumps(time.time()) + b"}",
+        media_type="application/json",
+    )
+
+
+STATS_CACHE_KEY = "stats:workers"
+STATS_CACHE_TTL = 2
 
 
 @router.get("/stats")
@@ -336,28 +560,39 @@ async def get_system_stats():
     Get overall system statistics (requires Celery inspect)
     """
     try:
-        from app.celery_app import celery_app
-
-        # Get Celery inspector
-        inspect = celery_app.control.inspect()
-
-        # Get active tasks
-        active_tasks = inspect.active()
-        scheduled_tasks = inspect.scheduled()
-        reserved_tasks = inspect.reserved()
+        # Many /stats hits within the TTL share one worker broadcast
+        workers = await async_cache_get_json(STATS_CACHE_KEY)
+
+        if workers is None:
+            # Get Celery inspector
+            inspect = celery_app.control.inspect()
+
+            # Run the three broadcasts concurrently instead of back to back
+            active_tasks, scheduled_tasks, reserved_tasks = await asyncio.gather(
+                asyncio.to_thread(inspect.active),
+                asyncio.to_thread(inspect.scheduled),
+                asyncio.to_thread(inspect.reserved),
+            )
 
-        active_count = sum(len(tasks) for tasks in (active_tasks or {}).values())
-        scheduled_count = sum(len(tasks) for tasks in (scheduled_tasks or {}).values())
-        reserved_count = sum(len(tasks) for tasks in (reserved_tasks or {}).values())
+            active_count = sum(len(tasks) for tasks in (active_tasks or {}).values())
+            scheduled_count = sum(
+                len(tasks) for tasks in (scheduled_tasks or {}).values()
+            )
+            reserved_count = sum(
+                len(tasks) for tasks in (reserved_tasks or {}).values()
+            )
 
-        return {
-            "status": "ok",
-            "workers": {
+            workers = {
                 "active_tasks": active_count,
                 "scheduled_tasks": scheduled_count,
                 "reserved_tasks": reserved_count,
                 "total_queued": active_count + scheduled_count + reserved_count,
-            },
+            }
+            await async_cache_set_json(STATS_CACHE_KEY, workers, STATS_CACHE_TTL)
+
+        return {
+            "status": "ok",
+            "workers": workers,
             "message": "System statistics retrieved successfully",
         }
 
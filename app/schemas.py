@@ -0,0 +1,37 @@
+# app/schemas.py
+from functools import cached_property
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, HttpUrl, computed_field
+
+
+class JobURLInput(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    url: HttpUrl
+    force_playwright: bool = False
+    # Ignore a cached extraction of this URL (e.g. after a bad extraction)
+    force_refresh: bool = False
+
+    @computed_field
+    @cached_property
+    def url_str(self) -> str:
+        # Stringify the validated URL once per request
+        return str(self.url)
+
+
+class JobBatchInput(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    urls: List[HttpUrl]
+    force_playwright: bool = False
+    force_refresh: bool = False
+
+
+class JobAddResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    status: str
+    job_id: str
+    message: str
+    url: str
+    check_status_url: Optional[str] = None
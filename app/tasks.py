@@ -1,83 +1,207 @@
 # app/tasks.py
 from app.celery_app import celery_app
 from services.job_processor_service import extract_job_data
-from services.llm_evaluation_service import evaluate_job_match
-from services.llm_resume_service import tailor_resume
-from services.llm_cover_letter_service import tailor_cover_letter
+from services.eval_batcher_service import submit_evaluation
+from services.llm_combined_tailor_service import tailor_documents
 from services.notion_service import save_job_to_notion
-from services.duplicate_checker_service import check_if_job_exists
-from services.crawl4ai_service import JobUnavailableError, VisaRestrictedError
+from services.duplicate_checker_service import (
+    check_if_job_exists,
+    remember_saved_job,
+)
+from services.crawl4ai_service import (
+    JobUnavailableError,
+    VisaRestrictedError,
+    close_crawler,
+)
 from services.pdf_compilation_service import (
     compile_resume_to_pdf,
     compile_cover_letter_to_pdf,
 )
 from services.supabase_upload_service import upload_pdf_to_supabase
+from services.pdf_cache_service import get_cached_pdf_url, set_cached_pdf_url
+from services.http_client_service import close_http
+from services.cache_service import close_async_redis
+from celery.signals import worker_shutdown
+import concurrent.futures
 import logging
 import asyncio
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
 
+# Jobs scoring at/above this get tailored documents (slow continuation task)
+DOCUMENT_SCORE_THRESHOLD = 70
+
+
 @celery_app.task(bind=True, name="process_job")
-def process_job_task(self, url: str, force_playwright: bool = False):
+def process_job_task(
+    self, url: str, force_playwright: bool = False, force_refresh: bool = False
+):
     """
-    Celery task wrapper - runs the async pipeline in sync context
+    Celery task wrapper - runs the async pipeline in sync context.
+
+    Low-score jobs finish inline (extract -> evaluate -> Notion). High-score
+    jobs hand the slow tailoring/PDF/upload work to finish_high_score_job,
+    which replaces this task and keeps the same job id for status polling.
     """
     try:
         # Update task state to show we started
         self.update_state(state="PROCESSING", meta={"stage": "starting", "progress": 0})
 
-        # Create new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
-            result = loop.run_until_complete(
-                process_job_pipeline(self, url, force_playwright)
+        result = _run_on_worker_loop(
+            process_job_pipeline(
+                TaskProgress(self), url, force_playwright, force_refresh
             )
-            return result
-        finally:
-            # Gracefully shutdown async generators and tasks
-            try:
-                # Cancel all remaining tasks
-                pending = asyncio.all_tasks(loop)
-                for task in pending:
-                    task.cancel()
-
-                # Wait for cancellation to complete
-                loop.run_until_complete(
-                    asyncio.gather(*pending, return_exceptions=True)
-                )
-
-                # Give async cleanup (like httpx) time to finish
-                loop.run_until_complete(asyncio.sleep(0.1))
-
-                # Shutdown async generators
-                loop.run_until_complete(loop.shutdown_asyncgens())
-            except Exception as cleanup_error:
-                logger.warning(f"Cleanup warning: {cleanup_error}")
-            finally:
-                loop.close()
+        )
 
     except Exception as e:
         logger.error(f"Task failed for {url}: {str(e)}")
         raise
 
+    if result.get("status") == "needs_documents":
+        continuation = finish_high_score_job.s(
+            result["normalized"], result["evaluation"]
+        )
+        # Stay in the queue (interactive/batch) the job was submitted to
+        queue = (self.request.delivery_info or {}).get("routing_key")
+        if queue:
+            continuation.set(queue=queue)
+        raise self.replace(continuation)
+
+    return result
+
+
+@celery_app.task(bind=True, name="finish_high_score_job")
+def finish_high_score_job(self, normalized: dict, evaluation: dict):
+    """
+    Continuation for matches >= 70: tailor documents, compile + upload PDFs,
+    save to Notion and build the final response.
+    """
+    try:
+        self.update_state(
+            state="PROCESSING", meta={"stage": "tailoring_documents", "progress": 45}
+        )
+        return _run_on_worker_loop(
+            finish_job_pipeline(TaskProgress(self), normalized, evaluation)
+        )
+
+    except Exception as e:
+        logger.error(f"Task failed for {normalized.get('url')}: {str(e)}")
+        raise
+
 
-async def process_job_pipeline(task, url: str, force_playwright: bool):
+class TaskProgress:
+    """
+    Progress reporter for a pipeline running on the worker loop thread.
+    Celery's task.request is thread-local, so the task id is captured here,
+    on the task's own thread, and passed explicitly on every update.
+    """
+
+    def __init__(self, task):
+        self.task = task
+        self.task_id = task.request.id
+
+    def update_state(self, state=None, meta=None):
+        self.task.update_state(task_id=self.task_id, state=state, meta=meta)
+
+
+# One long-lived event loop per worker process, shared by all task threads
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_loop_pid: int | None = None
+_worker_loop_lock = threading.Lock()
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Start the worker's event loop thread on first use (and after a fork)."""
+    global _worker_loop, _worker_loop_pid
+
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop_pid != os.getpid():
+            _worker_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_worker_loop.run_forever, name="worker-loop", daemon=True
+            ).start()
+            _worker_loop_pid = os.getpid()
+
+        return _worker_loop
+
+
+def _run_on_worker_loop(coro):
+    """
+    Run a pipeline coroutine on the shared worker loop and block this task
+    thread until it finishes. Clients bound to the loop (httpx) are reused
+    across tasks instead of being rebuilt and torn down per job.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_worker_loop())
+    try:
+        return future.result(timeout=celery_app.conf.task_time_limit)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+@worker_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    if _worker_loop is None or _worker_loop_pid != os.getpid():
+        return
+
+    try:
+        # Close the loop's crawler and shared HTTP/Redis connections, then stop it
+        asyncio.run_coroutine_threadsafe(close_crawler(), _worker_loop).result(
+            timeout=10
+        )
+        asyncio.run_coroutine_threadsafe(close_http(), _worker_loop).result(
+            timeout=10
+        )
+        asyncio.run_coroutine_threadsafe(close_async_redis(), _worker_loop).result(
+            timeout=10
+        )
+        asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(_worker_loop.shutdown_asyncgens(), timeout=1.0),
+            _worker_loop,
+        ).result(timeout=2)
+    except Exception as cleanup_error:
+        logger.warning(f"Cleanup warning: {cleanup_error}")
+    finally:
+        _worker_loop.call_soon_threadsafe(_worker_loop.stop)
+
+
+async def process_job_pipeline(
+    task, url: str, force_playwright: bool, force_refresh: bool = False
+):
     """
-    Your existing pipeline logic, now with progress updates
+    Stages up to evaluation: duplicate check, extraction, evaluation.
+
+    Extraction starts speculatively alongside the duplicate check and is
+    cancelled when the URL is already in Notion. Jobs scoring >= 70 return
+    "needs_documents" for the continuation task; the rest are finished here.
     """
     logger.info(f"Processing job: {url}")
 
     # Stage 1: Duplicate check
+    # Extraction is started speculatively alongside the (fast) Notion lookup
+    # and cancelled if the job turns out to be a duplicate
     task.update_state(
         state="PROCESSING", meta={"stage": "duplicate_check", "progress": 10}
     )
-    duplicate_check = await check_if_job_exists(url)
+    extraction_task = asyncio.create_task(
+        extract_job_data(
+            url, force_playwright=force_playwright, force_refresh=force_refresh
+        )
+    )
+    try:
+        duplicate_check = await check_if_job_exists(url)
+    except BaseException:
+        extraction_task.cancel()
+        raise
 
     if duplicate_check["exists"]:
         logger.info(f"Duplicate detected: {duplicate_check['message']}")
+        extraction_task.cancel()
+        # Wait for cancellation to propagate so browser resources are released
+        await asyncio.gather(extraction_task, return_exceptions=True)
         return {
             "status": "duplicate",
             "message": duplicate_check.get("message", "Job already exists"),
@@ -89,7 +213,7 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
     # Stage 2: Extract job data
     task.update_state(state="PROCESSING", meta={"stage": "extracting", "progress": 20})
     try:
-        normalized = await extract_job_data(url, force_playwright=force_playwright)
+        normalized = await extraction_task
     except JobUnavailableError as e:
         logger.warning(f"Job unavailable: {str(e)}")
         return {
@@ -114,10 +238,35 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
     # Stage 3: Evaluate
     task.update_state(state="PROCESSING", meta={"stage": "evaluating", "progress": 35})
     visa_warning = normalized.get("visa_feasibility")
-    evaluation = await evaluate_job_match(
+    evaluation = await submit_evaluation(
         normalized["job_description"], visa_warning=visa_warning
     )
 
+    # Slow document generation continues in its own task
+    if evaluation.get("match_score", 0) >= DOCUMENT_SCORE_THRESHOLD:
+        task.update_state(
+            state="PROCESSING",
+            meta={
+                "stage": "tailoring_documents",
+                "progress": 45,
+                "job_title": normalized.get("job_title"),
+                "company": normalized.get("company_name"),
+                "match_score": evaluation.get("match_score"),
+            },
+        )
+        return {
+            "status": "needs_documents",
+            "normalized": normalized,
+            "evaluation": evaluation,
+        }
+
+    return await finish_job_pipeline(task, normalized, evaluation)
+
+
+async def finish_job_pipeline(task, normalized: dict, evaluation: dict):
+    """
+    Stages after evaluation: documents (if match >= 70), Notion save, response
+    """
     # Stage 4: Tailor resume + cover letter if match >= 70
     resume_data = None
     cover_letter_data = None
@@ -125,96 +274,54 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
     cover_letter_pdf_url = None
     match_score = evaluation.get("match_score", 0)
 
-    if match_score >= 70:
+    if match_score >= DOCUMENT_SCORE_THRESHOLD:
         logger.info(f"Match score {match_score}% >= 70%, tailoring documents...")
 
         company = normalized.get("company_name", "company")
         job_title = normalized.get("job_title", "role")
 
-        # Resume generation
+        # One LLM call tailors both documents (shared context sent once)
         task.update_state(
-            state="PROCESSING", meta={"stage": "tailoring_resume", "progress": 45}
+            state="PROCESSING", meta={"stage": "tailoring_documents", "progress": 45}
         )
         try:
-            resume_data = await tailor_resume(
+            documents = await tailor_documents(
                 job_description=normalized["job_description"],
                 evaluation=evaluation,
                 job_title=job_title,
                 company_name=company,
             )
-            logger.info("Resume tailoring completed")
+            resume_data = documents["resume"]
+            cover_letter_data = documents["cover_letter"]
+            logger.info("Resume + cover letter tailoring completed")
+        except Exception as e:
+            logger.error(f"Document tailoring failed: {str(e)}")
 
-            # Compile & upload resume PDF
+        # Compile + upload chains are independent, run them concurrently
+        # under one progress stage
+        if resume_data and cover_letter_data:
             task.update_state(
-                state="PROCESSING",
-                meta={"stage": "compiling_resume_pdf", "progress": 55},
+                state="PROCESSING", meta={"stage": "compiling_pdfs", "progress": 60}
             )
-            try:
-                logger.info("Compiling resume LaTeX to PDF...")
-                resume_pdf_bytes = await compile_resume_to_pdf(
-                    resume_data["tailored_content"]
-                )
-                logger.info(f"Resume PDF compiled ({len(resume_pdf_bytes)} bytes)")
-
-                logger.info("Uploading resume PDF to Supabase...")
-                resume_upload_result = await upload_pdf_to_supabase(
-                    pdf_bytes=resume_pdf_bytes,
-                    position=job_title,
-                    company=company,
-                    document_type="resume",
-                )
-                resume_pdf_url = resume_upload_result["public_url"]
-                logger.info(f"Resume PDF uploaded: {resume_pdf_url}")
-
-            except Exception as pdf_error:
-                logger.error(f"Resume PDF compilation/upload failed: {str(pdf_error)}")
-
-        except Exception as e:
-            logger.error(f"Resume tailoring failed: {str(e)}")
-
-        # Cover letter generation
-        task.update_state(
-            state="PROCESSING", meta={"stage": "tailoring_cover_letter", "progress": 65}
-        )
-        try:
-            logger.info("Starting cover letter tailoring...")
-            cover_letter_data = await tailor_cover_letter(
-                job_description=normalized["job_description"],
-                evaluation=evaluation,
-                job_title=job_title,
-                company_name=company,
+            results = await asyncio.gather(
+                _do_resume(resume_data, job_title, company),
+                _do_cover_letter(cover_letter_data, job_title, company),
+                return_exceptions=True,
             )
-            logger.info("Cover letter tailoring completed")
 
-            # Compile & upload cover letter PDF
-            task.update_state(
-                state="PROCESSING",
-                meta={"stage": "compiling_cover_letter_pdf", "progress": 75},
+            # Single place where compile/upload failures are logged
+            for label, outcome in zip(("Resume", "Cover letter"), results):
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        "%s PDF compilation/upload failed: %s",
+                        label,
+                        outcome,
+                        exc_info=outcome,
+                    )
+
+            resume_pdf_url, cover_letter_pdf_url = (
+                url if isinstance(url, str) else None for url in results
             )
-            try:
-                logger.info("Compiling cover letter LaTeX to PDF...")
-                cl_pdf_bytes = await compile_cover_letter_to_pdf(
-                    cover_letter_data["tailored_content"]
-                )
-                logger.info(f"Cover letter PDF compiled ({len(cl_pdf_bytes)} bytes)")
-
-                logger.info("Uploading cover letter PDF to Supabase...")
-                cl_upload_result = await upload_pdf_to_supabase(
-                    pdf_bytes=cl_pdf_bytes,
-                    position=job_title,
-                    company=company,
-                    document_type="cover_letter",
-                )
-                cover_letter_pdf_url = cl_upload_result["public_url"]
-                logger.info(f"Cover letter PDF uploaded: {cover_letter_pdf_url}")
-
-            except Exception as pdf_error:
-                logger.error(
-                    f"Cover letter PDF compilation/upload failed: {str(pdf_error)}"
-                )
-
-        except Exception as e:
-            logger.error(f"Cover letter tailoring failed: {str(e)}")
 
     else:
         logger.info(f"Match score {match_score}% < 70, skipping document generation")
@@ -238,6 +345,7 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
         cover_letter_data=cover_letter_data,
         cover_letter_pdf_url=cover_letter_pdf_url,
     )
+    await remember_saved_job(job_data["url"], job_data["title"], notion_result)
 
     # Build final response
     task.update_state(state="PROCESSING", meta={"stage": "complete", "progress": 100})
@@ -271,10 +379,9 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
         response["resume_pdf_generated"] = resume_pdf_url is not None
         response["resume_pdf_url"] = resume_pdf_url
         response["resume_preview"] = {
-            "pruning_strategy_preview": resume_data.get("pruning_strategy", {}).get(
-                "summary", ""
-            )[:200]
-            + "...",
+            "pruning_strategy_preview": _preview(
+                resume_data.get("pruning_strategy", {}).get("summary", "")
+            ),
             "content_length": len(resume_data.get("tailored_content", "")),
         }
     else:
@@ -288,10 +395,9 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
         response["cover_letter_pdf_generated"] = cover_letter_pdf_url is not None
         response["cover_letter_pdf_url"] = cover_letter_pdf_url
         response["cover_letter_preview"] = {
-            "writing_strategy_preview": cover_letter_data.get(
-                "writing_strategy", {}
-            ).get("summary", "")[:200]
-            + "...",
+            "writing_strategy_preview": _preview(
+                cover_letter_data.get("writing_strategy", {}).get("summary", "")
+            ),
             "word_count": cover_letter_data.get("change_summary", {}).get(
                 "word_count", "unknown"
             ),
@@ -303,3 +409,64 @@ async def process_job_pipeline(task, url: str, force_playwright: bool):
         response["cover_letter_reason"] = f"Match score {match_score}% < 70 threshold"
 
     return response
+
+
+def _preview(text: str, limit: int = 200) -> str:
+    """Truncate text for response previews, only adding an ellipsis when cut."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+async def _do_resume(resume_data: dict, job_title: str, company: str) -> str:
+    """
+    Compile & upload the tailored resume PDF.
+    Returns the public PDF URL; failures propagate to the caller's gather.
+    """
+    tex = resume_data["tailored_content"]
+    cached_url = await get_cached_pdf_url(tex, "resume")
+    if cached_url:
+        logger.info("Resume PDF unchanged, reusing upload: %s", cached_url)
+        return cached_url
+
+    logger.info("Compiling resume LaTeX to PDF...")
+    resume_pdf = await compile_resume_to_pdf(tex)
+
+    logger.info("Uploading resume PDF to Supabase...")
+    resume_upload_result = await upload_pdf_to_supabase(
+        pdf_stream=resume_pdf,
+        position=job_title,
+        company=company,
+        document_type="resume",
+    )
+    resume_pdf_url = resume_upload_result["public_url"]
+    logger.info("Resume PDF uploaded: %s", resume_pdf_url)
+    await set_cached_pdf_url(tex, "resume", resume_pdf_url)
+    return resume_pdf_url
+
+
+async def _do_cover_letter(
+    cover_letter_data: dict, job_title: str, company: str
+) -> str:
+    """
+    Compile & upload the tailored cover letter PDF.
+    Returns the public PDF URL; failures propagate to the caller's gather.
+    """
+    tex = cover_letter_data["tailored_content"]
+    cached_url = await get_cached_pdf_url(tex, "cover_letter")
+    if cached_url:
+        logger.info("Cover letter PDF unchanged, reusing upload: %s", cached_url)
+        return cached_url
+
+    logger.info("Compiling cover letter LaTeX to PDF...")
+    cl_pdf = await compile_cover_letter_to_pdf(tex)
+
+    logger.info("Uploading cover letter PDF to Supabase...")
+    cl_upload_result = await upload_pdf_to_supabase(
+        pdf_stream=cl_pdf,
+        position=job_title,
+        company=company,
+        document_type="cover_letter",
+    )
+    cover_letter_pdf_url = cl_upload_result["public_url"]
+    logger.info("Cover letter PDF uploaded: %s", cover_letter_pdf_url)
+    await set_cached_pdf_url(tex, "cover_letter", cover_letter_pdf_url)
+    return cover_letter_pdf_url
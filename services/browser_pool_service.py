@@ -0,0 +1,133 @@
+# services/browser_pool_service.py
+"""
+Process-wide Playwright Chromium instance, launched once and reused.
+
+Playwright objects are bound to the event loop that created them. The shared
+browser lives on a dedicated background loop thread, so it can serve callers
+on any loop (the Celery worker loop, scripts) and the chatty page protocol
+traffic doesn't compete with pipeline work on the worker loop. Callers hand
+it a coroutine via run_with_browser() and await the result from their own
+loop. Each job still gets a fresh (cheap) BrowserContext, only the Chromium
+launch is shared.
+"""
+import asyncio
+import logging
+import os
+import threading
+
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+# Concurrent pages (contexts) on the shared browser; extra jobs queue instead
+# of piling more tabs onto one Chromium process
+MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", str((os.cpu_count() or 2) * 2)))
+
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",  # Better for containerized environments
+]
+
+_state_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_pid: int | None = None
+
+# Only touched from the pool loop
+_playwright = None
+_browser = None
+_launch_lock: asyncio.Lock | None = None
+_context_slots: asyncio.Semaphore | None = None
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the browser loop thread (again, after a fork) if needed."""
+    global _loop, _pid, _playwright, _browser, _launch_lock, _context_slots
+
+    with _state_lock:
+        if _loop is None or _pid != os.getpid():
+            # A forked child inherits dead references, never reuse them
+            _playwright = None
+            _browser = None
+            _launch_lock = None
+            _context_slots = None
+
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="browser-pool", daemon=True
+            ).start()
+            _pid = os.getpid()
+
+        return _loop
+
+
+async def _get_browser():
+    """Return the shared browser, (re)launching it if missing or crashed."""
+    global _playwright, _browser, _launch_lock
+
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    if _launch_lock is None:
+        _launch_lock = asyncio.Lock()
+
+    async with _launch_lock:
+        if _browser is not None and _browser.is_connected():
+            return _browser
+
+        if _browser is not None:
+            logger.warning("[BrowserPool] ⚠️ Browser disconnected, relaunching...")
+
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+
+        _browser = await _playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        logger.info("[BrowserPool] ✅ Chromium launched")
+        return _browser
+
+
+async def _call_with_browser(fn, *args):
+    global _context_slots
+
+    if _context_slots is None:
+        _context_slots = asyncio.Semaphore(MAX_CONTEXTS)
+
+    async with _context_slots:
+        browser = await _get_browser()
+        return await fn(browser, *args)
+
+
+async def run_with_browser(fn, *args):
+    """
+    Run `await fn(browser, *args)` on the browser loop and return its result.
+    Cancelling the caller cancels the work on the browser loop as well.
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _call_with_browser(fn, *args), _ensure_loop()
+    )
+    return await asyncio.wrap_future(future)
+
+
+def warm_browser(timeout: float = 60.0):
+    """Launch Chromium ahead of the first job (called on worker startup)."""
+    future = asyncio.run_coroutine_threadsafe(_get_browser(), _ensure_loop())
+    future.result(timeout=timeout)
+
+
+async def _close():
+    global _playwright, _browser
+
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+def close_browser(timeout: float = 10.0):
+    """Close the shared browser and Playwright driver (worker shutdown)."""
+    if _loop is None or _pid != os.getpid():
+        return
+
+    future = asyncio.run_coroutine_threadsafe(_close(), _loop)
+    future.result(timeout=timeout)
@@ -0,0 +1,157 @@
+# services/cache_service.py
+"""
+Small Redis-backed cache helpers shared across services.
+Uses the same Redis instance as Celery (REDIS_URL).
+
+Cache failures are never fatal: reads fall back to a miss and writes are
+skipped, so the pipeline keeps working if Redis is unavailable.
+
+Redis access is async only: callers run on event loops (API endpoints, the
+Celery worker loop that all task threads share), where a blocking Redis call
+would stall the whole loop for up to the socket timeout.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import weakref
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import orjson
+import redis
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Query params that never change which job posting a URL points to
+TRACKING_PARAMS = {"gclid", "fbclid", "ref", "ref_src", "source", "src"}
+
+# asyncio connections are bound to the loop that opened them, so like the
+# shared HTTP clients there is one async client per running loop
+_async_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.asyncio.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """
+    Lazily create the asyncio Redis client for the running event loop, so
+    lookups don't block the loop on Redis round-trips.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        client = _async_redis_clients[loop] = redis.asyncio.Redis.from_url(
+            REDIS_URL, socket_timeout=2.0, socket_connect_timeout=2.0
+        )
+    return client
+
+
+async def close_async_redis() -> None:
+    """Close the async client that belongs to the running event loop."""
+    client = _async_redis_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a job URL so trivially different variants share a cache key.
+
+    - lowercases scheme and host
+    - drops tracking params (utm_*, gclid, ref, ...) and the fragment
+    - removes the trailing slash from the path
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            urlencode(query),
+            "",
+        )
+    )
+
+
+def url_cache_key(prefix: str, url: str) -> str:
+    """Build a fixed-length cache key for a URL, e.g. dup:<sha1>."""
+    digest = hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def content_cache_key(prefix: str, content) -> str:
+    """
+    Build a fixed-length cache key for JSON-serializable content (e.g. a full
+    LLM request), so identical content always maps to the same key.
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=20
+    ).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+async def async_cache_get_json(key: str) -> dict | None:
+    """Return the cached JSON value for key, or None on miss/error."""
+    try:
+        raw = await get_async_redis().get(key)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Cache read failed for {key}: {e}")
+        return None
+
+    if raw is None:
+        return None
+
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        logger.warning(f"⚠️ Ignoring corrupt cache entry {key}")
+        return None
+
+
+async def async_cache_set_json(key: str, value: dict, ttl: int) -> None:
+    """Store value as JSON under key with a TTL in seconds."""
+    try:
+        await get_async_redis().setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Cache write failed for {key}: {e}")
+
+
+async def async_cache_get_many_json(keys: list[str]) -> list[dict | None]:
+    """Read several cached JSON values with one MGET (None for misses/errors)."""
+    if not keys:
+        return []
+    try:
+        raws = await get_async_redis().mget(keys)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Cache read failed for {len(keys)} keys: {e}")
+        return [None] * len(keys)
+
+    values = []
+    for key, raw in zip(keys, raws):
+        try:
+            values.append(orjson.loads(raw) if raw is not None else None)
+        except orjson.JSONDecodeError:
+            logger.warning(f"⚠️ Ignoring corrupt cache entry {key}")
+            values.append(None)
+    return values
+
+
+async def async_cache_set_many_json(entries: list[tuple[str, dict, int]]) -> None:
+    """Store several (key, value, ttl) entries in one pipelined round-trip."""
+    if not entries:
+        return
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        for key, value, ttl in entries:
+            pipe.setex(key, ttl, orjson.dumps(value))
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Cache write failed for {len(entries)} keys: {e}")
@@ -3,9 +3,12 @@
 Fast path: Crawl4AI with LLM extraction
 Extracts normalized job data in one pass
 """
+import asyncio
 import os
 import json
 import logging
+import re
+import weakref
 from datetime import datetime
 from crawl4ai import (
     AsyncWebCrawler,
@@ -14,18 +17,29 @@ from crawl4ai import (
     CacheMode,
     LLMConfig,
 )
+from crawl4ai.chunking_strategy import RegexChunking
+from crawl4ai.content_filter_strategy import PruningContentFilter
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
-from pydantic import BaseModel, Field
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from services.jsonld_service import extract_job_posting_ld
 
 logger = logging.getLogger(__name__)
 
 DEBUG_DIR = "crawl4ai_debug"
 os.makedirs(DEBUG_DIR, exist_ok=True)
 
+# Per-extraction markdown/JSON dumps and token usage are opt-in
+# (CRAWL4AI_DEBUG=1); failure dumps are always written
+DEBUG_ARTIFACTS = os.getenv("CRAWL4AI_DEBUG") == "1"
+
 
 # Define the schema we want extracted
 class NormalizedJob(BaseModel):
-    job_title: str = Field(description="Job title")
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    job_title: str = Field(description="Job title", min_length=1)
     company_name: str = Field(description="Company name")
     location: str | None = Field(description="Location or Remote", default=None)
     work_mode: str | None = Field(
@@ -40,7 +54,8 @@ class NormalizedJob(BaseModel):
         default=None,
     )
     job_description: str = Field(
-        description="Full cleaned job description with markdown formatting"
+        description="Full cleaned job description with markdown formatting",
+        min_length=1,
     )
     visa_feasibility: str | None = Field(
         description=(
@@ -124,36 +139,101 @@ def normalize_work_mode(work_mode: str | None) -> str:
     return "Not specified"
 
 
+# Wording that rules out sponsorship for a foreign applicant
+RESTRICTED_TERMS = [
+    "no visa sponsorship",
+    "must have work authorization",
+    "authorized to work",
+    "locals only",
+    "work permit required",
+    "no relocation support",
+]
+KNOWN_COUNTRIES = ["singapore", "malaysia", "australia", "usa", "uk", "canada"]
+
+_RESTRICTED_RE = re.compile("|".join(map(re.escape, RESTRICTED_TERMS)), re.IGNORECASE)
+_KNOWN_COUNTRY_RE = re.compile("|".join(KNOWN_COUNTRIES), re.IGNORECASE)
+
+
 def infer_visa_feasibility(normalized: dict, user_country: str = "Indonesia") -> str:
     """Fallback heuristic to infer visa feasibility if LLM fails to provide it."""
-    loc = (normalized.get("location") or "").lower()
-    desc = (normalized.get("job_description") or "").lower()
+    loc = normalized.get("location") or ""
+    desc = normalized.get("job_description") or ""
 
     # 1. Same country → eligible
-    if user_country.lower() in loc:
+    if user_country.lower() in loc.lower():
         return "eligible"
 
-    # 2. Restricted language
-    restricted_terms = [
-        "no visa sponsorship",
-        "must have work authorization",
-        "authorized to work",
-        "locals only",
-        "work permit required",
-        "no relocation support",
-    ]
-    if any(term in desc for term in restricted_terms):
+    # 2. Restricted language (one case-insensitive pass, no lowercased copy)
+    if _RESTRICTED_RE.search(desc):
         return "restricted"
 
     # 3. Foreign job but no explicit restriction
-    known_countries = ["singapore", "malaysia", "australia", "usa", "uk", "canada"]
-    if any(country in loc for country in known_countries):
+    if _KNOWN_COUNTRY_RE.search(loc):
         return "possible"
 
     # 4. Default
     return "unknown"
 
 
+# Specific unavailable patterns (TIGHTENED - more specific)
+UNAVAILABLE_PATTERNS = [
+    ("position has been filled", "Position already filled"),
+    ("this job is no longer available", "Job posting closed"),
+    ("posting has expired", "Posting expired"),
+    ("job posting is no longer active", "Job no longer active"),
+    ("position is no longer open", "Position closed"),
+    ("this position has been closed", "Position closed"),
+    (
+        "sorry, this job is no longer accepting applications",
+        "No longer accepting applications",
+    ),
+    ("this opportunity is no longer available", "Opportunity closed"),
+]
+
+# More specific 404 patterns, only trusted in header/title context
+NOT_FOUND_PATTERNS = [
+    ("error 404", "Page not found (404)"),
+    ("http 404", "Page not found (404)"),
+    ("404 not found", "Page not found (404)"),
+    ("404 error", "Page not found (404)"),
+    ("page not found", "Page not found"),
+]
+
+JOB_INDICATORS = [
+    "responsibilities",
+    "requirements",
+    "qualifications",
+    "about the role",
+    "what you'll do",
+    "job description",
+    "apply now",
+    "skills",
+    "experience",
+]
+
+
+def _alternation(patterns: list[tuple[str, str]], prefix: str) -> re.Pattern:
+    """Compile (pattern, reason) pairs into one regex with a group per pattern."""
+    return re.compile(
+        "|".join(
+            f"(?P<{prefix}{i}>{re.escape(pattern)})"
+            for i, (pattern, _) in enumerate(patterns)
+        ),
+        re.IGNORECASE,
+    )
+
+
+_UNAVAILABLE_RE = _alternation(UNAVAILABLE_PATTERNS, "u")
+_NOT_FOUND_RE = _alternation(NOT_FOUND_PATTERNS, "n")
+_PATTERN_REASONS = {
+    **{f"u{i}": reason for i, (_, reason) in enumerate(UNAVAILABLE_PATTERNS)},
+    **{f"n{i}": reason for i, (_, reason) in enumerate(NOT_FOUND_PATTERNS)},
+}
+_JOB_INDICATOR_RE = re.compile(
+    "|".join(map(re.escape, JOB_INDICATORS)), re.IGNORECASE
+)
+
+
 def detect_job_unavailable(
     markdown: str, url: str, http_status: int = None
 ) -> tuple[bool, str | None]:
@@ -181,64 +261,20 @@ def detect_job_unavailable(
     if not markdown or len(markdown.strip()) < 100:
         return True, "Page content too short or empty"
 
-    markdown_lower = markdown.lower()
-
-    # Layer 3: Specific unavailable patterns (TIGHTENED - more specific)
-    unavailable_patterns = [
-        ("position has been filled", "Position already filled"),
-        ("this job is no longer available", "Job posting closed"),
-        ("posting has expired", "Posting expired"),
-        ("job posting is no longer active", "Job no longer active"),
-        ("position is no longer open", "Position closed"),
-        ("this position has been closed", "Position closed"),
-        (
-            "sorry, this job is no longer accepting applications",
-            "No longer accepting applications",
-        ),
-        ("this opportunity is no longer available", "Opportunity closed"),
-        # More specific 404 patterns to avoid false positives
-        ("error 404", "Page not found (404)"),
-        ("http 404", "Page not found (404)"),
-        ("404 not found", "Page not found (404)"),
-        ("404 error", "Page not found (404)"),
-        # Only trigger on "page not found" in title/header context
-        ("page not found", "Page not found"),
-    ]
-
-    for pattern, reason in unavailable_patterns:
-        if pattern in markdown_lower:
-            # Extra validation for "404" and "page not found" - check if it's in meaningful context
-            if "404" in pattern or "page not found" in pattern:
-                # Check if it appears in first 500 chars (likely header/title)
-                if pattern in markdown_lower[:500]:
-                    logger.warning(f"[Crawl4AI] 🚫 Detected unavailable job: {reason}")
-                    return True, reason
-                # Or if content is very short (< 500 chars total)
-                elif len(markdown) < 500:
-                    logger.warning(f"[Crawl4AI] 🚫 Detected unavailable job: {reason}")
-                    return True, reason
-                # Otherwise skip this pattern (likely false positive)
-                else:
-                    continue
-            else:
-                # Non-404 patterns - trigger immediately
-                logger.warning(f"[Crawl4AI] 🚫 Detected unavailable job: {reason}")
-                return True, reason
+    # Layer 3: Specific unavailable patterns, one case-insensitive regex pass
+    # each (no lowercased copy of the page)
+    match = _UNAVAILABLE_RE.search(markdown)
+    if match is None:
+        # 404 / "page not found" only count near the top (header/title) or on
+        # very short pages, to avoid false positives from body text
+        match = _NOT_FOUND_RE.search(markdown, 0, 500)
+    if match is not None:
+        reason = _PATTERN_REASONS[match.lastgroup]
+        logger.warning(f"[Crawl4AI] 🚫 Detected unavailable job: {reason}")
+        return True, reason
 
     # Layer 4: Validate actual job content exists
-    job_indicators = [
-        "responsibilities",
-        "requirements",
-        "qualifications",
-        "about the role",
-        "what you'll do",
-        "job description",
-        "apply now",
-        "skills",
-        "experience",
-    ]
-
-    has_job_content = any(indicator in markdown_lower for indicator in job_indicators)
+    has_job_content = _JOB_INDICATOR_RE.search(markdown) is not None
 
     if not has_job_content and len(markdown) < 800:
         return True, "No job description found - possibly removed or expired"
@@ -246,6 +282,145 @@ def detect_job_unavailable(
     return False, None
 
 
+# Only text is needed for markdown extraction: skip images, background
+# features and rendering work the page would otherwise trigger
+BROWSER_CONFIG = BrowserConfig(
+    headless=True,
+    verbose=False,
+    text_mode=True,
+    light_mode=True,
+    extra_args=["--blink-settings=imagesEnabled=false"],
+)
+
+# The LLM only sees pruned "fit" markdown: boilerplate blocks and short
+# fragments are dropped and links are left out, cutting input tokens. The
+# availability check still runs on the full page markdown.
+FIT_MARKDOWN_GENERATOR = DefaultMarkdownGenerator(
+    content_filter=PruningContentFilter(
+        threshold=0.48, threshold_type="fixed", min_word_threshold=10
+    ),
+    options={"ignore_links": True, "ignore_images": True, "escape_html": False},
+)
+
+# Return as soon as the job body has rendered instead of always sleeping 2s.
+# performance.now() counts from navigation start, so slow or very short pages
+# (e.g. "job closed" notices) still return within the old 2s budget rather
+# than failing the wait.
+JOB_BODY_SELECTORS = (
+    "[data-automation-id='jobPostingDescription'], .job-description, "
+    "#job-description, [class*='jobDescription'], main article"
+)
+CONTENT_READY_JS = (
+    "js:() => !!document.body && ("
+    f"document.querySelector({JOB_BODY_SELECTORS!r}) !== null"
+    " || document.body.innerText.length > 1000"
+    " || performance.now() > 2000)"
+)
+
+# Split the page at markdown headings (#, ##, ###) so that, when a long page
+# overflows chunk_token_threshold, chunks are packed from whole sections
+# instead of being cut mid-section
+SECTION_CHUNKING = RegexChunking(patterns=[r"\n(?=#{1,3} )"])
+
+# One started crawler (and its browser) per event loop, reused across jobs
+_crawlers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncWebCrawler]" = (
+    weakref.WeakKeyDictionary()
+)
+_crawler_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _write_debug_text(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _write_debug_json(path: str, payload: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+# Keeps fire-and-forget debug writes referenced until they finish
+_debug_writes: set[asyncio.Task] = set()
+
+
+def _dump_in_background(write_fn, *args) -> None:
+    """Run a debug write on the thread pool without delaying the caller."""
+    task = asyncio.create_task(asyncio.to_thread(write_fn, *args))
+    _debug_writes.add(task)
+    task.add_done_callback(_debug_writes.discard)
+
+
+async def get_crawler() -> AsyncWebCrawler:
+    """Return the started crawler for the running event loop (created lazily)."""
+    loop = asyncio.get_running_loop()
+    crawler = _crawlers.get(loop)
+    if crawler is not None:
+        return crawler
+
+    lock = _crawler_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        crawler = _crawlers.get(loop)
+        if crawler is None:
+            crawler = AsyncWebCrawler(config=BROWSER_CONFIG)
+            await crawler.start()
+            _crawlers[loop] = crawler
+            logger.info("[Crawl4AI] ✅ Crawler started")
+        return crawler
+
+
+async def close_crawler() -> None:
+    """Close the crawler that belongs to the running event loop, if any."""
+    crawler = _crawlers.pop(asyncio.get_running_loop(), None)
+    if crawler is not None:
+        await crawler.close()
+
+
+# Static per process; built once instead of on every extraction
+NORMALIZED_JOB_SCHEMA = NormalizedJob.model_json_schema()
+
+# More specific extraction instructions
+EXTRACTION_PROMPT = """
+You are extracting job posting data from a webpage.
+
+CRITICAL: First, determine if this job posting is still available:
+- Look for messages like "position filled", "no longer available", "expired", etc.
+- If you see such messages, set job_available=false and provide unavailable_reason
+
+If the job IS available, extract:
+- Job title (e.g., "Software Engineer", "Product Manager")
+- Company name
+- Location information (city, country, or "Remote")
+- Work mode: Classify into EXACTLY one of these 5 categories:
+  * "Remote" - fully remote, work from anywhere, WFH
+  * "Hybrid" - mix of office and remote work, flexible arrangement
+  * "Onsite" - fully in-office, on-site only
+  * "Contract" - temporary, contractual, freelance positions
+  * "Not specified" - work mode not clearly stated
+- Full job description including responsibilities, requirements, benefits
+
+Additionally, infer "visa_feasibility" from the perspective of an applicant based in **Indonesia**.
+Possible values:
+- "eligible" → Job is in Indonesia, or explicitly open to Indonesian candidates.
+- "possible" → Job is outside Indonesia but does not mention visa restrictions.
+- "restricted" → Job explicitly states "no visa sponsorship", "locals only", "must have work authorization", or similar.
+- "unknown" → Insufficient information to determine.
+
+Clean up the description by removing:
+- Navigation menus, headers, footers
+- "Apply now" buttons
+- Cookie banners
+- reCAPTCHA notices
+- "Powered by Workday" or similar footers
+
+Keep the complete job description with all details intact.
+Preserve any markdown formatting, bullet points, and emojis.
+
+Return the data as a single JSON object (not an array).
+"""
+
+
 async def crawl4ai_extract(url: str) -> dict:
     """
     Extract normalized job data using Crawl4AI + LLM strategy.
@@ -260,46 +435,6 @@ async def crawl4ai_extract(url: str) -> dict:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     try:
-        # More specific extraction instructions
-        extraction_prompt = """
-        You are extracting job posting data from a webpage.
-
-        CRITICAL: First, determine if this job posting is still available:
-        - Look for messages like "position filled", "no longer available", "expired", etc.
-        - If you see such messages, set job_available=false and provide unavailable_reason
-        
-        If the job IS available, extract:
-        - Job title (e.g., "Software Engineer", "Product Manager")
-        - Company name
-        - Location information (city, country, or "Remote")
-        - Work mode: Classify into EXACTLY one of these 5 categories:
-          * "Remote" - fully remote, work from anywhere, WFH
-          * "Hybrid" - mix of office and remote work, flexible arrangement
-          * "Onsite" - fully in-office, on-site only
-          * "Contract" - temporary, contractual, freelance positions
-          * "Not specified" - work mode not clearly stated
-        - Full job description including responsibilities, requirements, benefits
-
-        Additionally, infer "visa_feasibility" from the perspective of an applicant based in **Indonesia**.
-        Possible values:
-        - "eligible" → Job is in Indonesia, or explicitly open to Indonesian candidates.
-        - "possible" → Job is outside Indonesia but does not mention visa restrictions.
-        - "restricted" → Job explicitly states "no visa sponsorship", "locals only", "must have work authorization", or similar.
-        - "unknown" → Insufficient information to determine.
-
-        Clean up the description by removing:
-        - Navigation menus, headers, footers
-        - "Apply now" buttons
-        - Cookie banners
-        - reCAPTCHA notices
-        - "Powered by Workday" or similar footers
-
-        Keep the complete job description with all details intact.
-        Preserve any markdown formatting, bullet points, and emojis.
-
-        Return the data as a single JSON object (not an array).
-        """
-
         # ✅ Use LLMConfig as per docs
         llm_config = LLMConfig(
             provider="openai/gpt-4o-mini", api_token=os.getenv("OPENAI_API_KEY")
@@ -307,62 +442,82 @@ async def crawl4ai_extract(url: str) -> dict:
 
         extraction_strategy = LLMExtractionStrategy(
             llm_config=llm_config,
-            schema=NormalizedJob.model_json_schema(),
+            schema=NORMALIZED_JOB_SCHEMA,
             extraction_type="schema",
-            instruction=extraction_prompt,
+            instruction=EXTRACTION_PROMPT,
             chunk_token_threshold=4000,
             apply_chunking=True,
-            input_format="markdown",
+            input_format="fit_markdown",
             extra_args={"temperature": 0, "max_tokens": 2000},
         )
 
         # ✅ Use CrawlerRunConfig as per docs
+        # Phase 1 only fetches the page; the LLM runs in phase 2, once the
+        # page is known to be a live posting
         crawl_config = CrawlerRunConfig(
+            cache_mode=CacheMode.BYPASS,
+            word_count_threshold=10,
+            wait_for=CONTENT_READY_JS,
+        )
+        extract_config = CrawlerRunConfig(
             extraction_strategy=extraction_strategy,
+            markdown_generator=FIT_MARKDOWN_GENERATOR,
+            chunking_strategy=SECTION_CHUNKING,
             cache_mode=CacheMode.BYPASS,
             word_count_threshold=10,
-            wait_for="body",
-            delay_before_return_html=2.0,
         )
 
-        browser_config = BrowserConfig(headless=True, verbose=True, text_mode=True)
+        crawler = await get_crawler()
+        result = await crawler.arun(url=url, config=crawl_config)
 
-        async with AsyncWebCrawler(config=browser_config, verbose=True) as crawler:
-            result = await crawler.arun(url=url, config=crawl_config)
+        if not result.success:
+            raise IncompleteExtractionError(f"Crawl failed: {result.error_message}")
 
-            if not result.success:
-                raise Exception(f"Crawl failed: {result.error_message}")
-
-            # Extract HTTP status if available
-            http_status = None
-            try:
-                if hasattr(result, "status_code"):
-                    http_status = result.status_code
-                elif hasattr(result, "response") and result.response:
-                    http_status = getattr(result.response, "status", None)
-            except:
-                pass
+        # Extract HTTP status if available
+        http_status = None
+        try:
+            if hasattr(result, "status_code"):
+                http_status = result.status_code
+            elif hasattr(result, "response") and result.response:
+                http_status = getattr(result.response, "status", None)
+        except:
+            pass
 
-            # Debug: Save raw markdown (force flush to disk)
+        # Debug: Save raw markdown
+        if DEBUG_ARTIFACTS:
             markdown_debug = f"{DEBUG_DIR}/markdown_{timestamp}.md"
-            with open(markdown_debug, "w", encoding="utf-8") as f:
-                f.write(result.markdown or "NO MARKDOWN")
-                f.flush()
-                os.fsync(f.fileno())
-            logger.info(f"[Crawl4AI] ✅ Markdown file flushed: {markdown_debug}")
-
-            # ✅ Check if job is unavailable (before LLM parsing) - with HTTP status
-            is_unavailable, unavailable_reason = detect_job_unavailable(
-                result.markdown, url, http_status
+            _dump_in_background(
+                _write_debug_text, markdown_debug, result.markdown or "NO MARKDOWN"
             )
+            logger.info(f"[Crawl4AI] Markdown debug → {markdown_debug}")
+
+        # ✅ Check if job is unavailable (before LLM parsing) - with HTTP status
+        is_unavailable, unavailable_reason = detect_job_unavailable(
+            result.markdown, url, http_status
+        )
 
-            if is_unavailable:
-                logger.warning(f"[Crawl4AI] 🚫 Job unavailable: {unavailable_reason}")
-                raise JobUnavailableError(unavailable_reason)
+        if is_unavailable:
+            logger.warning(f"[Crawl4AI] 🚫 Job unavailable: {unavailable_reason}")
+            raise JobUnavailableError(unavailable_reason)
+
+        # Structured JobPosting data needs no LLM at all
+        normalized = extract_job_posting_ld(result.html)
+        if normalized is not None:
+            logger.info("[Crawl4AI] ⚡ Using JSON-LD JobPosting, skipping LLM")
+        else:
+            # Phase 2: LLM extraction over the already fetched HTML ("raw:"
+            # skips the network and browser)
+            extraction = await crawler.arun(
+                url=f"raw:{result.html}", config=extract_config
+            )
+            if not extraction.success:
+                raise IncompleteExtractionError(
+                    f"Extraction failed: {extraction.error_message}"
+                )
 
-            extracted = result.extracted_content
+            extracted = extraction.extracted_content
             if not extracted:
-                raise Exception("No content extracted")
+                raise IncompleteExtractionError("No content extracted")
 
             if isinstance(extracted, str):
                 parsed = json.loads(extracted)
@@ -371,74 +526,71 @@ async def crawl4ai_extract(url: str) -> dict:
 
             if isinstance(parsed, list):
                 if not parsed:
-                    raise Exception("LLM returned empty array.")
+                    raise IncompleteExtractionError("LLM returned empty array.")
                 normalized = parsed[0]
                 logger.warning("[Crawl4AI] LLM returned array, using first item")
-            elif isinstance(parsed, dict):
-                normalized = parsed
             else:
-                raise Exception(f"Unexpected parsed type: {type(parsed)}")
-
-            if not isinstance(normalized, dict):
-                raise Exception(f"Normalized is not a dict: {type(normalized)}")
-
-            # ✅ Check if LLM detected job as unavailable
-            if not normalized.get("job_available", True):
-                reason = normalized.get(
-                    "unavailable_reason", "Job posting no longer available"
-                )
-                logger.warning(f"[Crawl4AI] 🚫 LLM detected unavailable job: {reason}")
-                raise JobUnavailableError(reason)
-
-            # Ensure required fields exist
-            if not normalized.get("job_title") or not normalized.get("job_description"):
-                raise Exception(
-                    f"Missing required fields. Got: {list(normalized.keys())}"
-                )
+                normalized = parsed
 
-            # ✅ Normalize work_mode to standard categories
-            normalized["work_mode"] = normalize_work_mode(normalized.get("work_mode"))
-            logger.info(
-                f"[Crawl4AI] Work mode normalized to: {normalized['work_mode']}"
+        # ✅ Check if LLM detected job as unavailable (before validation, an
+        # unavailable page usually has no title/description to validate)
+        if isinstance(normalized, dict) and not normalized.get("job_available", True):
+            reason = normalized.get(
+                "unavailable_reason", "Job posting no longer available"
             )
+            logger.warning(f"[Crawl4AI] 🚫 LLM detected unavailable job: {reason}")
+            raise JobUnavailableError(reason)
 
-            # Add metadata
-            normalized["url"] = url
-            normalized["source_title"] = result.metadata.get("title", "")
+        # Validate, coerce and fill defaults in one pass; rejects non-objects
+        # and missing/empty required fields
+        try:
+            normalized = NormalizedJob.model_validate(normalized).model_dump()
+        except ValidationError as e:
+            raise IncompleteExtractionError(f"Missing required fields: {e}")
+
+        # ✅ Normalize work_mode to standard categories
+        normalized["work_mode"] = normalize_work_mode(normalized.get("work_mode"))
+        logger.info(
+            f"[Crawl4AI] Work mode normalized to: {normalized['work_mode']}"
+        )
 
-            # Ensure visa_feasibility always set
-            if not normalized.get("visa_feasibility"):
-                normalized["visa_feasibility"] = infer_visa_feasibility(normalized)
+        # Add metadata
+        normalized["url"] = url
+        normalized["source_title"] = result.metadata.get("title", "")
 
-            # ✅ Check if visa is restricted - raise special exception
-            if normalized.get("visa_feasibility") == "restricted":
-                logger.warning(f"[Crawl4AI] 🚫 Visa restricted for this position")
-                raise VisaRestrictedError(
-                    "Job requires work authorization/visa sponsorship not available"
-                )
+        # Ensure visa_feasibility always set
+        if not normalized.get("visa_feasibility"):
+            normalized["visa_feasibility"] = infer_visa_feasibility(normalized)
 
-            logger.info(
-                f"[Crawl4AI] ✅ Extracted: {normalized.get('job_title')} @ {normalized.get('company_name')} "
-                f"(Work: {normalized.get('work_mode')}, Visa: {normalized.get('visa_feasibility')})"
+        # ✅ Check if visa is restricted - raise special exception
+        if normalized.get("visa_feasibility") == "restricted":
+            logger.warning(f"[Crawl4AI] 🚫 Visa restricted for this position")
+            raise VisaRestrictedError(
+                "Job requires work authorization/visa sponsorship not available"
             )
 
-            # Save debug info
+        logger.info(
+            f"[Crawl4AI] ✅ Extracted: {normalized.get('job_title')} @ {normalized.get('company_name')} "
+            f"(Work: {normalized.get('work_mode')}, Visa: {normalized.get('visa_feasibility')})"
+        )
+
+        # Save debug info
+        if DEBUG_ARTIFACTS:
             debug_file = f"{DEBUG_DIR}/crawl4ai_{timestamp}.json"
             debug_payload = {
                 "url": url,
                 "success": result.success,
                 "http_status": http_status,
-                "extracted_content": normalized,
+                "extracted_content": dict(normalized),
                 "markdown_length": len(result.markdown) if result.markdown else 0,
                 "timestamp": timestamp,
             }
-            with open(debug_file, "w", encoding="utf-8") as f:
-                json.dump(debug_payload, f, ensure_ascii=False, indent=2)
-
+            _dump_in_background(_write_debug_json, debug_file, debug_payload)
             logger.info(f"[Crawl4AI] Debug saved → {debug_file}")
 
             extraction_strategy.show_usage()
-            return normalized
+
+        return normalized
 
     except (JobUnavailableError, VisaRestrictedError):
         # Re-raise these special exceptions so routes.py can handle them
@@ -458,20 +610,22 @@ async def crawl4ai_extract(url: str) -> dict:
         try:
             if "result" in locals() and result:
                 debug_payload["result_success"] = result.success
+            if "extraction" in locals() and extraction:
                 debug_payload["extracted_content_type"] = str(
-                    type(result.extracted_content)
+                    type(extraction.extracted_content)
                 )
                 debug_payload["extracted_content_preview"] = str(
-                    result.extracted_content
+                    extraction.extracted_content
                 )[:500]
         except Exception:
             pass
 
-        with open(debug_file, "w", encoding="utf-8") as f:
-            json.dump(debug_payload, f, ensure_ascii=False, indent=2)
+        await asyncio.to_thread(_write_debug_json, debug_file, debug_payload)
 
         logger.info(f"[Crawl4AI] Debug saved → {debug_file}")
-        raise Exception(f"Crawl4AI extraction failed: {str(e)}")
+        if isinstance(e, IncompleteExtractionError):
+            raise
+        raise Exception(f"Crawl4AI extraction failed: {str(e)}") from e
 
 
 # Custom exceptions for better error handling
@@ -485,3 +639,9 @@ class VisaRestrictedError(Exception):
     """Raised when job has visa restrictions"""
 
     pass
+
+
+class IncompleteExtractionError(Exception):
+    """Raised when the page loaded but no usable job data came out of it"""
+
+    pass
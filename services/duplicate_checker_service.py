@@ -1,10 +1,19 @@
+import asyncio
 import os
+import time
+from collections import OrderedDict
 import httpx
 import logging
-from dotenv import load_dotenv
+import orjson
 
-# Load environment variables
-load_dotenv()
+from services.cache_service import (
+    url_cache_key,
+    async_cache_get_json,
+    async_cache_get_many_json,
+    async_cache_set_json,
+    async_cache_set_many_json,
+)
+from services.http_client_service import get_http
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +22,86 @@ NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 
 NOTION_URL = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
 NOTION_VERSION = "2022-06-28"
+NOTION_HEADERS = {
+    "Authorization": f"Bearer {NOTION_API_KEY}",
+    "Content-Type": "application/json",
+    "Notion-Version": NOTION_VERSION,
+}
+
+# Positive hits are stable (jobs are never removed from Notion by the bot)
+DUPLICATE_CACHE_TTL = 3600
+# "Not in Notion" is only remembered briefly; saving the job overwrites it
+DUPLICATE_MISS_TTL = 600
+
+# Notion allows up to 100 filters in one compound filter
+MAX_BATCH_FILTERS = 100
+# Stay under Notion's ~3 requests/second average rate limit
+NOTION_CONCURRENCY = 3
+
+# In-process tier in front of Redis for URLs this process knows are saved.
+# Only positive results are kept: a "new" answer goes stale as soon as any
+# other process saves the job, and only Redis sees that update.
+LOCAL_CACHE_SIZE = 2048
+LOCAL_CACHE_TTL = 300
+_local_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+
+
+def _local_get(key: str) -> dict | None:
+    entry = _local_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        _local_cache.pop(key, None)
+        return None
+    _local_cache.move_to_end(key)
+    return result
+
+
+def _local_set(key: str, result: dict) -> None:
+    _local_cache[key] = (time.monotonic() + LOCAL_CACHE_TTL, result)
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+async def _remember(key: str, result: dict, ttl: int) -> None:
+    if result["exists"]:
+        _local_set(key, result)
+    await async_cache_set_json(key, result, ttl)
+
+
+def _page_to_result(page: dict) -> dict:
+    """Build the duplicate-check result for an existing Notion page."""
+    properties = page.get("properties", {})
+
+    # Extract job title
+    position_prop = properties.get("Position", {})
+    job_title = "Unknown Position"
+    if position_prop.get("type") == "title":
+        title_content = position_prop.get("title", [])
+        if title_content and len(title_content) > 0:
+            job_title = (
+                title_content[0].get("text", {}).get("content", "Unknown Position")
+            )
+
+    # Extract company name
+    company_prop = properties.get("Company", {})
+    company_name = ""
+    if company_prop.get("type") == "rich_text":
+        company_content = company_prop.get("rich_text", [])
+        if company_content and len(company_content) > 0:
+            company_name = company_content[0].get("text", {}).get("content", "")
+
+    full_title = f"{job_title} @ {company_name}" if company_name else job_title
+
+    return {
+        "exists": True,
+        "message": f"Job already exists: {full_title}",
+        "notion_url": page.get("url"),
+        "notion_page_id": page.get("id"),
+        "job_title": full_title,
+    }
 
 
 async def check_if_job_exists(job_url: str):
@@ -20,12 +109,6 @@ async def check_if_job_exists(job_url: str):
     Check if a given job URL already exists in the Notion database.
     Uses direct async HTTP calls instead of the Notion SDK for reliability.
     """
-    headers = {
-        "Authorization": f"Bearer {NOTION_API_KEY}",
-        "Content-Type": "application/json",
-        "Notion-Version": NOTION_VERSION,
-    }
-
     payload = {
         "filter": {"property": "Job Posting", "url": {"equals": job_url}},
         "page_size": 1,
@@ -40,62 +123,46 @@ async def check_if_job_exists(job_url: str):
         logger.error(error_msg)
         return {"exists": False, "error": error_msg}
 
+    cache_key = url_cache_key("dup", job_url)
+    cached = _local_get(cache_key)
+    if cached is None:
+        cached = await async_cache_get_json(cache_key)
+        if cached and cached["exists"]:
+            _local_set(cache_key, cached)
+    if cached:
+        logger.info(
+            f"⚡ Duplicate cache hit: {cached.get('job_title') or 'new job'}"
+        )
+        return cached
+
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(NOTION_URL, headers=headers, json=payload)
-            logger.info(f"📡 Notion responded with status {response.status_code}")
-
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get("results", [])
-                exists = len(results) > 0
-
-                if exists:
-                    # Extract info from the existing page
-                    page = results[0]
-                    properties = page.get("properties", {})
-
-                    # Extract job title
-                    position_prop = properties.get("Position", {})
-                    job_title = "Unknown Position"
-                    if position_prop.get("type") == "title":
-                        title_content = position_prop.get("title", [])
-                        if title_content and len(title_content) > 0:
-                            job_title = (
-                                title_content[0]
-                                .get("text", {})
-                                .get("content", "Unknown Position")
-                            )
-
-                    # Extract company name
-                    company_prop = properties.get("Company", {})
-                    company_name = ""
-                    if company_prop.get("type") == "rich_text":
-                        company_content = company_prop.get("rich_text", [])
-                        if company_content and len(company_content) > 0:
-                            company_name = (
-                                company_content[0].get("text", {}).get("content", "")
-                            )
-
-                    full_title = (
-                        f"{job_title} @ {company_name}" if company_name else job_title
-                    )
-
-                    logger.info(f"✅ Job exists in Notion: {full_title}")
-
-                    return {
-                        "exists": True,
-                        "message": f"Job already exists: {full_title}",
-                        "notion_url": page.get("url"),
-                        "notion_page_id": page.get("id"),
-                        "job_title": full_title,
-                    }
-                else:
-                    logger.info("✅ Job does not exist in Notion.")
-                    return {"exists": False, "message": "Job URL is new"}
+        response = await get_http().post(
+            NOTION_URL,
+            headers=NOTION_HEADERS,
+            content=orjson.dumps(payload),
+            timeout=10.0,
+        )
+        logger.info(f"📡 Notion responded with status {response.status_code}")
+
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            results = data.get("results", [])
+            exists = len(results) > 0
+
+            if exists:
+                # Extract info from the existing page
+                result = _page_to_result(results[0])
+                logger.info(f"✅ Job exists in Notion: {result['job_title']}")
+                await _remember(cache_key, result, DUPLICATE_CACHE_TTL)
+                return result
             else:
-                logger.error(f"❌ Notion API error: {response.text}")
-                return {"exists": False, "error": response.text}
+                logger.info("✅ Job does not exist in Notion.")
+                result = {"exists": False, "message": "Job URL is new"}
+                await _remember(cache_key, result, DUPLICATE_MISS_TTL)
+                return result
+        else:
+            logger.error(f"❌ Notion API error: {response.text}")
+            return {"exists": False, "error": response.text}
 
     except httpx.RequestError as e:
         logger.error(f"❌ Request error when checking Notion: {e}")
@@ -104,3 +171,141 @@ async def check_if_job_exists(job_url: str):
     except Exception as e:
         logger.error(f"❌ Unexpected error: {e}")
         return {"exists": False, "error": str(e)}
+
+
+async def _check_chunk(chunk: list[str], slots: asyncio.Semaphore) -> dict[str, dict]:
+    """
+    Run one OR-filtered Notion query for up to MAX_BATCH_FILTERS URLs.
+    Result pages are followed to the end: a URL saved more than once has
+    several pages, and a cut-off response would report it as new.
+    """
+    payload = {
+        "filter": {
+            "or": [
+                {"property": "Job Posting", "url": {"equals": job_url}}
+                for job_url in chunk
+            ]
+        },
+        "page_size": MAX_BATCH_FILTERS,
+    }
+
+    pages = []
+    try:
+        while True:
+            async with slots:
+                response = await get_http().post(
+                    NOTION_URL,
+                    headers=NOTION_HEADERS,
+                    content=orjson.dumps(payload),
+                    timeout=10.0,
+                )
+            if response.status_code != 200:
+                logger.error(f"❌ Notion API error: {response.text}")
+                return {}
+            data = orjson.loads(response.content)
+            pages.extend(data.get("results", []))
+            if not data.get("has_more") or not data.get("next_cursor"):
+                break
+            payload["start_cursor"] = data["next_cursor"]
+    except httpx.RequestError as e:
+        logger.error(f"❌ Request error when checking Notion: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"❌ Unexpected error: {e}")
+        return {}
+
+    found = {
+        page.get("properties", {}).get("Job Posting", {}).get("url"): page
+        for page in pages
+    }
+    results = {}
+    entries = []
+    for job_url in chunk:
+        cache_key = url_cache_key("dup", job_url)
+        page = found.get(job_url)
+        if page is not None:
+            result = _page_to_result(page)
+            _local_set(cache_key, result)
+            entries.append((cache_key, result, DUPLICATE_CACHE_TTL))
+        else:
+            result = {"exists": False, "message": "Job URL is new"}
+            entries.append((cache_key, result, DUPLICATE_MISS_TTL))
+        results[job_url] = result
+
+    # One pipelined write for the whole chunk
+    await async_cache_set_many_json(entries)
+    return results
+
+
+async def check_jobs_exist_batch(job_urls: list[str]) -> dict[str, dict]:
+    """
+    Duplicate-check many URLs with one Notion query per MAX_BATCH_FILTERS
+    URLs (an OR of "Job Posting equals" filters) instead of one query each.
+    Queries run concurrently, at most NOTION_CONCURRENCY at a time.
+
+    Results are written to the duplicate cache, so the per-job
+    check_if_job_exists calls that follow are cache hits. URLs whose lookup
+    failed are left out of the returned mapping (and the cache).
+    """
+    if not NOTION_API_KEY or not NOTION_DATABASE_ID:
+        logger.error(
+            "❌ Missing NOTION_API_KEY or NOTION_DATABASE_ID environment variable."
+        )
+        return {}
+
+    results = {}
+    unseen = {}
+    for job_url in dict.fromkeys(job_urls):
+        cache_key = url_cache_key("dup", job_url)
+        cached = _local_get(cache_key)
+        if cached:
+            results[job_url] = cached
+        else:
+            unseen[job_url] = cache_key
+
+    # Everything the local tier didn't know is read with a single MGET
+    pending = []
+    cached_values = await async_cache_get_many_json(list(unseen.values()))
+    for job_url, cached in zip(unseen, cached_values):
+        if cached:
+            if cached["exists"]:
+                _local_set(unseen[job_url], cached)
+            results[job_url] = cached
+        else:
+            pending.append(job_url)
+
+    logger.info(
+        f"🔍 Batch duplicate check: {len(results)} cached, {len(pending)} to query"
+    )
+
+    slots = asyncio.Semaphore(NOTION_CONCURRENCY)
+    chunk_results = await asyncio.gather(
+        *(
+            _check_chunk(pending[start : start + MAX_BATCH_FILTERS], slots)
+            for start in range(0, len(pending), MAX_BATCH_FILTERS)
+        )
+    )
+    for chunk_result in chunk_results:
+        results.update(chunk_result)
+
+    return results
+
+
+async def remember_saved_job(
+    job_url: str, job_title: str, notion_result: dict
+) -> None:
+    """
+    Record a freshly saved job as a duplicate, replacing any cached
+    "Job URL is new" entry so resubmissions are caught immediately.
+    """
+    await _remember(
+        url_cache_key("dup", job_url),
+        {
+            "exists": True,
+            "message": f"Job already exists: {job_title}",
+            "notion_url": notion_result.get("notion_url"),
+            "notion_page_id": notion_result.get("notion_page_id"),
+            "job_title": job_title,
+        },
+        DUPLICATE_CACHE_TTL,
+    )
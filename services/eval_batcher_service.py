@@ -0,0 +1,136 @@
+# services/eval_batcher_service.py
+"""
+Micro-batcher for job evaluations.
+
+Jobs processed around the same time (batch submissions, back-to-back URLs)
+are evaluated in one LLM call, so the master resume and scoring rubric are
+sent once per batch instead of once per job.
+
+The queue lives on a dedicated background loop thread shared by every
+caller in the process. Batch windows and dispatch then keep their timing
+while the worker loop is busy with pipeline stages, and callers on any
+loop can submit (submit_evaluation hands over with run_coroutine_threadsafe).
+"""
+import asyncio
+import logging
+import os
+import threading
+
+from services.llm_evaluation_service import evaluate_job_match, evaluate_jobs_batch
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 8
+BATCH_WINDOW_SECONDS = 0.2
+MAX_IN_FLIGHT = 4
+
+_state_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_pid: int | None = None
+
+# Only used from the batcher loop
+_queue: asyncio.Queue | None = None
+_in_flight = 0
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the batcher loop thread (again, after a fork) if needed."""
+    global _loop, _pid, _queue, _in_flight
+
+    with _state_lock:
+        if _loop is None or _pid != os.getpid():
+            _in_flight = 0
+            _loop = asyncio.new_event_loop()
+            # Binds to the batcher loop on first use
+            _queue = asyncio.Queue()
+            threading.Thread(
+                target=_loop.run_forever, name="eval-batcher", daemon=True
+            ).start()
+            asyncio.run_coroutine_threadsafe(_drain(), _loop)
+            _pid = os.getpid()
+
+        return _loop
+
+
+async def _drain():
+    """Collect queued evaluations into batches and dispatch them."""
+    global _in_flight
+
+    slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+    while True:
+        batch = [await _queue.get()]
+
+        # Idle fast path: nothing else waiting or running, evaluate right away
+        if not (_queue.empty() and _in_flight == 0):
+            deadline = _loop.time() + BATCH_WINDOW_SECONDS
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - _loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+        # Skip callers that were cancelled while waiting
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            continue
+
+        await slots.acquire()
+        _in_flight += 1
+        task = asyncio.create_task(_run_batch(batch))
+
+        def _release(_, slots=slots):
+            global _in_flight
+            _in_flight -= 1
+            slots.release()
+
+        task.add_done_callback(_release)
+
+
+async def _run_batch(batch):
+    jobs = [(job_text, visa_warning) for job_text, visa_warning, _ in batch]
+
+    if len(batch) == 1:
+        results = await asyncio.gather(
+            evaluate_job_match(*jobs[0]), return_exceptions=True
+        )
+    else:
+        try:
+            results = await evaluate_jobs_batch(jobs)
+        except Exception:
+            # Fall back to one call per job rather than failing the whole batch
+            logger.warning(
+                f"⚠️ Batched evaluation of {len(batch)} jobs failed, "
+                "evaluating individually"
+            )
+            results = await asyncio.gather(
+                *(evaluate_job_match(*job) for job in jobs), return_exceptions=True
+            )
+
+    for (_, _, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+async def _enqueue(job_text: str, visa_warning: str | None) -> dict:
+    future = _loop.create_future()
+    await _queue.put((job_text, visa_warning, future))
+    return await future
+
+
+async def submit_evaluation(job_text: str, visa_warning: str = None) -> dict:
+    """
+    Drop-in replacement for evaluate_job_match that may share an LLM call
+    with other jobs being evaluated at the same time.
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _enqueue(job_text, visa_warning), _ensure_loop()
+    )
+    return await asyncio.wrap_future(future)
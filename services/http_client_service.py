@@ -0,0 +1,47 @@
+# services/http_client_service.py
+"""
+Shared httpx.AsyncClient instances, so Notion/Supabase calls reuse pooled
+keep-alive connections instead of paying a TCP+TLS handshake per request.
+
+httpx clients are bound to the event loop they are used on (the API loop, the
+Celery worker loop, background pool loops), so clients are kept per running loop. Named clients
+are available for SDKs that reconfigure the client they are given (the
+Notion SDK overwrites base_url and headers).
+"""
+import asyncio
+import logging
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http(name: str = "default") -> httpx.AsyncClient:
+    """Return the shared client for the running event loop (created lazily)."""
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS
+        )
+        clients[name] = client
+        logger.debug(f"Created shared HTTP client '{name}'")
+
+    return client
+
+
+async def close_http() -> None:
+    """Close every shared client that belongs to the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
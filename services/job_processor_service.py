@@ -129,10 +129,17 @@ Improvements:
 - Better error classification
 - Playwright now also detects unavailable jobs early
 """
+import asyncio
+import copy
 import logging
+import os
 import time
+from urllib.parse import urlsplit
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from services.crawl4ai_service import (
     crawl4ai_extract,
+    infer_visa_feasibility,
+    IncompleteExtractionError,
     JobUnavailableError,
     VisaRestrictedError,
 )
@@ -141,11 +148,193 @@ from services.playwright_scraper_service import (
     JobUnavailableError as PlaywrightJobUnavailableError,
 )
 from services.llm_normalization_service import llm_normalize_job_data
+from services.jsonld_service import extract_job_posting_ld
+from services.cache_service import (
+    get_async_redis,
+    url_cache_key,
+    async_cache_get_json,
+    async_cache_set_json,
+)
+from opentelemetry import metrics, trace
+import redis
 
 logger = logging.getLogger(__name__)
 
+# No-ops unless the process configures an OpenTelemetry SDK/exporter
+tracer = trace.get_tracer(__name__)
+_meter = metrics.get_meter(__name__)
+CRAWL4AI_LATENCY = _meter.create_histogram(
+    "extraction.crawl4ai.duration",
+    unit="s",
+    description="Crawl4AI fast path time, by outcome",
+)
+PLAYWRIGHT_LATENCY = _meter.create_histogram(
+    "extraction.playwright.duration",
+    unit="s",
+    description="Successful Playwright scrape + normalization time",
+)
+FALLBACKS = _meter.create_counter(
+    "extraction.fallbacks",
+    description="Crawl4AI failures handed to the Playwright path, by error type",
+)
 
-async def extract_job_data(url: str, force_playwright: bool = False) -> dict:
+# Job postings rarely change within minutes; resubmissions reuse the extraction
+EXTRACTION_CACHE_TTL = 600
+
+# Start Playwright speculatively if Crawl4AI hasn't finished by then (0 = off).
+# Kept above the usual Crawl4AI time (crawl + LLM, ~5-10s) so the happy path
+# rarely pays for a second scrape and normalization call.
+HEDGE_DELAY_SECONDS = float(os.getenv("EXTRACTION_HEDGE_SECONDS", "15"))
+
+# Hard deadlines per stage so a hung crawl, page or LLM call can't hold a
+# worker slot forever. Crawl4AI's sits above the hedge delay so hedging still
+# gets a chance; Playwright's covers its three navigation attempts.
+CRAWL4AI_DEADLINE_SECONDS = float(os.getenv("CRAWL4AI_DEADLINE_SECONDS", "30"))
+PLAYWRIGHT_DEADLINE_SECONDS = float(os.getenv("PLAYWRIGHT_DEADLINE_SECONDS", "150"))
+NORMALIZE_DEADLINE_SECONDS = float(os.getenv("NORMALIZE_DEADLINE_SECONDS", "60"))
+
+# Failures the Playwright path may recover from (asyncio.TimeoutError is
+# TimeoutError on 3.11+)
+FALLBACK_ERRORS: tuple[type[BaseException], ...] = (
+    IncompleteExtractionError,
+    TimeoutError,
+    ConnectionError,
+    PlaywrightTimeoutError,
+)
+
+# Per-domain Crawl4AI track record. Domains where it almost never works are
+# sent straight to Playwright; stats expire so such domains get re-tested.
+DOMAIN_STATS_PREFIX = "extract:domain:"
+DOMAIN_STATS_TTL = 7 * 24 * 3600
+DOMAIN_MIN_SAMPLES = 10
+DOMAIN_MIN_SUCCESS_RATE = 0.2
+# (total, success) hash fields per path; Playwright's are kept for comparison
+# only, routing looks at Crawl4AI's
+DOMAIN_STATS_FIELDS = {
+    "crawl4ai": ("total", "success"),
+    "playwright": ("playwright_total", "playwright_success"),
+}
+# Comma-separated overrides, e.g. PLAYWRIGHT_DOMAINS=www.linkedin.com
+PLAYWRIGHT_DOMAINS = {
+    d.strip().lower()
+    for d in os.getenv("PLAYWRIGHT_DOMAINS", "").split(",")
+    if d.strip()
+}
+CRAWL4AI_DOMAINS = {
+    d.strip().lower()
+    for d in os.getenv("CRAWL4AI_DOMAINS", "").split(",")
+    if d.strip()
+}
+
+
+class _InflightRun:
+    """One running extraction and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# Extractions currently running, keyed by cache key, mode and refresh flag. A
+# URL submitted again while its first extraction is still running joins that
+# run; a forced refresh never joins a run that may answer from the cache.
+_INFLIGHT: dict[tuple[str, bool, bool], _InflightRun] = {}
+
+
+def _domain(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+async def _prefers_playwright(domain: str) -> bool:
+    """True if Crawl4AI is configured off or keeps failing for this domain."""
+    if domain in PLAYWRIGHT_DOMAINS:
+        return True
+    if domain in CRAWL4AI_DOMAINS:
+        return False
+
+    try:
+        stats = await get_async_redis().hgetall(DOMAIN_STATS_PREFIX + domain)
+    except redis.RedisError as e:
+        logger.warning("[JobProcessor] ⚠️ Domain stats read failed: %s", e)
+        return False
+
+    total = int(stats.get(b"total", 0))
+    success = int(stats.get(b"success", 0))
+    return total >= DOMAIN_MIN_SAMPLES and success / total < DOMAIN_MIN_SUCCESS_RATE
+
+
+async def _record_domain_outcome(domain: str, path: str, success: bool) -> None:
+    """Count one Crawl4AI or Playwright attempt for the domain."""
+    key = DOMAIN_STATS_PREFIX + domain
+    total_field, success_field = DOMAIN_STATS_FIELDS[path]
+    try:
+        pipe = get_async_redis().pipeline()
+        pipe.hincrby(key, total_field, 1)
+        if success:
+            pipe.hincrby(key, success_field, 1)
+        pipe.expire(key, DOMAIN_STATS_TTL)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("[JobProcessor] ⚠️ Domain stats write failed: %s", e)
+
+
+async def extract_job_data(
+    url: str, force_playwright: bool = False, force_refresh: bool = False
+) -> dict:
+    """
+    Extract and normalize job data with intelligent fallback.
+
+    Concurrent calls for the same URL share one extraction; each caller gets
+    its own copy of the result (see _extract_job_data for the strategy).
+    Cancelling a caller only cancels the extraction once no other caller is
+    waiting for it.
+    """
+    key = (url_cache_key("extract", url), force_playwright, force_refresh)
+    run = _INFLIGHT.get(key)
+    if run is not None and run.task.get_loop() is asyncio.get_running_loop():
+        logger.info("[JobProcessor] 🔗 Joining in-flight extraction for %s", url)
+    else:
+        task = asyncio.create_task(
+            _extract_job_data(url, force_playwright, force_refresh)
+        )
+        run = _INFLIGHT[key] = _InflightRun(task)
+        task.add_done_callback(lambda t: _forget_inflight(key, t))
+
+    run.waiters += 1
+    try:
+        # Shielded so a cancelled caller doesn't cancel the run for the others
+        result = copy.deepcopy(await asyncio.shield(run.task))
+    except asyncio.CancelledError:
+        if run.waiters == 1 and not run.task.done():
+            # Last caller gone: stop the run (browser, LLM) instead of letting
+            # it finish unseen, and wait for it to release its resources
+            logger.info("[JobProcessor] 🛑 Cancelling unwanted extraction for %s", url)
+            if _INFLIGHT.get(key) is run:
+                del _INFLIGHT[key]
+            run.task.cancel()
+            await asyncio.wait({run.task})
+        raise
+    finally:
+        run.waiters -= 1
+
+    # Cache entries and joined runs are keyed without tracking params, so the
+    # result may come from another variant; report the one that was asked for
+    result["url"] = url
+    return result
+
+
+def _forget_inflight(key: tuple[str, bool, bool], task: asyncio.Task) -> None:
+    run = _INFLIGHT.get(key)
+    if run is not None and run.task is task:
+        del _INFLIGHT[key]
+    # Mark the outcome as seen when every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _extract_job_data(
+    url: str, force_playwright: bool = False, force_refresh: bool = False
+) -> dict:
     """
     Extract and normalize job data with intelligent fallback.
 
@@ -167,11 +356,15 @@ async def extract_job_data(url: str, force_playwright: bool = False) -> dict:
     Args:
         url: Job posting URL
         force_playwright: Skip Crawl4AI and use Playwright directly
+        force_refresh: Ignore a cached extraction for this URL (the fresh
+            result still replaces it)
 
     Returns:
         Normalized job dict with keys:
         - url, job_title, company_name, location, work_mode,
           job_description, extraction_method, extraction_time
+        Cache hits report extraction_method="cache" and keep the original
+        method in cached_extraction_method.
 
     Raises:
         JobUnavailableError: When job posting is closed/filled
@@ -179,61 +372,191 @@ async def extract_job_data(url: str, force_playwright: bool = False) -> dict:
         Exception: When all extraction methods fail
     """
 
+    cache_key = url_cache_key("extract", url)
+
     # Optional: Force Playwright for testing or known problematic sites
     if force_playwright:
-        logger.info(f"[JobProcessor] 🔧 Forced Playwright mode for {url}")
-        return await _playwright_path(url)
+        logger.info("[JobProcessor] 🔧 Forced Playwright mode for %s", url)
+        normalized = await _playwright_path(url)
+        await async_cache_set_json(cache_key, normalized, EXTRACTION_CACHE_TTL)
+        return normalized
+
+    # Same URL resubmitted recently: skip the browser + LLM entirely
+    cached = None if force_refresh else await async_cache_get_json(cache_key)
+    if cached:
+        logger.info(
+            "[JobProcessor] ⚡ Extraction cache hit: %s (%s)",
+            cached.get("job_title"),
+            cached.get("extraction_method"),
+        )
+        cached["cached_extraction_method"] = cached.get("extraction_method")
+        cached["extraction_method"] = "cache"
+        return cached
+
+    # Skip the fast path on sites where it (almost) never works
+    domain = _domain(url)
+    if await _prefers_playwright(domain):
+        logger.info("[JobProcessor] 🧭 Routing %s straight to Playwright", domain)
+        normalized = await _playwright_path(url)
+        await async_cache_set_json(cache_key, normalized, EXTRACTION_CACHE_TTL)
+        return normalized
 
-    # Try fast path first
-    start_time = time.time()
+    # Try fast path first. If it is still running after HEDGE_DELAY_SECONDS,
+    # start the Playwright path alongside it and keep whichever succeeds first
+    start_time = time.perf_counter()
+    crawl_task = asyncio.create_task(_crawl4ai_attempt(url))
+    playwright_task = None
     try:
-        logger.info(f"[JobProcessor] ⚡ Attempting Crawl4AI fast path...")
-        normalized = await crawl4ai_extract(url)
+        logger.info("[JobProcessor] ⚡ Attempting Crawl4AI fast path...")
+        if HEDGE_DELAY_SECONDS > 0:
+            done, _ = await asyncio.wait({crawl_task}, timeout=HEDGE_DELAY_SECONDS)
+            if not done:
+                logger.info(
+                    "[JobProcessor] ⏱️ Crawl4AI still running after %.0fs, "
+                    "starting Playwright in parallel",
+                    HEDGE_DELAY_SECONDS,
+                )
+                playwright_task = asyncio.create_task(_playwright_path(url))
+                done, _ = await asyncio.wait(
+                    {crawl_task, playwright_task},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if crawl_task not in done:
+                    if playwright_task.exception() is None:
+                        logger.info("[JobProcessor] 🏁 Playwright finished first")
+                        # Crawl4AI hung past the hedge: a failure for routing
+                        await _record_domain_outcome(domain, "crawl4ai", False)
+                        CRAWL4AI_LATENCY.record(
+                            time.perf_counter() - start_time, {"outcome": "hedged"}
+                        )
+                        normalized = playwright_task.result()
+                        await async_cache_set_json(
+                            cache_key, normalized, EXTRACTION_CACHE_TTL
+                        )
+                        return normalized
+                    # Playwright failed first, Crawl4AI may still succeed
+                    await asyncio.wait({crawl_task})
+
+        normalized = crawl_task.result()
 
         # Validate we got meaningful data
         if not normalized.get("job_title") or not normalized.get("job_description"):
-            raise Exception("Incomplete extraction - missing critical fields")
+            raise IncompleteExtractionError(
+                "Incomplete extraction - missing critical fields"
+            )
 
-        elapsed = time.time() - start_time
-        logger.info(
-            f"[JobProcessor] ✅ Crawl4AI succeeded in {elapsed:.2f}s "
-            f"({len(normalized.get('job_description', ''))} chars)"
-        )
+        elapsed = time.perf_counter() - start_time
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[JobProcessor] ✅ Crawl4AI succeeded in %.2fs (%d chars)",
+                elapsed,
+                len(normalized.get("job_description", "")),
+            )
         normalized["extraction_method"] = "crawl4ai"
         normalized["extraction_time"] = round(elapsed, 2)
+        await _record_domain_outcome(domain, "crawl4ai", True)
+        CRAWL4AI_LATENCY.record(elapsed, {"outcome": "success"})
+        await async_cache_set_json(cache_key, normalized, EXTRACTION_CACHE_TTL)
         return normalized
 
     except (JobUnavailableError, VisaRestrictedError) as e:
         # ✅ DO NOT FALLBACK - these are business logic stops, not technical failures
-        elapsed = time.time() - start_time
+        # (Crawl4AI did its job, so it counts as a success for the domain)
+        await _record_domain_outcome(domain, "crawl4ai", True)
+        elapsed = time.perf_counter() - start_time
+        CRAWL4AI_LATENCY.record(elapsed, {"outcome": "stopped"})
         logger.warning(
-            f"[JobProcessor] 🚫 Stopping processing after {elapsed:.2f}s: {str(e)}"
+            "[JobProcessor] 🚫 Stopping processing after %.2fs: %s", elapsed, e
         )
-        logger.info(f"[JobProcessor] ⛔ No fallback - job should not be processed")
+        logger.info("[JobProcessor] ⛔ No fallback - job should not be processed")
         # Re-raise to bubble up to tasks.py
         raise
 
     except Exception as e:
         # ✅ Technical failure - attempt fallback
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         error_type = type(e).__name__
 
         # Log detailed failure info
         logger.warning(
-            f"[JobProcessor] Crawl4AI failed after {elapsed:.2f}s "
-            f"({error_type}: {str(e)[:100]})"
+            "[JobProcessor] Crawl4AI failed after %.2fs (%s: %.100s)",
+            elapsed,
+            error_type,
+            e,
         )
 
+        await _record_domain_outcome(domain, "crawl4ai", False)
+        CRAWL4AI_LATENCY.record(elapsed, {"outcome": "failure"})
+
         # Determine if we should fallback based on error type
         should_fallback = _should_attempt_fallback(e)
 
         if should_fallback:
-            logger.info(f"[JobProcessor] 🔄 Falling back to Playwright path...")
-            return await _playwright_path(url)
+            FALLBACKS.add(1, {"reason": error_type})
+            if playwright_task is None:
+                logger.info("[JobProcessor] 🔄 Falling back to Playwright path...")
+                normalized = await _playwright_path(url)
+            else:
+                logger.info("[JobProcessor] 🔄 Using the Playwright path in flight...")
+                normalized = await playwright_task
+            await async_cache_set_json(cache_key, normalized, EXTRACTION_CACHE_TTL)
+            return normalized
         else:
-            logger.error(f"[JobProcessor] ❌ Non-recoverable error, not falling back")
+            logger.error("[JobProcessor] ❌ Non-recoverable error, not falling back")
             raise
 
+    finally:
+        # Whichever path lost (or wasn't needed) is cancelled
+        for task in (crawl_task, playwright_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+async def extract_job_data_batch(
+    urls: list[str],
+    concurrency: int = 8,
+    per_domain_concurrency: int = 2,
+    force_playwright: bool = False,
+) -> list[dict | Exception]:
+    """
+    Extract several job URLs concurrently.
+
+    At most `concurrency` extractions run at once, and at most
+    `per_domain_concurrency` against any one site, so a batch of LinkedIn
+    links doesn't hammer LinkedIn.
+
+    Returns:
+        One entry per URL, in input order: the normalized job dict, or the
+        exception that extraction raised (JobUnavailableError etc.)
+    """
+    slots = asyncio.Semaphore(concurrency)
+    domain_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def _extract(url: str) -> dict | Exception:
+        domain_slot = domain_slots.setdefault(
+            _domain(url), asyncio.Semaphore(per_domain_concurrency)
+        )
+        async with domain_slot, slots:
+            try:
+                return await extract_job_data(url, force_playwright)
+            except Exception as e:
+                return e
+
+    logger.info(
+        "[JobProcessor] 📦 Extracting batch of %d URLs (concurrency %d, %d/domain)",
+        len(urls),
+        concurrency,
+        per_domain_concurrency,
+    )
+    return await asyncio.gather(*(_extract(url) for url in urls))
+
+
+async def _crawl4ai_attempt(url: str) -> dict:
+    """Crawl4AI fast path under its deadline, traced as its own span."""
+    with tracer.start_as_current_span("crawl4ai_extract") as span:
+        span.set_attribute("url.host", _domain(url))
+        return await asyncio.wait_for(crawl4ai_extract(url), CRAWL4AI_DEADLINE_SECONDS)
+
 
 def _should_attempt_fallback(error: Exception) -> bool:
     """
@@ -242,48 +565,22 @@ def _should_attempt_fallback(error: Exception) -> bool:
     Fallback for:
     - Timeout errors
     - Network/connection errors
-    - Parsing/extraction errors
-    - Content validation failures
+    - Parsing/extraction errors and content validation failures
+      (IncompleteExtractionError)
 
     Don't fallback for:
     - Explicit business logic errors (already handled above)
-    - Resource exhaustion errors
-    - Configuration errors
+    - Anything else (programming/configuration errors): fail fast
     """
-    error_str = str(error).lower()
-    error_type = type(error).__name__
-
-    # Patterns that suggest a fallback might help
-    fallback_patterns = [
-        "timeout",
-        "timed out",
-        "connection",
-        "network",
-        "incomplete extraction",
-        "missing required fields",
-        "no content extracted",
-        "empty",
-        "failed on navigating",
-    ]
-
-    # Check if error message contains any fallback-worthy patterns
-    if any(pattern in error_str for pattern in fallback_patterns):
-        return True
-
-    # Check error types that are worth retrying
-    retriable_errors = [
-        "TimeoutError",
-        "NetworkError",
-        "ConnectionError",
-        "RuntimeError",  # Crawl4AI often wraps navigation errors in RuntimeError
-    ]
-
-    if error_type in retriable_errors:
+    # crawl4ai_extract wraps unexpected errors, the original is the cause
+    if isinstance(error, FALLBACK_ERRORS) or isinstance(
+        error.__cause__, FALLBACK_ERRORS
+    ):
         return True
 
-    # Default: don't fallback for unknown errors (fail fast)
     logger.warning(
-        f"[JobProcessor] Unknown error type '{error_type}' - not falling back"
+        "[JobProcessor] Unknown error type '%s' - not falling back",
+        type(error).__name__,
     )
     return False
 
@@ -294,45 +591,66 @@ async def _playwright_path(url: str) -> dict:
 
     Now includes early job availability detection before normalization.
     """
-    start_time = time.time()
+    domain = _domain(url)
+    with tracer.start_as_current_span("playwright_path") as span:
+        span.set_attribute("url.host", domain)
+        start_time = time.perf_counter()
 
-    try:
-        # Step 1: Scrape with Playwright (now includes unavailable detection)
-        scrape_start = time.time()
         try:
-            raw_scraped = await playwright_scrape_job(url)
-        except PlaywrightJobUnavailableError as e:
-            # Playwright detected unavailable job - convert to our exception type
-            logger.warning(
-                f"[JobProcessor] 🚫 Playwright detected unavailable: {str(e)}"
+            # Step 1: Scrape with Playwright (now includes unavailable detection)
+            scrape_start = time.perf_counter()
+            try:
+                raw_scraped = await asyncio.wait_for(
+                    playwright_scrape_job(url), PLAYWRIGHT_DEADLINE_SECONDS
+                )
+            except PlaywrightJobUnavailableError as e:
+                # Playwright detected unavailable job - convert to our exception type
+                logger.warning(
+                    "[JobProcessor] 🚫 Playwright detected unavailable: %s", e
+                )
+                raise JobUnavailableError(str(e))
+
+            scrape_time = time.perf_counter() - scrape_start
+
+            # Step 2: Normalize - structured JobPosting data needs no LLM call
+            normalize_start = time.perf_counter()
+            normalized = extract_job_posting_ld(raw_scraped.get("html"))
+            if normalized is not None:
+                normalized["url"] = url
+                normalized["source_title"] = raw_scraped.get("title", "")
+                normalized["visa_feasibility"] = infer_visa_feasibility(normalized)
+            else:
+                normalized = await asyncio.wait_for(
+                    llm_normalize_job_data(raw_scraped), NORMALIZE_DEADLINE_SECONDS
+                )
+            normalize_time = time.perf_counter() - normalize_start
+
+            total_time = time.perf_counter() - start_time
+
+            logger.info(
+                "[JobProcessor] ✅ Playwright path succeeded in %.2fs "
+                "(scrape: %.2fs, normalize: %.2fs) - %s @ %s",
+                total_time,
+                scrape_time,
+                normalize_time,
+                normalized.get("job_title"),
+                normalized.get("company_name"),
             )
-            raise JobUnavailableError(str(e))
-
-        scrape_time = time.time() - scrape_start
-
-        # Step 2: Normalize with LLM
-        normalize_start = time.time()
-        normalized = await llm_normalize_job_data(raw_scraped)
-        normalize_time = time.time() - normalize_start
-
-        total_time = time.time() - start_time
 
-        logger.info(
-            f"[JobProcessor] ✅ Playwright path succeeded in {total_time:.2f}s "
-            f"(scrape: {scrape_time:.2f}s, normalize: {normalize_time:.2f}s) - "
-            f"{normalized.get('job_title')} @ {normalized.get('company_name')}"
-        )
-
-        normalized["extraction_method"] = "playwright+llm"
-        normalized["extraction_time"] = round(total_time, 2)
-        normalized["scrape_time"] = round(scrape_time, 2)
-        normalized["normalize_time"] = round(normalize_time, 2)
-        return normalized
-
-    except JobUnavailableError:
-        # Re-raise without wrapping
-        raise
+            normalized["extraction_method"] = "playwright+llm"
+            normalized["extraction_time"] = round(total_time, 2)
+            normalized["scrape_time"] = round(scrape_time, 2)
+            normalized["normalize_time"] = round(normalize_time, 2)
+            PLAYWRIGHT_LATENCY.record(total_time)
+            await _record_domain_outcome(domain, "playwright", True)
+            return normalized
+
+        except JobUnavailableError:
+            # Playwright did its job; re-raise without wrapping
+            await _record_domain_outcome(domain, "playwright", True)
+            raise
 
-    except Exception as e:
-        logger.error(f"[JobProcessor] ❌ Playwright path failed for {url}")
-        raise Exception(f"Playwright extraction failed: {str(e)}")
+        except Exception as e:
+            logger.error("[JobProcessor] ❌ Playwright path failed for %s", url)
+            await _record_domain_outcome(domain, "playwright", False)
+            raise Exception(f"Playwright extraction failed: {str(e)}")
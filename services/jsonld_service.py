@@ -0,0 +1,139 @@
+# services/jsonld_service.py
+"""
+Zero-LLM extraction from schema.org JobPosting JSON-LD.
+
+Most ATS job pages (Workday, Greenhouse, Lever, LinkedIn, ...) embed the
+posting as <script type="application/ld+json">. When it carries a title,
+company and a real description, it is mapped straight to the NormalizedJob
+shape and the LLM extraction is skipped.
+"""
+import html
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Shorter descriptions are usually teasers; let the LLM read the page instead
+MIN_DESCRIPTION_CHARS = 300
+
+_LD_SCRIPT_RE = re.compile(
+    r"<script[^>]+type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_BLOCK_END_RE = re.compile(r"<br\s*/?>|</(?:p|div|h[1-6]|ul|ol)>", re.IGNORECASE)
+_LIST_ITEM_RE = re.compile(r"<li[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+
+
+def _iter_nodes(data):
+    """Yield every JSON-LD object, flattening lists and @graph containers."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_nodes(data["@graph"])
+
+
+def _is_job_posting(node: dict) -> bool:
+    node_type = node.get("@type")
+    if isinstance(node_type, list):
+        return "JobPosting" in node_type
+    return node_type == "JobPosting"
+
+
+def _html_to_text(fragment: str) -> str:
+    """Flatten a JobPosting description (HTML) to plain text with bullets."""
+    text = html.unescape(fragment)
+    text = _LIST_ITEM_RE.sub("\n- ", text)
+    text = _BLOCK_END_RE.sub("\n", text)
+    text = _TAG_RE.sub("", text)
+    # Descriptions are often double-escaped (&lt;p&gt;...), unescape leftovers
+    text = html.unescape(text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _name(value) -> str | None:
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _location(posting: dict) -> str | None:
+    locations = posting.get("jobLocation") or []
+    if isinstance(locations, dict):
+        locations = [locations]
+
+    parts = []
+    for location in locations:
+        address = location.get("address") if isinstance(location, dict) else None
+        if not isinstance(address, dict):
+            continue
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        label = ", ".join(
+            str(part) for part in (address.get("addressLocality"), country) if part
+        )
+        if label and label not in parts:
+            parts.append(label)
+
+    return "; ".join(parts) or None
+
+
+def extract_job_posting_ld(page_html: str) -> dict | None:
+    """
+    Return a NormalizedJob-shaped dict from the page's JobPosting JSON-LD,
+    or None when there is none or it lacks a title, company or description.
+    """
+    if not page_html:
+        return None
+
+    for raw in _LD_SCRIPT_RE.findall(page_html):
+        try:
+            data = json.loads(raw.strip())
+        except ValueError:
+            continue
+
+        for node in _iter_nodes(data):
+            if not _is_job_posting(node):
+                continue
+
+            job_title = _name(node.get("title"))
+            company_name = _name(node.get("hiringOrganization"))
+            description = _html_to_text(str(node.get("description") or ""))
+
+            if not job_title or not company_name:
+                continue
+            if len(description) < MIN_DESCRIPTION_CHARS:
+                continue
+
+            location_type = str(node.get("jobLocationType") or "").upper()
+            employment_type = node.get("employmentType")
+            if isinstance(employment_type, list):
+                employment_type = " ".join(map(str, employment_type))
+
+            if location_type == "TELECOMMUTE":
+                work_mode = "Remote"
+            elif "CONTRACT" in str(employment_type or "").upper():
+                work_mode = "Contract"
+            else:
+                work_mode = None
+
+            logger.info(f"[JSON-LD] ✅ JobPosting found: {job_title} @ {company_name}")
+            return {
+                "job_title": job_title,
+                "company_name": company_name,
+                "location": _location(node)
+                or ("Remote" if work_mode == "Remote" else None),
+                "work_mode": work_mode,
+                "job_description": description,
+                "visa_feasibility": None,
+                "job_available": True,
+                "unavailable_reason": None,
+            }
+
+    return None
@@ -0,0 +1,254 @@
+# services/llm_combined_tailor_service.py
+"""
+Tailors resume + cover letter in ONE LLM request.
+
+Both documents share the same context (master resume, job description,
+evaluation, role), so sending it once halves prompt tokens and saves a
+round-trip compared to calling tailor_resume + tailor_cover_letter.
+"""
+from functools import lru_cache
+from openai import AsyncOpenAI
+import logging
+import os
+import json
+
+from services.cache_service import (
+    async_cache_get_json,
+    async_cache_set_json,
+    content_cache_key,
+)
+from services.llm_rate_limit_service import openai_slot
+from services.llm_resume_service import (
+    RESUME_SCHEMA,
+    load_master_resume,
+    finalize_resume_data,
+    join_items,
+    strict_object_schema,
+    trim_job_description,
+)
+from services.llm_cover_letter_service import (
+    COVER_LETTER_SCHEMA,
+    finalize_cover_letter_data,
+)
+
+logger = logging.getLogger(__name__)
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Tailoring responses for an identical request are reused for a day
+LLM_RESPONSE_CACHE_TTL = 86400
+
+# Both documents in one response, shape enforced server-side (strict)
+TAILORED_DOCUMENTS_SCHEMA = strict_object_schema(
+    {"resume": RESUME_SCHEMA, "cover_letter": COVER_LETTER_SCHEMA}
+)
+
+
+@lru_cache(maxsize=1)
+def _static_prompt(master_resume: str) -> str:
+    """
+    Job-independent part of the prompt (master resume + rules). It leads the
+    user message so OpenAI's automatic prompt caching can reuse it across jobs.
+    """
+    return f"""Produce TWO documents for the target role given after these rules, from the candidate resume below and that role's job description:
+(A) a tailored ONE-PAGE LaTeX resume body (resume-content.tex), and
+(B) a tailored cover letter body.
+
+**MASTER RESUME**
+{master_resume}
+
+---------------------------------------------------------------
+**(A) RESUME — resume-content.tex only (main.tex is never modified)**
+• ONE PAGE: max 4 bullets/role (5-6 for most relevant role), 2 projects max with 4 bullets each, 20-24 bullets total
+• Score each bullet 0-10 for job relevance; cut <5 unless unique, keep ≥7
+• One line per bullet where possible (12-18 words, 20-25 OK if it preserves impact); front-load impact
+• Keep ALL quantified metrics, specific tools and architectural terms
+• Sections in order: HEADER (copy exactly), TECHNICAL SKILLS, EXPERIENCE (never remove roles, keep ≥2-3 bullets/role), PROJECTS, EDUCATION (copy exactly)
+• Maintain \\resumeSubheading{{Title}}{{Date}}{{Company}}{{Location}} and \\resumeProjectHeading{{Name}}{{URL}}{{Tech Stack}}
+• Keep all \\resumeSubHeadingListStart/End and \\resumeItemListStart/End, balance all braces, date format MMM. YYYY
+• Do NOT add \\documentclass or \\begin{{document}}
+• In header tabular use plain & for columns; everywhere else use __AMP__ __PCT__ __HASH__ __DOLLAR__ placeholders
+• Never invent experiences, dates or companies
+
+**(B) COVER LETTER — body paragraphs only (no header/signature)**
+• Approximately 150-200 words, natural and professional, no AI clichés or stiff jargon
+• Shorter, direct sentences; 1-2 key metrics max; only tech relevant to this role
+• Select 1-2 experiences from the resume that best demonstrate fit and frame them as proof of future impact
+• Open with a hook (company mission or a specific JD challenge), never "I am writing to apply..."
+• Use __APOS__ for apostrophes, __AMP__ for ampersands, number followed by __PCT__ for percents (e.g. 25__PCT__)
+• Separate paragraphs with double newlines
+
+"""
+
+
+async def tailor_documents(
+    job_description: str,
+    evaluation: dict,
+    job_title: str = None,
+    company_name: str = None,
+) -> dict:
+    """
+    Generates a tailored resume and cover letter with a single OpenAI call.
+
+    Args:
+        job_description: Full text of the job posting
+        evaluation: Dict containing match_score, strengths, gaps, etc.
+        job_title: Title of the position
+        company_name: Name of the company
+
+    Returns:
+        {
+            "resume": {...same shape as tailor_resume()...},
+            "cover_letter": {...same shape as tailor_cover_letter()...}
+        }
+    """
+    logger.info("🎯 Starting combined resume + cover letter tailoring...")
+    logger.info(f"   • Job Title: {job_title or 'Not specified'}")
+    logger.info(f"   • Company: {company_name or 'Not specified'}")
+
+    try:
+        master_resume = load_master_resume()
+        logger.info(f"✅ Loaded master resume ({len(master_resume)} chars)")
+    except Exception:
+        logger.exception("❌ Failed to load master resume")
+        raise
+
+    match_score = evaluation.get("match_score", 0)
+    strengths = evaluation.get("strengths", [])
+    gaps = evaluation.get("gaps", [])
+
+    # Build role context string
+    if job_title and company_name:
+        role_context = f"{job_title} at {company_name}"
+    elif job_title:
+        role_context = job_title
+    elif company_name:
+        role_context = f"a position at {company_name}"
+    else:
+        role_context = "this position (infer from job description)"
+
+    prompt = _static_prompt(master_resume) + f"""---------------------------------------------------------------
+**TARGET ROLE**
+{role_context}
+
+**CONTEXT**
+Match Score: {match_score}%
+Strengths: {join_items(strengths)}
+Gaps: {join_items(gaps)}
+
+**JOB DESCRIPTION**
+{trim_job_description(job_description)}
+
+**OUTPUT FORMAT (JSON)**
+{{
+    "resume": {{
+        "tailored_content": "complete LaTeX for resume-content.tex",
+        "pruning_strategy": {{
+            "summary": "pruning approach for {job_title or 'this role'} at {company_name or 'this company'}",
+            "scoring_logic": "how bullets were scored 0-10 for relevance",
+            "role_breakdown": "which roles/projects kept, relevance scores, bullet counts"
+        }},
+        "tech_stack_analysis": {{
+            "table": [
+                {{"tech": "name", "assessment": "relevance and how to add", "risk": "Low/Medium/High"}}
+            ],
+            "suggested_additions": "where to add tech for {company_name or 'company'}"
+        }},
+        "change_summary": {{
+            "what_made_cut": "experiences/projects kept (with scores), key bullets, total count",
+            "what_removed": "bullets cut, projects removed, consolidations, justifications",
+            "interview_prep": ["5 talking points about fit for {job_title or 'role'}"]
+        }}
+    }},
+    "cover_letter": {{
+        "tailored_content": "body paragraphs with LaTeX escapes",
+        "selected_projects": ["Project 1 name", "Project 2 name"],
+        "word_count": 165,
+        "quality_flags": {{
+            "has_metrics": true,
+            "no_cliches": true,
+            "proper_length": true
+        }}
+    }}
+}}"""
+
+    try:
+        request = {
+            "model": "o4-mini",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are an expert resume optimizer and career coach. "
+                        "Return valid JSON with a 'resume' and a 'cover_letter' object. "
+                        "Use __AMP__ __PCT__ __HASH__ __DOLLAR__ __APOS__ placeholders for special "
+                        "characters in text (NOT in the resume header tabular)."
+                    ),
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "reasoning_effort": "low",
+            # Budget of tailor_resume (5000) + tailor_cover_letter (3000)
+            "max_completion_tokens": 8000,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "tailored_documents",
+                    "strict": True,
+                    "schema": TAILORED_DOCUMENTS_SCHEMA,
+                },
+            },
+        }
+
+        # Identical requests (same prompt, resume, JD and settings) reuse the
+        # earlier response; placeholders are still converted on every read
+        cache_key = content_cache_key("llm:tailor", request)
+        cached = await async_cache_get_json(cache_key)
+        if cached:
+            logger.info("⚡ Using cached tailoring response")
+            raw_content = cached["raw_content"]
+        else:
+            logger.info("🚀 Sending combined tailoring request to OpenAI (o4-mini)...")
+            async with openai_slot():
+                response = await client.chat.completions.create(**request)
+            raw_content = response.choices[0].message.content
+
+        if not raw_content or raw_content.strip() == "":
+            logger.error("❌ Empty response from OpenAI")
+            raise ValueError("OpenAI returned empty response")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("----- RAW COMBINED TAILORING RESPONSE -----")
+            logger.debug(raw_content[:2000])
+            logger.debug("-------------------------------------------")
+
+        parsed = json.loads(raw_content)
+
+        if not isinstance(parsed.get("resume"), dict):
+            raise ValueError("Missing required field: resume")
+        if not isinstance(parsed.get("cover_letter"), dict):
+            raise ValueError("Missing required field: cover_letter")
+
+        resume_data = finalize_resume_data(parsed["resume"])
+        cover_letter_data = finalize_cover_letter_data(parsed["cover_letter"])
+        if not cached:
+            await async_cache_set_json(
+                cache_key, {"raw_content": raw_content}, LLM_RESPONSE_CACHE_TTL
+            )
+
+        logger.info("✅ Combined tailoring completed")
+        logger.info(
+            f"   • Resume content length: {len(resume_data['tailored_content'])} chars"
+        )
+        logger.info(
+            f"   • Cover letter word count: {cover_letter_data.get('word_count', 'unknown')}"
+        )
+
+        return {"resume": resume_data, "cover_letter": cover_letter_data}
+
+    except json.JSONDecodeError as e:
+        logger.exception("❌ Failed to parse JSON response from OpenAI")
+        logger.error("Raw response preview: %s", raw_content[:500])
+        raise Exception(f"Combined tailoring failed - invalid JSON: {str(e)}")
+    except Exception as e:
+        logger.exception("❌ Combined tailoring failed")
+        raise Exception(f"Combined tailoring failed: {str(e)}")
@@ -1,20 +1,82 @@
 # services/llm_cover_letter_service.py
+from collections import Counter
+from functools import lru_cache
 from openai import AsyncOpenAI
+import asyncio
 import logging
 import os
 import json
+import re
+
+import orjson
+
+from services.cache_service import (
+    async_cache_get_json,
+    async_cache_set_json,
+    content_cache_key,
+)
+from services.llm_rate_limit_service import openai_slot
+
+# Same source (and in-process cache) as resume tailoring
+from services.llm_resume_service import (
+    load_master_resume,
+    strict_object_schema,
+    trim_job_description,
+)
 
 logger = logging.getLogger(__name__)
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Tailoring responses for an identical request are reused for a day
+LLM_RESPONSE_CACHE_TTL = 86400
 
-def load_master_resume() -> str:
-    """Load the master resume content from file (same source as resume tailoring)"""
-    try:
-        with open("data/resume-content.tex", "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        raise Exception("Master resume not found at data/resume-content.tex")
+
+# "Smart" characters that break LaTeX, mapped in a single str.translate pass
+SMART_CHARACTERS = str.maketrans(
+    {
+        "’": "'",  # Smart apostrophe
+        "‘": "'",  # Smart opening quote
+        "“": '"',  # Smart double quote
+        "”": '"',  # Smart closing quote
+        "–": "--",  # En-dash
+        "—": "---",  # Em-dash
+        "…": "...",  # Ellipsis
+    }
+)
+
+PLACEHOLDER_ESCAPES = {
+    "__APOS__": "'",
+    "__AMP__": r" \& ",
+    "__PCT__": r"\%",  # Removed trailing space
+    "__HASH__": r" \#",
+    "__DOLLAR__": r" \$",
+}
+
+SAFETY_ESCAPES = {
+    "%": r"\%",
+    "$": r"\$",
+    "&": r"\&",
+    "#": r"\#",
+    "_": r"\_",
+}
+
+# Readable text for placeholders in display-only fields (project names)
+DISPLAY_REPLACEMENTS = {
+    "__APOS__": "'",
+    "__AMP__": " & ",
+    "__PCT__": "% ",
+}
+
+# A backslash the LLM put before a placeholder (\__PCT__)
+_ESCAPED_PLACEHOLDER_RE = re.compile(
+    r"\\(" + "|".join(map(re.escape, PLACEHOLDER_ESCAPES)) + ")"
+)
+_PLACEHOLDER_RE = re.compile("|".join(map(re.escape, PLACEHOLDER_ESCAPES)))
+_DISPLAY_RE = re.compile("|".join(map(re.escape, DISPLAY_REPLACEMENTS)))
+# Special characters NOT already preceded by a backslash
+_UNESCAPED_SPECIAL_RE = re.compile(
+    r"(?<!\\)[" + re.escape("".join(SAFETY_ESCAPES)) + "]"
+)
 
 
 def fix_latex_escaping(latex_content: str) -> str:
@@ -29,138 +91,107 @@ def fix_latex_escaping(latex_content: str) -> str:
     - __DOLLAR__ → \$
     """
     # 1. Active Sanitization: Replace "smart" characters that break LaTeX
-    smart_replacements = {
-        "’": "'",   # Smart apostrophe
-        "‘": "'",   # Smart opening quote
-        "“": '"',   # Smart double quote
-        "”": '"',   # Smart closing quote
-        "–": "--",  # En-dash
-        "—": "---", # Em-dash
-        "…": "...", # Ellipsis
-    }
-    
-    for char, replacement in smart_replacements.items():
-        if char in latex_content:
-            latex_content = latex_content.replace(char, replacement)
-
-    # 2. Clean up any backslashes before placeholders
-    latex_content = latex_content.replace(r"\__APOS__", "__APOS__")
-    latex_content = latex_content.replace(r"\__PCT__", "__PCT__")
-    latex_content = latex_content.replace(r"\__AMP__", "__AMP__")
-    latex_content = latex_content.replace(r"\__HASH__", "__HASH__")
-    latex_content = latex_content.replace(r"\__DOLLAR__", "__DOLLAR__")
-
-    # 3. Convert placeholders to proper characters
-    replacements = {
-        "__APOS__": "'",
-        "__AMP__": r" \& ",
-        "__PCT__": r"\%",  # Removed trailing space
-        "__HASH__": r" \#",
-        "__DOLLAR__": r" \$",
-    }
+    latex_content = latex_content.translate(SMART_CHARACTERS)
+
+    # 2-3. Placeholder passes (skipped when the model used none)
+    conversions = Counter()
 
-    total_fixes = 0
-    for placeholder, latex_escape in replacements.items():
-        count = latex_content.count(placeholder)
-        if count > 0:
-            latex_content = latex_content.replace(placeholder, latex_escape)
-            logger.info(f"🔧 Converted {count} × '{placeholder}' → proper character")
-            total_fixes += count
+    def _convert(match: re.Match) -> str:
+        conversions[match.group(0)] += 1
+        return PLACEHOLDER_ESCAPES[match.group(0)]
 
-    if total_fixes > 0:
-        logger.info(f"✅ Total placeholder conversions: {total_fixes}")
+    if "__" in latex_content:
+        # 2. Clean up any backslashes before placeholders
+        latex_content = _ESCAPED_PLACEHOLDER_RE.sub(r"\1", latex_content)
+
+        # 3. Convert placeholders to proper characters
+        latex_content = _PLACEHOLDER_RE.sub(_convert, latex_content)
+
+    for placeholder, count in conversions.items():
+        logger.info(f"🔧 Converted {count} × '{placeholder}' → proper character")
+    if conversions:
+        logger.info(f"✅ Total placeholder conversions: {conversions.total()}")
 
     # 4. Safety net: Escape any remaining raw special characters
     # (in case LLM didn't use placeholders)
-    # Use regex negative lookbehind (?<!\\) to ensure we don't escape characters that are already escaped
-    import re
-    
-    safety_escapes = {
-        '%': r'\%',
-        '$': r'\$',
-        '&': r'\&',
-        '#': r'\#',
-        '_': r'\_',
-    }
-    
-    safety_fixes = 0
-    for char, escape in safety_escapes.items():
-        # Regex pattern: find char NOT preceded by backslash
-        pattern = f"(?<!\\\\){re.escape(char)}"
-        
-        # Count matches first
-        matches = len(re.findall(pattern, latex_content))
-        
-        if matches > 0:
-            latex_content = re.sub(pattern, escape, latex_content)
-            logger.warning(f"⚠️ Safety escape: {matches} × '{char}' → '{escape}' (LLM didn't use placeholder)")
-            safety_fixes += matches
-    
-    if safety_fixes > 0:
-        logger.warning(f"⚠️ Total safety escapes applied: {safety_fixes}")
+    safety_fixes = Counter()
 
-    return latex_content
+    def _escape(match: re.Match) -> str:
+        safety_fixes[match.group(0)] += 1
+        return SAFETY_ESCAPES[match.group(0)]
 
+    latex_content = _UNESCAPED_SPECIAL_RE.sub(_escape, latex_content)
 
-async def tailor_cover_letter(
-    job_description: str,
-    evaluation: dict,
-    job_title: str = None,
-    company_name: str = None,
-) -> dict:
-    """
-    Generates a tailored cover letter from master resume + job description.
+    for char, count in safety_fixes.items():
+        logger.warning(
+            f"⚠️ Safety escape: {count} × '{char}' → '{SAFETY_ESCAPES[char]}' "
+            f"(LLM didn't use placeholder)"
+        )
+    if safety_fixes:
+        logger.warning(f"⚠️ Total safety escapes applied: {safety_fixes.total()}")
 
-    Key improvements over master CL approach:
-    - Selects most relevant projects from full resume
-    - Reframes experiences based on role requirements
-    - Extracts company-specific hooks from JD
-    - Ensures 150-175 words, human tone, no AI clichés
+    return latex_content
 
-    Args:
-        job_description: Full text of the job posting
-        evaluation: Dict containing job evaluation data (unused)
-        job_title: Title of the position (e.g., "Associate Data Engineer")
-        company_name: Name of the company (e.g., "NTT DATA")
 
-    Returns:
-        {
-            "tailored_content": "... LaTeX content ...",
-            "selected_projects": ["Project 1", "Project 2"],
-            "word_count": 165,
-            "quality_flags": {
-                "has_metrics": true,
-                "no_cliches": true,
-                "proper_length": true
+# Enforced by OpenAI Structured Outputs (strict), mirrors the Output Format
+COVER_LETTER_SCHEMA = strict_object_schema(
+    {
+        "tailored_content": {"type": "string"},
+        "selected_projects": {"type": "array", "items": {"type": "string"}},
+        "word_count": {"type": "integer"},
+        "quality_flags": strict_object_schema(
+            {
+                "has_metrics": {"type": "boolean"},
+                "no_cliches": {"type": "boolean"},
+                "proper_length": {"type": "boolean"},
             }
-        }
+        ),
+    }
+)
+
+REQUIRED_FIELDS = frozenset(
+    {"tailored_content", "selected_projects", "word_count", "quality_flags"}
+)
+
+
+def finalize_cover_letter_data(parsed: dict) -> dict:
     """
-    logger.info("✍️ Starting cover letter generation from resume...")
-    logger.info(f"   • Job Title: {job_title or 'Not specified'}")
-    logger.info(f"   • Company: {company_name or 'Not specified'}")
+    Validate a parsed cover letter response and convert its placeholders.
 
-    # Load master resume (not master cover letter)
-    try:
-        master_resume = load_master_resume()
-        logger.info(f"✅ Loaded master resume ({len(master_resume)} chars)")
-    except Exception:
-        logger.exception("❌ Failed to load master resume")
-        raise
+    Shared by tailor_cover_letter and the combined tailoring service.
+    """
+    # Validate required fields
+    missing = REQUIRED_FIELDS - parsed.keys()
+    if missing:
+        raise ValueError(f"Missing required field: {', '.join(sorted(missing))}")
 
-    logger.info(f"📊 Generating cover letter...")
+    # Validate types
+    if not isinstance(parsed["selected_projects"], list):
+        raise ValueError("selected_projects must be a list")
+    if not isinstance(parsed["quality_flags"], dict):
+        raise ValueError("quality_flags must be a dict")
 
-    # Build role context string
-    role_context = ""
-    if job_title and company_name:
-        role_context = f"{job_title} at {company_name}"
-    elif job_title:
-        role_context = job_title
-    elif company_name:
-        role_context = f"position at {company_name}"
-    else:
-        role_context = "this position"
+    # Convert placeholders to LaTeX escapes in content
+    parsed["tailored_content"] = fix_latex_escaping(parsed["tailored_content"])
+
+    # Clean placeholders in project names for display
+    parsed["selected_projects"] = [
+        _DISPLAY_RE.sub(lambda m: DISPLAY_REPLACEMENTS[m.group(0)], p)
+        if "__" in p
+        else p
+        for p in parsed["selected_projects"]
+    ]
 
-    prompt = f"""Write a creative and human-sounding cover letter for {role_context}.
+    return parsed
+
+
+@lru_cache(maxsize=1)
+def _static_prompt(master_resume: str) -> str:
+    """
+    Job-independent part of the prompt (rules + master resume). It leads the
+    user message so OpenAI's automatic prompt caching can reuse it across jobs.
+    """
+    return f"""Write a creative and human-sounding cover letter for the role given at the end.
 
 # Task
 Generate body paragraphs only (no header/signature). Use the candidate's resume to select the most relevant experiences and weave them into a compelling narrative for this role.
@@ -178,9 +209,6 @@ Generate body paragraphs only (no header/signature). Use the candidate's resume
 # Resume Content
 {master_resume}
 
-# Job Description
-{job_description}
-
 # Instructions
 1. Analyze the job description to understand what the company values.
 2. Select 1-2 key projects or experiences from the resume that best demonstrate the candidate's fit.
@@ -200,72 +228,152 @@ Generate body paragraphs only (no header/signature). Use the candidate's resume
     }}
 }}
 
+"""
+
+
+def build_cover_letter_request(
+    job_description: str,
+    master_resume: str,
+    job_title: str = None,
+    company_name: str = None,
+) -> dict:
+    """
+    Build the chat completion request for one cover letter.
+
+    Shared by tailor_cover_letter and the Batch API path, so both send the
+    exact same prompt and settings.
+    """
+    # Build role context string
+    role_context = ""
+    if job_title and company_name:
+        role_context = f"{job_title} at {company_name}"
+    elif job_title:
+        role_context = job_title
+    elif company_name:
+        role_context = f"position at {company_name}"
+    else:
+        role_context = "this position"
+
+    prompt = _static_prompt(master_resume) + f"""# Role
+{role_context}
+
+# Job Description
+{trim_job_description(job_description)}
+
 Job Title: {job_title or '[Job Title]'}
 Company: {company_name or '[Company]'}"""
 
+    return {
+        "model": "o4-mini",
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "You are a skilled career coach who writes authentic, engaging cover letters. "
+                    "Focus on storytelling and genuine connection rather than just listing metrics. "
+                    "Avoid robotic phrasing and clichés. "
+                    "Use __APOS__ for apostrophes, __AMP__ for ampersands. "
+                    "For percentages, write the number followed immediately by __PCT__ (e.g., '25__PCT__', not '__PCT__ 25'). "
+                    "Return body paragraphs only (no header/footer). Return valid JSON."
+                ),
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "reasoning_effort": "low",
+        # ~200-word body + JSON is a few hundred tokens; the rest is reasoning
+        "max_completion_tokens": 2000,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "cover_letter",
+                "strict": True,
+                "schema": COVER_LETTER_SCHEMA,
+            },
+        },
+    }
+
+
+async def tailor_cover_letter(
+    job_description: str,
+    evaluation: dict,
+    job_title: str = None,
+    company_name: str = None,
+) -> dict:
+    """
+    Generates a tailored cover letter from master resume + job description.
+
+    Key improvements over master CL approach:
+    - Selects most relevant projects from full resume
+    - Reframes experiences based on role requirements
+    - Extracts company-specific hooks from JD
+    - Ensures 150-175 words, human tone, no AI clichés
+
+    Args:
+        job_description: Full text of the job posting
+        evaluation: Dict containing job evaluation data (unused)
+        job_title: Title of the position (e.g., "Associate Data Engineer")
+        company_name: Name of the company (e.g., "NTT DATA")
+
+    Returns:
+        {
+            "tailored_content": "... LaTeX content ...",
+            "selected_projects": ["Project 1", "Project 2"],
+            "word_count": 165,
+            "quality_flags": {
+                "has_metrics": true,
+                "no_cliches": true,
+                "proper_length": true
+            }
+        }
+    """
+    logger.info("✍️ Starting cover letter generation from resume...")
+    logger.info(f"   • Job Title: {job_title or 'Not specified'}")
+    logger.info(f"   • Company: {company_name or 'Not specified'}")
+
+    # Load master resume (not master cover letter)
     try:
-        logger.info("🚀 Sending request to OpenAI (o4-mini)...")
-
-        response = await client.chat.completions.create(
-            model="o4-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a skilled career coach who writes authentic, engaging cover letters. "
-                        "Focus on storytelling and genuine connection rather than just listing metrics. "
-                        "Avoid robotic phrasing and clichés. "
-                        "Use __APOS__ for apostrophes, __AMP__ for ampersands. "
-                        "For percentages, write the number followed immediately by __PCT__ (e.g., '25__PCT__', not '__PCT__ 25'). "
-                        "Return body paragraphs only (no header/footer). Return valid JSON."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            reasoning_effort="low",
-            max_completion_tokens=3000,
-            response_format={"type": "json_object"},
-        )
+        master_resume = load_master_resume()
+        logger.info(f"✅ Loaded master resume ({len(master_resume)} chars)")
+    except Exception:
+        logger.exception("❌ Failed to load master resume")
+        raise
 
-        raw_content = response.choices[0].message.content
+    logger.info(f"📊 Generating cover letter...")
+
+    request = build_cover_letter_request(
+        job_description, master_resume, job_title, company_name
+    )
+
+    try:
+        # Identical requests (same prompt, resume, JD and settings) reuse the
+        # earlier response; placeholders are still converted on every read
+        cache_key = content_cache_key("llm:cover_letter", request)
+        cached = await async_cache_get_json(cache_key)
+        if cached:
+            logger.info("⚡ Using cached cover letter response")
+            raw_content = cached["raw_content"]
+        else:
+            logger.info("🚀 Sending request to OpenAI (o4-mini)...")
+            async with openai_slot():
+                response = await client.chat.completions.create(**request)
+            raw_content = response.choices[0].message.content
 
         if not raw_content or raw_content.strip() == "":
             logger.error("❌ Empty response from OpenAI")
             raise ValueError("OpenAI returned empty response")
 
-        logger.debug("----- RAW COVER LETTER RESPONSE (first 1000 chars) -----")
-        logger.debug(raw_content[:1000])
-        logger.debug("--------------------------------------------------------")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("----- RAW COVER LETTER RESPONSE (first 1000 chars) -----")
+            logger.debug(raw_content[:1000])
+            logger.debug("--------------------------------------------------------")
 
         parsed = json.loads(raw_content)
 
-        # Validate required fields
-        required_fields = [
-            "tailored_content",
-            "selected_projects",
-            "word_count",
-            "quality_flags",
-        ]
-        for field in required_fields:
-            if field not in parsed:
-                raise ValueError(f"Missing required field: {field}")
-
-        # Validate types
-        if not isinstance(parsed["selected_projects"], list):
-            raise ValueError("selected_projects must be a list")
-        if not isinstance(parsed["quality_flags"], dict):
-            raise ValueError("quality_flags must be a dict")
-
-        # Convert placeholders to LaTeX escapes in content
-        parsed["tailored_content"] = fix_latex_escaping(parsed["tailored_content"])
-
-        # Clean placeholders in project names for display
-        parsed["selected_projects"] = [
-            p.replace("__APOS__", "'")
-            .replace("__AMP__", " & ")
-            .replace("__PCT__", "% ")
-            for p in parsed["selected_projects"]
-        ]
+        parsed = finalize_cover_letter_data(parsed)
+        if not cached:
+            await async_cache_set_json(
+                cache_key, {"raw_content": raw_content}, LLM_RESPONSE_CACHE_TTL
+            )
 
         # Log quality metrics
         quality = parsed.get("quality_flags", {})
@@ -282,11 +390,141 @@ Company: {company_name or '[Company]'}"""
 
     except json.JSONDecodeError as e:
         logger.exception("❌ Failed to parse JSON response from OpenAI")
-        logger.error(f"Response length: {len(raw_content) if raw_content else 0}")
+        logger.error("Response length: %d", len(raw_content) if raw_content else 0)
         logger.error(
-            f"First 500 chars: {raw_content[:500] if raw_content else 'EMPTY'}"
+            "First 500 chars: %s", raw_content[:500] if raw_content else "EMPTY"
         )
         raise Exception(f"Invalid JSON from OpenAI: {str(e)}")
     except Exception as e:
         logger.exception("❌ Cover letter generation failed")
         raise Exception(f"Cover letter generation failed: {str(e)}")
+
+
+# Batch API: half the token price of realtime calls, results within 24h.
+# Meant for non-interactive bulk runs (e.g. overnight over saved jobs).
+BATCH_POLL_SECONDS = 30
+BATCH_MAX_POLL_SECONDS = 600
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+async def submit_cover_letter_batch(items: list[dict]) -> str:
+    """
+    Upload one cover letter request per item and start an OpenAI batch.
+
+    Args:
+        items: Dicts with "id" (used as custom_id), "job_description" and
+            optionally "job_title" / "company_name"
+
+    Returns:
+        The batch id, for cover_letter_batch_progress / collect_cover_letter_batch
+    """
+    master_resume = load_master_resume()
+
+    lines = [
+        orjson.dumps(
+            {
+                "custom_id": str(item["id"]),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": build_cover_letter_request(
+                    item["job_description"],
+                    master_resume,
+                    item.get("job_title"),
+                    item.get("company_name"),
+                ),
+            }
+        )
+        for item in items
+    ]
+
+    input_file = await client.files.create(
+        file=("cover_letters.jsonl", b"\n".join(lines)), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"📦 Submitted cover letter batch {batch.id} ({len(items)} jobs)")
+    return batch.id
+
+
+async def cover_letter_batch_progress(batch_id: str):
+    """
+    Poll a batch (with exponential backoff) until it finishes.
+    Yields (done, total) request counts after every poll.
+    """
+    delay = BATCH_POLL_SECONDS
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if counts:
+            yield counts.completed + counts.failed, counts.total
+
+        if batch.status in BATCH_TERMINAL_STATES:
+            logger.info(f"📦 Batch {batch_id} finished: {batch.status}")
+            return
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_MAX_POLL_SECONDS)
+
+
+async def collect_cover_letter_batch(batch_id: str) -> dict[str, dict | Exception]:
+    """
+    Download a finished batch's results.
+
+    Returns:
+        custom_id -> finalized cover letter dict (same shape as
+        tailor_cover_letter()), or the exception for requests that failed
+    """
+    batch = await client.batches.retrieve(batch_id)
+    if batch.status not in BATCH_TERMINAL_STATES:
+        raise Exception(f"Batch {batch_id} is still {batch.status}")
+
+    results: dict[str, dict | Exception] = {}
+
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.content.splitlines():
+            entry = orjson.loads(line)
+            try:
+                if entry.get("error"):
+                    raise ValueError(entry["error"])
+                response = entry["response"]
+                if response["status_code"] != 200:
+                    raise ValueError(f"HTTP {response['status_code']}")
+                raw_content = response["body"]["choices"][0]["message"]["content"]
+                results[entry["custom_id"]] = finalize_cover_letter_data(
+                    json.loads(raw_content)
+                )
+            except Exception as e:
+                results[entry["custom_id"]] = Exception(
+                    f"Cover letter generation failed: {str(e)}"
+                )
+
+    if batch.error_file_id:
+        errors = await client.files.content(batch.error_file_id)
+        for line in errors.content.splitlines():
+            entry = orjson.loads(line)
+            results.setdefault(
+                entry["custom_id"],
+                Exception(f"Cover letter generation failed: {entry.get('error')}"),
+            )
+
+    failed = sum(isinstance(r, Exception) for r in results.values())
+    logger.info(
+        f"✅ Collected batch {batch_id}: {len(results) - failed} cover letters, "
+        f"{failed} failed"
+    )
+    return results
+
+
+async def tailor_cover_letter_batch(items: list[dict]) -> dict[str, dict | Exception]:
+    """
+    Generate cover letters for many jobs through the Batch API and wait for
+    them (can take hours). See submit_cover_letter_batch for the item shape.
+    """
+    batch_id = await submit_cover_letter_batch(items)
+    async for done, total in cover_letter_batch_progress(batch_id):
+        logger.info(f"⏳ Batch {batch_id}: {done}/{total} requests done")
+    return await collect_cover_letter_batch(batch_id)
@@ -4,10 +4,57 @@ import logging
 import os
 import json
 
+from services.llm_rate_limit_service import openai_slot
+
 logger = logging.getLogger(__name__)
 
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Output schema + scoring rubric, shared by single and batched evaluation
+EVALUATION_INSTRUCTIONS = """Return ONLY valid JSON in this exact structure:
+
+{
+    "technical_skills_score": (integer 0-100),
+    "experience_match_score": (integer 0-100),
+    "domain_knowledge_score": (integer 0-100),
+    "soft_skills_culture_score": (integer 0-100),
+    "match_score": (calculated weighted average integer),
+    "summary": "Brief 1–2 sentence honest assessment of fit and readiness",
+    "strengths": [
+        "Specific strength #1",
+        "Specific strength #2",
+        "Specific strength #3",
+    ],
+    "gaps": [
+        "Specific gap #1",
+        "Specific gap #2",
+        "Specific gap #3",
+    ],
+    "story_assessment": "Weak/Moderate/Strong",
+    "reasoning": "Brief explanation of why you gave this specific score"
+}
+
+SCORING GUIDELINES (Weighted):
+1. **Technical Skills (55%)**: Does the candidate have the hard skills (languages, frameworks, tools)?
+2. **Experience Match (20%)**: Do they have the required years of experience and relevant role history?
+3. **Domain Knowledge (10%)**: Do they understand the industry/sector (e.g., Fintech, EdTech, SaaS)?
+4. **Soft Skills & Culture (15%)**: Communication, leadership, or other soft traits mentioned.
+
+CALCULATION:
+match_score = (Technical * 0.55) + (Experience * 0.20) + (Domain * 0.10) + (Soft * 0.15)
+
+SCORE INTERPRETATION:
+- **90–100**: Perfect fit. Meets ALL requirements + nice-to-haves.
+- **80–89**: Strong fit. Meets ALL mandatory requirements.
+- **70–79**: Good fit. Worth applying. Meets core technical needs, minor gaps in nice-to-haves.
+- **60–69**: Moderate fit. Missing key requirements.
+- **< 60**: Poor fit.
+
+IMPORTANT:
+- Be decisive.
+- **IF VISA RESTRICTED**: If the job requires citizenship/green card/clearance that the candidate lacks, the score MUST be < 50 regardless of skills.
+"""
+
 
 def load_master_resume() -> str:
     """Load the master resume content from file"""
@@ -70,65 +117,24 @@ MASTER RESUME:
 JOB DESCRIPTION:
 {job_text}
 
-Return ONLY valid JSON in this exact structure:
-
-{{
-    "technical_skills_score": (integer 0-100),
-    "experience_match_score": (integer 0-100),
-    "domain_knowledge_score": (integer 0-100),
-    "soft_skills_culture_score": (integer 0-100),
-    "match_score": (calculated weighted average integer),
-    "summary": "Brief 1–2 sentence honest assessment of fit and readiness",
-    "strengths": [
-        "Specific strength #1",
-        "Specific strength #2",
-        "Specific strength #3",
-    ],
-    "gaps": [
-        "Specific gap #1",
-        "Specific gap #2",
-        "Specific gap #3",
-    ],
-    "story_assessment": "Weak/Moderate/Strong",
-    "reasoning": "Brief explanation of why you gave this specific score"
-}}
-
-SCORING GUIDELINES (Weighted):
-1. **Technical Skills (55%)**: Does the candidate have the hard skills (languages, frameworks, tools)?
-2. **Experience Match (20%)**: Do they have the required years of experience and relevant role history?
-3. **Domain Knowledge (10%)**: Do they understand the industry/sector (e.g., Fintech, EdTech, SaaS)?
-4. **Soft Skills & Culture (15%)**: Communication, leadership, or other soft traits mentioned.
-
-CALCULATION:
-match_score = (Technical * 0.55) + (Experience * 0.20) + (Domain * 0.10) + (Soft * 0.15)
-
-SCORE INTERPRETATION:
-- **90–100**: Perfect fit. Meets ALL requirements + nice-to-haves.
-- **80–89**: Strong fit. Meets ALL mandatory requirements.
-- **70–79**: Good fit. Worth applying. Meets core technical needs, minor gaps in nice-to-haves.
-- **60–69**: Moderate fit. Missing key requirements.
-- **< 60**: Poor fit.
-
-IMPORTANT:
-- Be decisive.
-- **IF VISA RESTRICTED**: If the job requires citizenship/green card/clearance that the candidate lacks, the score MUST be < 50 regardless of skills.
-"""
+{EVALUATION_INSTRUCTIONS}"""
 
     try:
         logger.info("🚀 Sending request to OpenAI API (o4-mini)...")
-        response = await client.chat.completions.create(
-            model="o4-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a balanced but brutally honest hiring manager. Always return valid JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            reasoning_effort="medium",
-            response_format={"type": "json_object"},
-            seed=42,
-        )
+        async with openai_slot():
+            response = await client.chat.completions.create(
+                model="o4-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a balanced but brutally honest hiring manager. Always return valid JSON.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                reasoning_effort="medium",
+                response_format={"type": "json_object"},
+                seed=42,
+            )
 
         raw_content = response.choices[0].message.content
         logger.debug("----- RAW LLM RESPONSE -----")
@@ -149,4 +155,98 @@ IMPORTANT:
 
     except Exception as e:
         logger.exception("❌ LLM evaluation failed")
-        raise Exception(f"Job evaluation failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Job evaluation failed: {str(e)}")
+
+
+async def evaluate_jobs_batch(jobs: list[tuple[str, str | None]]) -> list[dict]:
+    """
+    Evaluates several jobs against the master resume in ONE OpenAI call.
+    The resume, rubric and system prompt are sent once instead of per job.
+
+    Args:
+        jobs: List of (job_text, visa_warning) tuples
+
+    Returns:
+        One evaluation dict per job, in input order (same shape as evaluate_job_match)
+    """
+    logger.info(f"📝 Starting batched evaluation of {len(jobs)} jobs...")
+
+    try:
+        resume_content = load_master_resume()
+    except Exception:
+        logger.exception("❌ Failed to load master resume")
+        raise
+
+    job_sections = "\n\n".join(
+        f"""=== JOB {i} ===
+VISA STATUS: {visa_warning or "None detected (assume eligible/possible)"}
+JOB DESCRIPTION:
+{job_text}"""
+        for i, (job_text, visa_warning) in enumerate(jobs, start=1)
+    )
+
+    prompt = f"""
+You are an expert hiring manager and recruiter.
+Evaluate this candidate's MASTER resume against EACH of the {len(jobs)} job descriptions below independently, with professional, data-driven judgment.
+
+CANDIDATE CONTEXT:
+- Indonesian citizen, graduated from University of Malaya (Malaysia)
+- This is their MASTER resume (not yet tailored).
+- **CRITICAL**: Do NOT penalize the score for the resume being "generic" or "too long". Evaluate based on the **content** and whether the candidate possesses the required skills/experience.
+- Each job lists its own VISA STATUS.
+
+MASTER RESUME:
+{resume_content}
+
+{job_sections}
+
+For EACH job, produce one evaluation object as specified below, then return
+{{"evaluations": [evaluation for JOB 1, evaluation for JOB 2, ...]}} with exactly {len(jobs)} entries in job order.
+
+{EVALUATION_INSTRUCTIONS}"""
+
+    try:
+        logger.info("🚀 Sending batched request to OpenAI API (o4-mini)...")
+        async with openai_slot():
+            response = await client.chat.completions.create(
+                model="o4-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a balanced but brutally honest hiring manager. Always return valid JSON.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                reasoning_effort="medium",
+                response_format={"type": "json_object"},
+                seed=42,
+            )
+
+        raw_content = response.choices[0].message.content
+        logger.debug("----- RAW BATCH LLM RESPONSE -----")
+        logger.debug(raw_content)
+        logger.debug("----------------------------------")
+
+        evaluations = json.loads(raw_content).get("evaluations")
+
+        if not isinstance(evaluations, list) or len(evaluations) != len(jobs):
+            raise ValueError(
+                f"Expected {len(jobs)} evaluations, got "
+                f"{len(evaluations) if isinstance(evaluations, list) else 'none'}"
+            )
+
+        # Add visa warnings from upstream (crawl4ai_service)
+        for parsed, (_, visa_warning) in zip(evaluations, jobs):
+            if visa_warning:
+                parsed["visa_warning"] = visa_warning
+
+        logger.info(
+            "✅ Batched evaluation completed. Match scores: "
+            f"{[parsed.get('match_score', 'N/A') for parsed in evaluations]}"
+        )
+
+        return evaluations
+
+    except Exception as e:
+        logger.exception("❌ Batched LLM evaluation failed")
+        raise Exception(f"Batched job evaluation failed: {str(e)}")
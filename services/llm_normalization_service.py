@@ -4,6 +4,8 @@ import logging
 from datetime import datetime
 from openai import AsyncOpenAI
 
+from services.crawl4ai_service import infer_visa_feasibility
+
 logger = logging.getLogger(__name__)
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -11,39 +13,6 @@ DEBUG_DIR = "normalize_debug"
 os.makedirs(DEBUG_DIR, exist_ok=True)
 
 
-def infer_visa_feasibility(normalized: dict, user_country: str = "Indonesia") -> str:
-    """
-    Fallback heuristic to infer visa feasibility if LLM fails to provide it.
-    Same logic as crawl4ai_service for consistency.
-    """
-    loc = (normalized.get("location") or "").lower()
-    desc = (normalized.get("job_description") or "").lower()
-
-    # 1. Same country → eligible
-    if user_country.lower() in loc:
-        return "eligible"
-
-    # 2. Restricted language
-    restricted_terms = [
-        "no visa sponsorship",
-        "must have work authorization",
-        "authorized to work",
-        "locals only",
-        "work permit required",
-        "no relocation support",
-    ]
-    if any(term in desc for term in restricted_terms):
-        return "restricted"
-
-    # 3. Foreign job but no explicit restriction
-    known_countries = ["singapore", "malaysia", "australia", "usa", "uk", "canada"]
-    if any(country in loc for country in known_countries):
-        return "possible"
-
-    # 4. Default
-    return "unknown"
-
-
 async def llm_normalize_job_data(raw_scrape: dict) -> dict:
     """
     Normalize job data to match Crawl4AI output format exactly.
@@ -0,0 +1,108 @@
+# services/llm_rate_limit_service.py
+"""
+Client-side limits for the o4-mini calls (evaluation and tailoring).
+
+When many jobs finish extraction at once, every one of them requests an
+o4-mini completion. Without a cap they all hit OpenAI together, trip the
+account's per-model RPM limit and get 429s that the SDK retries with
+backoff. Queueing them locally keeps throughput near the limit instead.
+
+The limits are per process: the worker loop (tailoring) and the eval batcher
+loop share one budget, so a thread lock guards the slot count and the start
+schedule instead of loop-bound asyncio primitives. With several worker
+processes (or hosts), divide the account limit between them.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# o4-mini requests allowed in flight at once, per process
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+# Requests started per minute, per process (0 = no rate cap)
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "0"))
+
+
+class _Limiter:
+    """Semaphore + start spacing usable from any event loop in the process."""
+
+    def __init__(self, slots: int):
+        self.lock = threading.Lock()
+        self.free = slots
+        # Waiting requests, each woken on its own loop when given a slot
+        self.waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = (
+            deque()
+        )
+        # time.monotonic() before which the next request may not start
+        self.next_start = 0.0
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            if self.free > 0 and not self.waiters:
+                self.free -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self.waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self.lock:
+                try:
+                    self.waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True
+            if granted:
+                # The slot was handed over just as we gave up, pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self.lock:
+            while self.waiters:
+                loop, future = self.waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_wake, future)
+                    return
+                except RuntimeError:
+                    # That loop is closed; its waiter is gone
+                    continue
+            self.free += 1
+
+    def reserve_start(self) -> float:
+        """Book the next start time; returns how long to wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + 60 / OPENAI_RPM
+            return start - now
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_limiter = _Limiter(OPENAI_CONCURRENCY)
+
+
+@asynccontextmanager
+async def openai_slot():
+    """Wait for a concurrency slot (and rate-limit spacing) for one request."""
+    await _limiter.acquire()
+    try:
+        if OPENAI_RPM > 0:
+            delay = _limiter.reserve_start()
+            if delay > 0:
+                logger.debug(f"⏳ Waiting {delay:.2f}s for an OpenAI slot")
+                await asyncio.sleep(delay)
+        yield
+    finally:
+        _limiter.release()
@@ -1,20 +1,65 @@
 # services/llm_resume_service.py
+from collections import Counter
+from functools import lru_cache
 from openai import AsyncOpenAI
 import logging
 import os
 import json
+import re
+
+from services.cache_service import (
+    async_cache_get_json,
+    async_cache_set_json,
+    content_cache_key,
+)
+from services.llm_rate_limit_service import openai_slot
 
 logger = logging.getLogger(__name__)
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Tailoring responses for an identical request are reused for a day
+LLM_RESPONSE_CACHE_TTL = 86400
+
+
+MASTER_RESUME_PATH = "data/resume-content.tex"
+
+# Job descriptions longer than this are cut before prompting; the tail is
+# usually benefits/EEO boilerplate that doesn't change the tailoring
+JD_CHAR_LIMIT = 6000
+
+# path -> (mtime, content); the file is re-read only after it changes
+_MASTER_CACHE: dict[str, tuple[float, str]] = {}
+
 
 def load_master_resume() -> str:
-    """Load the master resume content from file"""
+    """Load the master resume content from file (cached until it changes)"""
     try:
-        with open("data/resume-content.tex", "r", encoding="utf-8") as f:
-            return f.read()
+        mtime = os.stat(MASTER_RESUME_PATH).st_mtime
+        cached = _MASTER_CACHE.get(MASTER_RESUME_PATH)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(MASTER_RESUME_PATH, "r", encoding="utf-8") as f:
+            content = f.read()
     except FileNotFoundError:
-        raise Exception("Master resume not found at data/resume-content.tex")
+        raise Exception(f"Master resume not found at {MASTER_RESUME_PATH}")
+
+    _MASTER_CACHE[MASTER_RESUME_PATH] = (mtime, content)
+    return content
+
+
+PLACEHOLDER_ESCAPES = {
+    "__AMP__": r" \& ",
+    "__PCT__": r"\% ",
+    "__HASH__": r" \#",
+    "__DOLLAR__": r" \$",
+}
+
+# A backslash the LLM put before a placeholder (\__PCT__)
+_ESCAPED_PLACEHOLDER_RE = re.compile(
+    r"\\(" + "|".join(map(re.escape, PLACEHOLDER_ESCAPES)) + ")"
+)
+_PLACEHOLDER_RE = re.compile("|".join(map(re.escape, PLACEHOLDER_ESCAPES)))
 
 
 def fix_latex_escaping(latex_content: str) -> str:
@@ -30,99 +75,186 @@ def fix_latex_escaping(latex_content: str) -> str:
     This approach prevents double-escaping problems where the LLM
     generates \\& instead of \& when trying to be JSON-safe.
     """
+    # Model used plain text only: nothing to convert
+    if "__" not in latex_content:
+        return latex_content
 
     # First, clean up any backslashes the LLM mistakenly added before placeholders
-    latex_content = latex_content.replace(r"\__PCT__", "__PCT__")
-    latex_content = latex_content.replace(r"\__AMP__", "__AMP__")
-    latex_content = latex_content.replace(r"\__HASH__", "__HASH__")
-    latex_content = latex_content.replace(r"\__DOLLAR__", "__DOLLAR__")
-
-    # Now convert placeholders to LaTeX escapes
-    replacements = {
-        "__AMP__": r" \& ",
-        "__PCT__": r"\% ",
-        "__HASH__": r" \#",
-        "__DOLLAR__": r" \$",
-    }
+    latex_content = _ESCAPED_PLACEHOLDER_RE.sub(r"\1", latex_content)
+
+    # Now convert placeholders to LaTeX escapes (one pass for all of them)
+    conversions = Counter()
 
-    total_fixes = 0
-    for placeholder, latex_escape in replacements.items():
-        count = latex_content.count(placeholder)
-        if count > 0:
-            latex_content = latex_content.replace(placeholder, latex_escape)
-            logger.info(f"🔧 Converted {count} × '{placeholder}' → '{latex_escape}'")
-            total_fixes += count
+    def _convert(match: re.Match) -> str:
+        conversions[match.group(0)] += 1
+        return PLACEHOLDER_ESCAPES[match.group(0)]
 
-    if total_fixes > 0:
-        logger.info(f"✅ Total placeholder conversions: {total_fixes}")
+    latex_content = _PLACEHOLDER_RE.sub(_convert, latex_content)
+
+    for placeholder, count in conversions.items():
+        logger.info(
+            f"🔧 Converted {count} × '{placeholder}' → "
+            f"'{PLACEHOLDER_ESCAPES[placeholder]}'"
+        )
+    if conversions:
+        logger.info(f"✅ Total placeholder conversions: {conversions.total()}")
 
     return latex_content
 
 
-async def tailor_resume(
-    job_description: str,
-    evaluation: dict,
-    job_title: str = None,
-    company_name: str = None,
-) -> dict:
+DISPLAY_REPLACEMENTS = {
+    "__AMP__": " & ",
+    "__PCT__": "% ",
+    "__HASH__": " #",
+    "__DOLLAR__": " $",
+}
+_DISPLAY_RE = re.compile("|".join(map(re.escape, DISPLAY_REPLACEMENTS)))
+
+
+def _display_text(text: str) -> str:
+    if "__" not in text:
+        return text
+    return _DISPLAY_RE.sub(lambda m: DISPLAY_REPLACEMENTS[m.group(0)], text)
+
+
+def clean_placeholders_for_display(obj):
     """
-    Tailors resume content for a specific job posting.
-    Optimized for o4-mini: minimal, clear instructions; no excessive guidance.
+    Replace placeholders with readable text in all strings.
 
-    Args:
-        job_description: Full text of the job posting
-        evaluation: Dict containing match_score, strengths, gaps, etc.
-        job_title: Title of the position (e.g., "Software Engineer - QA Automation")
-        company_name: Name of the company (e.g., "GoTo Financial")
+    Dicts and lists are updated in place (they come straight from json.loads
+    and are not shared), walking them with a stack instead of recursion.
+    """
+    if isinstance(obj, str):
+        return _display_text(obj)
+
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            items = current.items()
+        elif isinstance(current, list):
+            items = enumerate(current)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, str):
+                current[key] = _display_text(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return obj
+
+
+def join_items(items, default: str = "None") -> str:
+    """Comma-join evaluation items (strengths/gaps) for a prompt, or default."""
+    return ", ".join(items) if items else default
+
+
+def strict_object_schema(properties: dict) -> dict:
+    """JSON Schema object for Structured Outputs: every key required, no extras."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
 
-    Returns:
-        {
-            "tailored_content": "... LaTeX content ...",
-            "pruning_strategy": {...},
-            "tech_stack_analysis": {...},
-            "change_summary": {...}
-        }
+
+_STRING = {"type": "string"}
+
+# Enforced by OpenAI Structured Outputs (strict), mirrors OUTPUT FORMAT below
+RESUME_SCHEMA = strict_object_schema(
+    {
+        "tailored_content": _STRING,
+        "pruning_strategy": strict_object_schema(
+            {
+                "summary": _STRING,
+                "scoring_logic": _STRING,
+                "role_breakdown": _STRING,
+            }
+        ),
+        "tech_stack_analysis": strict_object_schema(
+            {
+                "table": {
+                    "type": "array",
+                    "items": strict_object_schema(
+                        {
+                            "tech": _STRING,
+                            "assessment": _STRING,
+                            "risk": {
+                                "type": "string",
+                                "enum": ["Low", "Medium", "High"],
+                            },
+                        }
+                    ),
+                },
+                "suggested_additions": _STRING,
+            }
+        ),
+        "change_summary": strict_object_schema(
+            {
+                "what_made_cut": _STRING,
+                "what_removed": _STRING,
+                "interview_prep": {"type": "array", "items": _STRING},
+            }
+        ),
+    }
+)
+
+REQUIRED_FIELDS = frozenset(
+    {"tailored_content", "pruning_strategy", "tech_stack_analysis", "change_summary"}
+)
+
+
+def trim_job_description(job_description: str) -> str:
+    """Cap the job description at JD_CHAR_LIMIT characters."""
+    if len(job_description) <= JD_CHAR_LIMIT:
+        return job_description
+    logger.info(
+        f"✂️ Trimming job description from {len(job_description)} "
+        f"to {JD_CHAR_LIMIT} chars"
+    )
+    return job_description[:JD_CHAR_LIMIT]
+
+
+def finalize_resume_data(parsed: dict) -> dict:
     """
-    logger.info("🎯 Starting resume tailoring...")
-    logger.info(f"   • Job Title: {job_title or 'Not specified'}")
-    logger.info(f"   • Company: {company_name or 'Not specified'}")
+    Validate a parsed resume tailoring response and convert its placeholders.
 
-    # Load master resume
-    try:
-        master_resume = load_master_resume()
-        logger.info(f"✅ Loaded master resume ({len(master_resume)} chars)")
-    except Exception:
-        logger.exception("❌ Failed to load master resume")
-        raise
+    tailored_content gets LaTeX escapes; analysis fields get readable text.
+    Shared by tailor_resume and the combined tailoring service.
+    """
+    # Validate required fields
+    missing = REQUIRED_FIELDS - parsed.keys()
+    if missing:
+        raise ValueError(f"Missing required field: {', '.join(sorted(missing))}")
 
-    # Extract key info from evaluation
-    match_score = evaluation.get("match_score", 0)
-    strengths = evaluation.get("strengths", [])
-    gaps = evaluation.get("gaps", [])
+    # Validate nested structures
+    if not isinstance(parsed["pruning_strategy"], dict):
+        raise ValueError("pruning_strategy must be a dict")
+    if not isinstance(parsed["tech_stack_analysis"], dict):
+        raise ValueError("tech_stack_analysis must be a dict")
+    if not isinstance(parsed["change_summary"], dict):
+        raise ValueError("change_summary must be a dict")
+    if not isinstance(parsed["change_summary"].get("interview_prep", []), list):
+        raise ValueError("interview_prep must be a list")
 
-    logger.info(f"📊 Tailoring for match score: {match_score}%")
-    logger.info(f"   • {len(strengths)} strengths identified")
-    logger.info(f"   • {len(gaps)} gaps identified")
+    # Convert placeholders to LaTeX escapes
+    parsed["tailored_content"] = fix_latex_escaping(parsed["tailored_content"])
 
-    # Build role context string
-    role_context = ""
-    if job_title and company_name:
-        role_context = f"Target Role: {job_title} at {company_name}"
-    elif job_title:
-        role_context = f"Target Role: {job_title}"
-    elif company_name:
-        role_context = f"Target Company: {company_name}"
-    else:
-        role_context = "Target Role: Not specified (infer from job description)"
+    # Clean all analysis fields (tailored_content already done)
+    for field in ("pruning_strategy", "tech_stack_analysis", "change_summary"):
+        clean_placeholders_for_display(parsed[field])
 
-    # Streamlined prompt for o4-mini reasoning
-    prompt = f"""Tailor a LaTeX resume for this job, fitting on ONE PAGE. The resume uses a two-file system: main.tex (formatting—never modify) and resume-content.tex (content only—you update this).
+    return parsed
 
-**CONTEXT**
-{role_context}
-Match Score: {match_score}%
-Strengths: {', '.join(strengths)}
-Gaps: {', '.join(gaps)}
+
+@lru_cache(maxsize=1)
+def _static_prompt(master_resume: str) -> str:
+    """
+    Job-independent part of the prompt (rules + master resume). It leads the
+    user message so OpenAI's automatic prompt caching can reuse it across jobs.
+    """
+    return f"""Tailor a LaTeX resume for this job, fitting on ONE PAGE. The resume uses a two-file system: main.tex (formatting—never modify) and resume-content.tex (content only—you update this).
 
 **ONE-PAGE CONSTRAINTS**
 • Experience: Max 4 bullets/role (5-6 for most relevant role)
@@ -194,8 +326,74 @@ Score each bullet 0-10 for job relevance:
 **MASTER RESUME**
 {master_resume}
 
+"""
+
+
+async def tailor_resume(
+    job_description: str,
+    evaluation: dict,
+    job_title: str = None,
+    company_name: str = None,
+) -> dict:
+    """
+    Tailors resume content for a specific job posting.
+    Optimized for o4-mini: minimal, clear instructions; no excessive guidance.
+
+    Args:
+        job_description: Full text of the job posting
+        evaluation: Dict containing match_score, strengths, gaps, etc.
+        job_title: Title of the position (e.g., "Software Engineer - QA Automation")
+        company_name: Name of the company (e.g., "GoTo Financial")
+
+    Returns:
+        {
+            "tailored_content": "... LaTeX content ...",
+            "pruning_strategy": {...},
+            "tech_stack_analysis": {...},
+            "change_summary": {...}
+        }
+    """
+    logger.info("🎯 Starting resume tailoring...")
+    logger.info(f"   • Job Title: {job_title or 'Not specified'}")
+    logger.info(f"   • Company: {company_name or 'Not specified'}")
+
+    # Load master resume
+    try:
+        master_resume = load_master_resume()
+        logger.info(f"✅ Loaded master resume ({len(master_resume)} chars)")
+    except Exception:
+        logger.exception("❌ Failed to load master resume")
+        raise
+
+    # Extract key info from evaluation
+    match_score = evaluation.get("match_score", 0)
+    strengths = evaluation.get("strengths", [])
+    gaps = evaluation.get("gaps", [])
+
+    logger.info(f"📊 Tailoring for match score: {match_score}%")
+    logger.info(f"   • {len(strengths)} strengths identified")
+    logger.info(f"   • {len(gaps)} gaps identified")
+
+    # Build role context string
+    role_context = ""
+    if job_title and company_name:
+        role_context = f"Target Role: {job_title} at {company_name}"
+    elif job_title:
+        role_context = f"Target Role: {job_title}"
+    elif company_name:
+        role_context = f"Target Company: {company_name}"
+    else:
+        role_context = "Target Role: Not specified (infer from job description)"
+
+    # Streamlined prompt for o4-mini reasoning
+    prompt = _static_prompt(master_resume) + f"""**CONTEXT**
+{role_context}
+Match Score: {match_score}%
+Strengths: {join_items(strengths)}
+Gaps: {join_items(gaps)}
+
 **JOB DESCRIPTION**
-{job_description}
+{trim_job_description(job_description)}
 
 **OUTPUT FORMAT (JSON)**
 {{
@@ -230,79 +428,51 @@ Score each bullet 0-10 for job relevance:
 • Reference role/company throughout analysis"""
 
     try:
-        logger.info("🚀 Sending tailoring request to OpenAI (o4-mini)...")
-
-        response = await client.chat.completions.create(
-            model="o4-mini",
-            messages=[
+        request = {
+            "model": "o4-mini",
+            "messages": [
                 {
                     "role": "system",
                     "content": "You are an expert resume optimizer. Return valid JSON with complete LaTeX content. Use __AMP__ __PCT__ __HASH__ __DOLLAR__ placeholders for special characters in text (NOT in header tabular). Plain & only for tabular column separators. Prioritize impact over brevity.",
                 },
                 {"role": "user", "content": prompt},
             ],
-            reasoning_effort="low",
-            max_completion_tokens=5000,
-            response_format={"type": "json_object"},
-        )
+            "reasoning_effort": "low",
+            "max_completion_tokens": 5000,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "tailored_resume",
+                    "strict": True,
+                    "schema": RESUME_SCHEMA,
+                },
+            },
+        }
 
-        raw_content = response.choices[0].message.content
-        logger.debug("----- RAW RESUME TAILORING RESPONSE -----")
-        logger.debug(raw_content[:2000])
-        logger.debug("-----------------------------------------")
+        # Identical requests (same prompt, resume, JD and settings) reuse the
+        # earlier response; placeholders are still converted on every read
+        cache_key = content_cache_key("llm:resume", request)
+        cached = await async_cache_get_json(cache_key)
+        if cached:
+            logger.info("⚡ Using cached resume tailoring response")
+            raw_content = cached["raw_content"]
+        else:
+            logger.info("🚀 Sending tailoring request to OpenAI (o4-mini)...")
+            async with openai_slot():
+                response = await client.chat.completions.create(**request)
+            raw_content = response.choices[0].message.content
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("----- RAW RESUME TAILORING RESPONSE -----")
+            logger.debug(raw_content[:2000])
+            logger.debug("-----------------------------------------")
 
         parsed = json.loads(raw_content)
 
-        # Validate required fields
-        required_fields = [
-            "tailored_content",
-            "pruning_strategy",
-            "tech_stack_analysis",
-            "change_summary",
-        ]
-        for field in required_fields:
-            if field not in parsed:
-                raise ValueError(f"Missing required field: {field}")
-
-        # Validate nested structures
-        if not isinstance(parsed["pruning_strategy"], dict):
-            raise ValueError("pruning_strategy must be a dict")
-        if not isinstance(parsed["tech_stack_analysis"], dict):
-            raise ValueError("tech_stack_analysis must be a dict")
-        if not isinstance(parsed["change_summary"], dict):
-            raise ValueError("change_summary must be a dict")
-        if not isinstance(parsed["change_summary"].get("interview_prep", []), list):
-            raise ValueError("interview_prep must be a list")
-
-        # Convert placeholders to LaTeX escapes
-        parsed["tailored_content"] = fix_latex_escaping(parsed["tailored_content"])
-
-        # Recursively clean placeholders for user-display fields
-        def clean_placeholders_for_display(obj):
-            """Recursively replace placeholders with readable text in all strings"""
-            if isinstance(obj, str):
-                return (
-                    obj.replace("__AMP__", " & ")
-                    .replace("__PCT__", "% ")
-                    .replace("__HASH__", " #")
-                    .replace("__DOLLAR__", " $")
-                )
-            elif isinstance(obj, dict):
-                return {k: clean_placeholders_for_display(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_placeholders_for_display(item) for item in obj]
-            return obj
-
-        # Clean all analysis fields (tailored_content already done)
-        parsed["pruning_strategy"] = clean_placeholders_for_display(
-            parsed["pruning_strategy"]
-        )
-        parsed["tech_stack_analysis"] = clean_placeholders_for_display(
-            parsed["tech_stack_analysis"]
-        )
-        parsed["change_summary"] = clean_placeholders_for_display(
-            parsed["change_summary"]
-        )
+        parsed = finalize_resume_data(parsed)
+        if not cached:
+            await async_cache_set_json(
+                cache_key, {"raw_content": raw_content}, LLM_RESPONSE_CACHE_TTL
+            )
 
         logger.info("✅ Resume tailoring completed successfully")
         logger.info(
@@ -319,7 +489,7 @@ Score each bullet 0-10 for job relevance:
 
     except json.JSONDecodeError as e:
         logger.exception("❌ Failed to parse JSON response from OpenAI")
-        logger.error(f"Raw response preview: {raw_content[:500]}")
+        logger.error("Raw response preview: %s", raw_content[:500])
         raise Exception(f"Resume tailoring failed - invalid JSON: {str(e)}")
     except Exception as e:
         logger.exception("❌ Resume tailoring failed")
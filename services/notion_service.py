@@ -4,6 +4,8 @@ import logging
 import os
 from datetime import datetime
 
+from services.http_client_service import get_http
+
 logger = logging.getLogger(__name__)
 
 DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
@@ -42,8 +44,10 @@ async def save_job_to_notion(
         cover_letter_data: Optional tailored cover letter data (if match_score >= 70)
         cover_letter_pdf_url: Optional public URL to compiled PDF cover letter
     """
-    # Create a fresh client for this task
-    notion = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
+    # Thin SDK wrapper over a pooled, process-shared HTTP connection.
+    # The SDK rewrites base_url/headers of the client it gets, so it uses its
+    # own named client rather than the default one.
+    notion = AsyncClient(auth=os.getenv("NOTION_API_KEY"), client=get_http("notion"))
 
     try:
         logger.info(f"Saving job to Notion: {job_data['title']}")
@@ -790,6 +794,3 @@ async def save_job_to_notion(
     except Exception as e:
         logger.error(f"Failed to save to Notion: {str(e)}")
         raise Exception(f"Notion save failed: {str(e)}")
-    finally:
-        # Properly close the client's httpx connections
-        await notion.aclose()
@@ -0,0 +1,45 @@
+# services/pdf_cache_service.py
+"""
+Content-addressed cache of uploaded PDF URLs.
+
+Identical LaTeX compiles to an identical PDF, so when the tailored content
+hashes to a known key the compile + upload is skipped and the previously
+uploaded public URL is reused. Only the URL is stored, never the PDF bytes.
+"""
+import hashlib
+import logging
+
+import redis
+
+from services.cache_service import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+PDF_URL_CACHE_TTL = 86400
+
+
+def pdf_cache_key(tex: str, document_type: str) -> str:
+    """Build the cache key for a LaTeX document, e.g. pdf:resume:<sha256>:url."""
+    digest = hashlib.sha256(tex.encode("utf-8")).hexdigest()
+    return f"pdf:{document_type}:{digest}:url"
+
+
+async def get_cached_pdf_url(tex: str, document_type: str) -> str | None:
+    """Return the public URL of a previously uploaded identical PDF, if any."""
+    key = pdf_cache_key(tex, document_type)
+    try:
+        url = await get_async_redis().get(key)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ PDF cache read failed for {key}: {e}")
+        return None
+
+    return url.decode("utf-8") if url else None
+
+
+async def set_cached_pdf_url(tex: str, document_type: str, public_url: str) -> None:
+    """Remember the public URL of an uploaded PDF for its LaTeX content."""
+    key = pdf_cache_key(tex, document_type)
+    try:
+        await get_async_redis().setex(key, PDF_URL_CACHE_TTL, public_url)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ PDF cache write failed for {key}: {e}")
@@ -1,17 +1,47 @@
 # services/pdf_compilation_service.py
 import asyncio
+import io
 import logging
+import os
 from pathlib import Path
 import shutil
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Where per-run LaTeX working dirs are created. Tectonic writes several
+# intermediate files per run; pointing this at tmpfs (e.g. /dev/shm/job-bot-pdf)
+# keeps that churn off disk.
+PDF_WORKDIR = Path(os.getenv("PDF_WORKDIR", "data/tmp_debug_pdf"))
+# Keep the dirs of failed runs for debugging. Off by default: on tmpfs they
+# would pile up in RAM until compiles fail with ENOSPC.
+KEEP_FAILED_RUNS = os.getenv("PDF_KEEP_FAILED_RUNS") == "1"
 
-async def compile_resume_to_pdf(tailored_content: str) -> bytes:
+
+def _make_run_dir(kind: str) -> Path:
+    """Create a unique working directory for one compilation run."""
+    run_id = uuid.uuid4().hex[:8]
+    tmpdir_path = PDF_WORKDIR / f"{kind}_{run_id}"
+    tmpdir_path.mkdir(parents=True, exist_ok=True)
+    return tmpdir_path
+
+
+def _remove_run_dir(tmpdir_path: Path, succeeded: bool) -> None:
+    """Delete a run's working directory (failed runs only if not kept)."""
+    if not succeeded and KEEP_FAILED_RUNS:
+        logger.info(f"Keeping failed run dir for debugging: {tmpdir_path}")
+        return
+    try:
+        shutil.rmtree(tmpdir_path)
+    except Exception as e:
+        logger.warning(f"Failed to cleanup temp dir {tmpdir_path}: {e}")
+
+
+async def compile_resume_to_pdf(tailored_content: str) -> io.BytesIO:
     """
     Compiles resume LaTeX content to PDF using Tectonic.
     Uses main.tex + resume-content.tex
+    Returns the PDF as an in-memory stream ready to hand to the uploader.
     """
     logger.info("📄 Starting Tectonic PDF compilation (RESUME)")
 
@@ -24,66 +54,65 @@ async def compile_resume_to_pdf(tailored_content: str) -> bytes:
         raise FileNotFoundError("main.tex not found in data/ directory")
 
     # Create unique temp directory for this run
-    run_id = uuid.uuid4().hex[:8]
-    tmpdir_path = Path(f"data/tmp_debug_pdf/resume_{run_id}")
-    tmpdir_path.mkdir(parents=True, exist_ok=True)
-
-    # Copy main.tex to temp directory
-    main_tex_dest = tmpdir_path / "main.tex"
-    shutil.copy(main_tex_src, main_tex_dest)
-
-    # Write tailored resume content
-    resume_run_path = tmpdir_path / "resume-content.tex"
-    resume_run_path.write_text(tailored_content, encoding="utf-8")
-
-    logger.info("▶️ Running tectonic for resume...")
-    proc = await asyncio.create_subprocess_exec(
-        tectonic_path,
-        "--keep-intermediates",
-        "--reruns",
-        "1",
-        "main.tex",
-        cwd=tmpdir_path,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
-
-    if proc.returncode != 0:
-        logger.error("Tectonic STDOUT:")
-        logger.error(stdout.decode())
-        logger.error("Tectonic STDERR:")
-        logger.error(stderr.decode())
-        raise Exception("Tectonic failed to compile resume PDF")
-
-    # Resume should produce main.pdf
-    pdf_path = tmpdir_path / "main.pdf"
-
-    if not pdf_path.exists():
-        logger.error("❌ main.pdf was not generated!")
-        logger.error("Files in temp directory:")
-        for f in tmpdir_path.iterdir():
-            logger.error(f"  - {f.name}")
-        raise FileNotFoundError(
-            "Resume PDF not generated by Tectonic. Check LaTeX syntax in resume-content.tex"
-        )
-
-    pdf_bytes = pdf_path.read_bytes()
-    logger.info(f"✅ Resume PDF compiled successfully ({len(pdf_bytes)} bytes)")
-
-    # Cleanup temporary files on success
+    tmpdir_path = _make_run_dir("resume")
+    succeeded = False
     try:
-        shutil.rmtree(tmpdir_path)
-    except Exception as e:
-        logger.warning(f"Failed to cleanup temp dir {tmpdir_path}: {e}")
+        # Copy main.tex to temp directory
+        main_tex_dest = tmpdir_path / "main.tex"
+        shutil.copy(main_tex_src, main_tex_dest)
+
+        # Write tailored resume content
+        resume_run_path = tmpdir_path / "resume-content.tex"
+        resume_run_path.write_text(tailored_content, encoding="utf-8")
+
+        logger.info("▶️ Running tectonic for resume...")
+        proc = await asyncio.create_subprocess_exec(
+            tectonic_path,
+            "--keep-intermediates",
+            "--reruns",
+            "1",
+            "main.tex",
+            cwd=tmpdir_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+
+        if proc.returncode != 0:
+            logger.error("Tectonic STDOUT:")
+            logger.error(stdout.decode())
+            logger.error("Tectonic STDERR:")
+            logger.error(stderr.decode())
+            raise Exception("Tectonic failed to compile resume PDF")
+
+        # Resume should produce main.pdf
+        pdf_path = tmpdir_path / "main.pdf"
+
+        if not pdf_path.exists():
+            logger.error("❌ main.pdf was not generated!")
+            logger.error("Files in temp directory:")
+            for f in tmpdir_path.iterdir():
+                logger.error(f"  - {f.name}")
+            raise FileNotFoundError(
+                "Resume PDF not generated by Tectonic. Check LaTeX syntax in resume-content.tex"
+            )
+
+        pdf_stream = io.BytesIO(pdf_path.read_bytes())
+        logger.info(
+            f"✅ Resume PDF compiled successfully ({len(pdf_stream.getvalue())} bytes)"
+        )
 
-    return pdf_bytes
+        succeeded = True
+        return pdf_stream
+    finally:
+        _remove_run_dir(tmpdir_path, succeeded)
 
 
-async def compile_cover_letter_to_pdf(tailored_content: str) -> bytes:
+async def compile_cover_letter_to_pdf(tailored_content: str) -> io.BytesIO:
     """
     Compiles cover letter LaTeX content to PDF using Tectonic.
     Uses main_CL.tex + CL_content.tex
+    Returns the PDF as an in-memory stream ready to hand to the uploader.
     """
     logger.info("📄 Starting Tectonic PDF compilation (COVER LETTER)")
 
@@ -96,57 +125,56 @@ async def compile_cover_letter_to_pdf(tailored_content: str) -> bytes:
         raise FileNotFoundError("main_CL.tex not found in data/ directory")
 
     # Create unique temp directory for this run
-    run_id = uuid.uuid4().hex[:8]
-    tmpdir_path = Path(f"data/tmp_debug_pdf/cl_{run_id}")
-    tmpdir_path.mkdir(parents=True, exist_ok=True)
-
-    # Copy main_CL.tex to temp directory
-    main_cl_tex_dest = tmpdir_path / "main_CL.tex"
-    shutil.copy(main_cl_tex_src, main_cl_tex_dest)
-
-    # Write tailored cover letter content
-    cl_run_path = tmpdir_path / "CL_content.tex"
-    cl_run_path.write_text(tailored_content, encoding="utf-8")
-
-    logger.info("▶️ Running tectonic for cover letter...")
-    proc = await asyncio.create_subprocess_exec(
-        tectonic_path,
-        "--keep-intermediates",
-        "--reruns",
-        "1",
-        "main_CL.tex",
-        cwd=tmpdir_path,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
-
-    if proc.returncode != 0:
-        logger.error("Tectonic STDOUT:")
-        logger.error(stdout.decode())
-        logger.error("Tectonic STDERR:")
-        logger.error(stderr.decode())
-        raise Exception("Tectonic failed to compile cover letter PDF")
-
-    # Cover letter should produce main_CL.pdf
-    pdf_path = tmpdir_path / "main_CL.pdf"
-
-    if not pdf_path.exists():
-        logger.error("❌ main_CL.pdf was not generated!")
-        logger.error("Files in temp directory:")
-        for f in tmpdir_path.iterdir():
-            logger.error(f"  - {f.name}")
-        raise FileNotFoundError(
-            "Cover letter PDF not generated by Tectonic. Check LaTeX syntax in CL_content.tex"
-        )
-
-    pdf_bytes = pdf_path.read_bytes()
-    logger.info(f"✅ Cover letter PDF compiled successfully ({len(pdf_bytes)} bytes)")
-
-    # Cleanup temporary files on success
+    tmpdir_path = _make_run_dir("cl")
+    succeeded = False
     try:
-        shutil.rmtree(tmpdir_path)
-    except Exception as e:
-        logger.warning(f"Failed to cleanup temp dir {tmpdir_path}: {e}")
+        # Copy main_CL.tex to temp directory
+        main_cl_tex_dest = tmpdir_path / "main_CL.tex"
+        shutil.copy(main_cl_tex_src, main_cl_tex_dest)
+
+        # Write tailored cover letter content
+        cl_run_path = tmpdir_path / "CL_content.tex"
+        cl_run_path.write_text(tailored_content, encoding="utf-8")
+
+        logger.info("▶️ Running tectonic for cover letter...")
+        proc = await asyncio.create_subprocess_exec(
+            tectonic_path,
+            "--keep-intermediates",
+            "--reruns",
+            "1",
+            "main_CL.tex",
+            cwd=tmpdir_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+
+        if proc.returncode != 0:
+            logger.error("Tectonic STDOUT:")
+            logger.error(stdout.decode())
+            logger.error("Tectonic STDERR:")
+            logger.error(stderr.decode())
+            raise Exception("Tectonic failed to compile cover letter PDF")
+
+        # Cover letter should produce main_CL.pdf
+        pdf_path = tmpdir_path / "main_CL.pdf"
+
+        if not pdf_path.exists():
+            logger.error("❌ main_CL.pdf was not generated!")
+            logger.error("Files in temp directory:")
+            for f in tmpdir_path.iterdir():
+                logger.error(f"  - {f.name}")
+            raise FileNotFoundError(
+                "Cover letter PDF not generated by Tectonic. Check LaTeX syntax in CL_content.tex"
+            )
+
+        pdf_stream = io.BytesIO(pdf_path.read_bytes())
+        logger.info(
+            f"✅ Cover letter PDF compiled successfully "
+            f"({len(pdf_stream.getvalue())} bytes)"
+        )
 
-    return pdf_bytes
+        succeeded = True
+        return pdf_stream
+    finally:
+        _remove_run_dir(tmpdir_path, succeeded)
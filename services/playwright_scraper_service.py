@@ -156,11 +156,15 @@
 Robust fallback scraper using Playwright
 Now includes unavailable job detection
 """
-from playwright.async_api import async_playwright, TimeoutError
+from playwright.async_api import TimeoutError
+import asyncio
 import logging
 import os
+import re
 from datetime import datetime
 
+from services.browser_pool_service import run_with_browser
+
 logger = logging.getLogger(__name__)
 
 DEBUG_SCRAPE_DIR = "scrape_debug"
@@ -203,6 +207,64 @@ async def _scroll_page(page):
         await page.wait_for_timeout(600)
 
 
+# (pattern, reason) pairs, matched case-insensitively in the text or title
+UNAVAILABLE_PATTERNS = [
+    ("position has been filled", "Position already filled"),
+    ("this job is no longer available", "Job posting closed"),
+    ("posting has expired", "Posting expired"),
+    ("job posting is no longer active", "Job no longer active"),
+    ("position is no longer open", "Position closed"),
+    ("this position has been closed", "Position closed"),
+    (
+        "sorry, this job is no longer accepting applications",
+        "No longer accepting applications",
+    ),
+    ("this opportunity is no longer available", "Opportunity closed"),
+]
+
+# Specific 404 patterns, only trusted near the top of the page
+NOT_FOUND_PATTERNS = [
+    ("error 404", "Page not found (404)"),
+    ("http 404", "Page not found (404)"),
+    ("404 not found", "Page not found (404)"),
+    ("404 error", "Page not found (404)"),
+]
+
+JOB_INDICATORS = [
+    "responsibilities",
+    "requirements",
+    "qualifications",
+    "about the role",
+    "what you'll do",
+    "job description",
+    "apply now",
+    "skills",
+    "experience",
+]
+
+
+def _alternation(patterns: list[tuple[str, str]], prefix: str) -> re.Pattern:
+    """Compile (pattern, reason) pairs into one regex with a group per pattern."""
+    return re.compile(
+        "|".join(
+            f"(?P<{prefix}{i}>{re.escape(pattern)})"
+            for i, (pattern, _) in enumerate(patterns)
+        ),
+        re.IGNORECASE,
+    )
+
+
+_UNAVAILABLE_RE = _alternation(UNAVAILABLE_PATTERNS, "u")
+_NOT_FOUND_RE = _alternation(NOT_FOUND_PATTERNS, "n")
+_PATTERN_REASONS = {
+    **{f"u{i}": reason for i, (_, reason) in enumerate(UNAVAILABLE_PATTERNS)},
+    **{f"n{i}": reason for i, (_, reason) in enumerate(NOT_FOUND_PATTERNS)},
+}
+_JOB_INDICATOR_RE = re.compile(
+    "|".join(map(re.escape, JOB_INDICATORS)), re.IGNORECASE
+)
+
+
 def detect_unavailable_in_text(text: str, title: str) -> tuple[bool, str | None]:
     """
     Detect if scraped content indicates job is unavailable.
@@ -213,63 +275,21 @@ def detect_unavailable_in_text(text: str, title: str) -> tuple[bool, str | None]
     if not text or len(text.strip()) < 100:
         return True, "Page content too short or empty"
 
-    text_lower = text.lower()
-    title_lower = title.lower()
-
-    # Check for unavailable patterns
-    unavailable_patterns = [
-        ("position has been filled", "Position already filled"),
-        ("this job is no longer available", "Job posting closed"),
-        ("posting has expired", "Posting expired"),
-        ("job posting is no longer active", "Job no longer active"),
-        ("position is no longer open", "Position closed"),
-        ("this position has been closed", "Position closed"),
-        (
-            "sorry, this job is no longer accepting applications",
-            "No longer accepting applications",
-        ),
-        ("this opportunity is no longer available", "Opportunity closed"),
-        # Specific 404 patterns
-        ("error 404", "Page not found (404)"),
-        ("http 404", "Page not found (404)"),
-        ("404 not found", "Page not found (404)"),
-        ("404 error", "Page not found (404)"),
-    ]
-
-    for pattern, reason in unavailable_patterns:
-        if pattern in text_lower or pattern in title_lower:
-            # Extra validation for "404" patterns - check context
-            if "404" in pattern:
-                # Check if it appears early in content (likely header)
-                if pattern in text_lower[:500]:
-                    logger.warning(f"[Scraper] 🚫 Detected unavailable: {reason}")
-                    return True, reason
-                # Or if total content is very short
-                elif len(text) < 500:
-                    logger.warning(f"[Scraper] 🚫 Detected unavailable: {reason}")
-                    return True, reason
-                # Otherwise skip (likely false positive)
-                else:
-                    continue
-            else:
-                # Non-404 patterns - trigger immediately
-                logger.warning(f"[Scraper] 🚫 Detected unavailable: {reason}")
-                return True, reason
+    match = _UNAVAILABLE_RE.search(text) or _UNAVAILABLE_RE.search(title)
+    if match is None:
+        # 404 patterns only count early in the content (likely header), or
+        # anywhere incl. the title when the page is very short; otherwise
+        # they are likely false positives
+        match = _NOT_FOUND_RE.search(text, 0, 500)
+        if match is None and len(text) < 500:
+            match = _NOT_FOUND_RE.search(title)
+    if match is not None:
+        reason = _PATTERN_REASONS[match.lastgroup]
+        logger.warning(f"[Scraper] 🚫 Detected unavailable: {reason}")
+        return True, reason
 
     # Validate actual job content exists
-    job_indicators = [
-        "responsibilities",
-        "requirements",
-        "qualifications",
-        "about the role",
-        "what you'll do",
-        "job description",
-        "apply now",
-        "skills",
-        "experience",
-    ]
-
-    has_job_content = any(indicator in text_lower for indicator in job_indicators)
+    has_job_content = _JOB_INDICATOR_RE.search(text) is not None
 
     if not has_job_content and len(text) < 800:
         return True, "No job description found - possibly removed or expired"
@@ -282,6 +302,7 @@ async def playwright_scrape_job(url: str) -> dict:
     Robust scraping with Playwright.
 
     Features:
+    - Shared, pre-launched Chromium (fresh context per job)
     - Multiple retries with exponential backoff
     - Longer timeouts than Crawl4AI
     - Scroll and expand content
@@ -291,6 +312,11 @@ async def playwright_scrape_job(url: str) -> dict:
     - JobUnavailableError: If job is no longer available
     - Exception: For other scraping failures
     """
+    return await run_with_browser(_scrape_with_browser, url)
+
+
+async def _scrape_with_browser(browser, url: str) -> dict:
+    """Scrape loop, run on the browser pool's event loop."""
     logger.info(f"[Scraper] Starting scrape: {url}")
 
     max_retries = 3
@@ -300,80 +326,69 @@ async def playwright_scrape_job(url: str) -> dict:
 
     for attempt in range(max_retries):
         timeout = base_timeout + (attempt * 10000)  # Increase timeout each retry
+        context = None
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-dev-shm-usage",  # Better for containerized environments
-                    ],
-                )
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 13_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117 Safari/537.36",
-                    viewport={"width": 1280, "height": 900},
-                )
-                page = await context.new_page()
+            context = await browser.new_context(
+                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 13_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117 Safari/537.36",
+                viewport={"width": 1280, "height": 900},
+            )
+            page = await context.new_page()
 
-                # Navigate with progressive timeout
-                logger.info(
-                    f"[Scraper] Attempt {attempt + 1}/{max_retries} (timeout: {timeout}ms)"
-                )
+            # Navigate with progressive timeout
+            logger.info(
+                f"[Scraper] Attempt {attempt + 1}/{max_retries} (timeout: {timeout}ms)"
+            )
 
-                try:
-                    response = await page.goto(
-                        url, wait_until="networkidle", timeout=timeout
-                    )
+            try:
+                response = await page.goto(
+                    url, wait_until="networkidle", timeout=timeout
+                )
 
-                    # Check HTTP status
-                    if response and response.status >= 400:
-                        if response.status == 404:
-                            raise JobUnavailableError("HTTP 404 - Page not found")
-                        elif response.status == 410:
-                            raise JobUnavailableError("HTTP 410 - Page gone")
-                        else:
-                            logger.warning(
-                                f"[Scraper] HTTP {response.status} - may retry"
-                            )
-                            raise Exception(f"HTTP {response.status}")
-
-                except TimeoutError:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"[Scraper] Navigation timeout, retrying...")
-                        await page.wait_for_timeout(2000)
-                        continue
+                # Check HTTP status
+                if response and response.status >= 400:
+                    if response.status == 404:
+                        raise JobUnavailableError("HTTP 404 - Page not found")
+                    elif response.status == 410:
+                        raise JobUnavailableError("HTTP 410 - Page gone")
                     else:
-                        raise
-
-                # Scroll + Expand content
-                await _scroll_page(page)
-                await _expand_page(page)
-                await _scroll_page(page)
-
-                # Extract content
-                html = await page.content()
-                text = await page.inner_text("body")
-                title = await page.title()
+                        logger.warning(f"[Scraper] HTTP {response.status} - may retry")
+                        raise Exception(f"HTTP {response.status}")
 
-                await browser.close()
-
-                # Early detection of unavailable jobs
-                is_unavailable, reason = detect_unavailable_in_text(text, title)
-                if is_unavailable:
-                    logger.warning(f"[Scraper] 🚫 Job unavailable: {reason}")
-                    raise JobUnavailableError(reason)
-
-                # Success!
-                logger.info(f"[Scraper] ✅ Successfully scraped: {title}")
-                logger.info(f"[Scraper] Extracted {len(text)} characters of text")
-
-                return {
-                    "url": url,
-                    "html": html,
-                    "text": text,
-                    "title": title,
-                }
+            except TimeoutError:
+                if attempt < max_retries - 1:
+                    logger.warning(f"[Scraper] Navigation timeout, retrying...")
+                    await page.wait_for_timeout(2000)
+                    continue
+                else:
+                    raise
+
+            # Scroll + Expand content
+            await _scroll_page(page)
+            await _expand_page(page)
+            await _scroll_page(page)
+
+            # Extract content
+            html, text, title = await asyncio.gather(
+                page.content(), page.inner_text("body"), page.title()
+            )
+
+            # Early detection of unavailable jobs
+            is_unavailable, reason = detect_unavailable_in_text(text, title)
+            if is_unavailable:
+                logger.warning(f"[Scraper] 🚫 Job unavailable: {reason}")
+                raise JobUnavailableError(reason)
+
+            # Success!
+            logger.info(f"[Scraper] ✅ Successfully scraped: {title}")
+            logger.info(f"[Scraper] Extracted {len(text)} characters of text")
+
+            return {
+                "url": url,
+                "html": html,
+                "text": text,
+                "title": title,
+            }
 
         except JobUnavailableError:
             # Don't retry for unavailable jobs - bubble up immediately
@@ -386,8 +401,6 @@ async def playwright_scrape_job(url: str) -> dict:
                 wait_time = 2000 + (attempt * 1000)  # Progressive backoff
                 logger.info(f"[Scraper] Waiting {wait_time}ms before retry...")
                 # Can't use page.wait_for_timeout here as page may be closed
-                import asyncio
-
                 await asyncio.sleep(wait_time / 1000)
 
         except Exception as e:
@@ -416,12 +429,13 @@ async def playwright_scrape_job(url: str) -> dict:
             if attempt < max_retries - 1:
                 logger.info(f"[Scraper] Retrying after error...")
 
-            # Clean up browser before retry
-            try:
-                if "browser" in locals():
-                    await browser.close()
-            except:
-                pass
+        finally:
+            # Only the per-job context is closed, the browser stays warm
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
 
     # All retries exhausted
     error_msg = f"Scraping failed after {max_retries} attempts: {str(last_error)}"
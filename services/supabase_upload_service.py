@@ -96,6 +96,8 @@
 
 
 # services/supabase_upload_service.py
+import asyncio
+import io
 import logging
 import os
 from datetime import datetime
@@ -106,12 +108,19 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+_supabase_client: Client | None = None
+
 
 def get_supabase_client() -> Client:
     """
-    Initializes a Supabase client using SERVICE_ROLE_KEY (more privileged)
-    or environment variables.
+    Returns a process-wide Supabase client using SERVICE_ROLE_KEY (more privileged)
+    from environment variables. The client is created once and reused so storage
+    uploads share its pooled connections.
     """
+    global _supabase_client
+    if _supabase_client is not None:
+        return _supabase_client
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for RLS bypass
 
@@ -120,11 +129,27 @@ def get_supabase_client() -> Client:
             "❌ Missing SUPABASE_URL or SUPABASE_SERVICE_KEY in environment"
         )
 
-    return create_client(url, key)
+    _supabase_client = create_client(url, key)
+    return _supabase_client
+
+
+def _upload(supabase: Client, bucket_name: str, filename: str, pdf_data: bytes) -> str:
+    """Blocking upload of one PDF; returns its public URL."""
+    bucket = supabase.storage.from_(bucket_name)
+    response = bucket.upload(
+        path=filename,
+        file=pdf_data,
+        file_options={"content-type": "application/pdf"},
+    )
+
+    if hasattr(response, "error") and response.error:
+        raise Exception(f"Upload error: {response.error}")
+
+    return bucket.get_public_url(filename)
 
 
 async def upload_pdf_to_supabase(
-    pdf_bytes: bytes,
+    pdf_stream: io.BytesIO,
     position: str,
     company: str,
     document_type: str = "resume",  # "resume" or "cover_letter"
@@ -142,7 +167,7 @@ async def upload_pdf_to_supabase(
     - Cover Letter: "cover-letters"
 
     Args:
-        pdf_bytes: PDF data as bytes
+        pdf_stream: PDF data as an in-memory stream (io.BytesIO from compilation)
         position: Job title / position
         company: Company name
         document_type: "resume" or "cover_letter"
@@ -159,6 +184,10 @@ async def upload_pdf_to_supabase(
     """
     supabase = get_supabase_client()
 
+    # An unmodified BytesIO hands back the buffer it wraps, so this does not copy
+    pdf_data = pdf_stream.getvalue()
+    pdf_size = len(pdf_data)
+
     # Sanitize inputs
     def sanitize(s: str) -> str:
         s = s.strip().replace(" ", "_")
@@ -189,27 +218,21 @@ async def upload_pdf_to_supabase(
         f"📤 Uploading {document_type} PDF to Supabase bucket '{bucket_name}'..."
     )
     logger.info(f"   • Filename: {filename}")
-    logger.info(f"   • Size: {len(pdf_bytes)} bytes")
+    logger.info(f"   • Size: {pdf_size} bytes")
 
     try:
-        response = supabase.storage.from_(bucket_name).upload(
-            path=filename,
-            file=pdf_bytes,
-            file_options={"content-type": "application/pdf"},
+        # The storage client is synchronous; keep it off the event loop
+        public_url = await asyncio.to_thread(
+            _upload, supabase, bucket_name, filename, pdf_data
         )
 
-        if hasattr(response, "error") and response.error:
-            raise Exception(f"Upload error: {response.error}")
-
-        public_url = supabase.storage.from_(bucket_name).get_public_url(filename)
-
         logger.info(f"✅ {document_type.title()} upload successful!")
         logger.info(f"   • Public URL: {public_url}")
 
         return {
             "status": "success",
             "path": filename,
-            "size": len(pdf_bytes),
+            "size": pdf_size,
             "public_url": public_url,
             "document_type": document_type,
         }
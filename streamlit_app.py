@@ -671,37 +671,25 @@ STAGE_CONFIG = {
         "order": 3,
         "progress": 35,
     },
-    "tailoring_resume": {
+    "tailoring_documents": {
         "emoji": "📄",
-        "label": "Tailoring Resume",
+        "label": "Tailoring Resume + CL",
         "order": 4,
         "progress": 45,
     },
-    "compiling_resume_pdf": {
+    "compiling_pdfs": {
         "emoji": "📑",
-        "label": "Compiling Resume PDF",
+        "label": "Compiling PDFs",
         "order": 5,
-        "progress": 55,
-    },
-    "tailoring_cover_letter": {
-        "emoji": "✉️",
-        "label": "Tailoring Cover Letter",
-        "order": 6,
-        "progress": 65,
-    },
-    "compiling_cover_letter_pdf": {
-        "emoji": "📨",
-        "label": "Compiling CL PDF",
-        "order": 7,
-        "progress": 75,
+        "progress": 60,
     },
     "saving_to_notion": {
         "emoji": "💾",
         "label": "Saving to Notion",
-        "order": 8,
+        "order": 6,
         "progress": 85,
     },
-    "complete": {"emoji": "✅", "label": "Complete", "order": 9, "progress": 100},
+    "complete": {"emoji": "✅", "label": "Complete", "order": 7, "progress": 100},
     "queued": {"emoji": "⏳", "label": "Queued", "order": -1, "progress": 0},
     "pending": {"emoji": "⏳", "label": "Pending", "order": -1, "progress": 0},
     "failed": {"emoji": "❌", "label": "Failed", "order": -1, "progress": 0},
@@ -711,10 +699,8 @@ PIPELINE_STAGES = [
     "duplicate_check",
     "extracting",
     "evaluating",
-    "tailoring_resume",
-    "compiling_resume_pdf",
-    "tailoring_cover_letter",
-    "compiling_cover_letter_pdf",
+    "tailoring_documents",
+    "compiling_pdfs",
     "saving_to_notion",
     "complete",
 ]
@@ -815,7 +801,7 @@ def retry_job(url: str, force_playwright: bool = False) -> Dict:
             json={"url": url, "force_playwright": force_playwright},
             timeout=10,
         )
-        if response.status_code == 200:
+        if response.status_code in (200, 202):
             return response.json()
     except Exception as e:
         return {"error": str(e)}
@@ -16,10 +16,10 @@ async def main():
     tailored_content = debug_file.read_text(encoding="utf-8")
 
     try:
-        pdf_bytes = await compile_resume_to_pdf(tailored_content)
+        pdf_stream = await compile_resume_to_pdf(tailored_content)
         # Save locally so you can inspect
         out_path = Path("data/debug-output.pdf")
-        out_path.write_bytes(pdf_bytes)
+        out_path.write_bytes(pdf_stream.getvalue())
         logger.info(f"✅ PDF successfully compiled and saved to {out_path.resolve()}")
     except Exception as e:
         logger.exception(f"❌ PDF compilation failed: {e}")
@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import sys
+from pathlib import Path
+
+# Services read their credentials at import time; tests never reach the APIs
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("NOTION_API_KEY", "test-key")
+os.environ.setdefault("NOTION_DATABASE_ID", "test-db")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,152 @@
+# tests/test_duplicate_checker_service.py
+import asyncio
+
+import orjson
+import pytest
+
+import services.duplicate_checker_service as dup
+
+JOB_URL = "https://example.com/jobs/123"
+
+
+class FakeNotion:
+    """Stands in for the shared HTTP client; serves `responses` in order."""
+
+    def __init__(self, responses=None):
+        self.queries = 0
+        self.payloads = []
+        self.responses = list(responses or [])
+
+    async def post(self, url, headers=None, content=None, timeout=None):
+        self.queries += 1
+        self.payloads.append(orjson.loads(content))
+        if self.responses:
+            return FakeResponse(self.responses.pop(0))
+        return FakeResponse({"results": []})
+
+
+def _page(job_url: str, page_id: str) -> dict:
+    return {
+        "id": page_id,
+        "url": f"https://notion.so/{page_id}",
+        "properties": {"Job Posting": {"url": job_url}},
+    }
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self.status_code = 200
+        self.content = orjson.dumps(data)
+        self.text = self.content.decode()
+
+
+class FakeRedis:
+    """In-memory replacement for the Redis tier (TTLs are not modelled)."""
+
+    def __init__(self):
+        self.store = {}
+        self.round_trips = 0
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl):
+        self.round_trips += 1
+        self.store[key] = value
+
+    async def get_many(self, keys):
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    async def set_many(self, entries):
+        self.round_trips += 1
+        for key, value, ttl in entries:
+            self.store[key] = value
+
+
+@pytest.fixture
+def redis_store(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(dup, "async_cache_get_json", fake.get)
+    monkeypatch.setattr(dup, "async_cache_set_json", fake.set)
+    monkeypatch.setattr(dup, "async_cache_get_many_json", fake.get_many)
+    monkeypatch.setattr(dup, "async_cache_set_many_json", fake.set_many)
+    monkeypatch.setattr(dup, "_local_cache", type(dup._local_cache)())
+    return fake
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    fake = FakeNotion()
+    monkeypatch.setattr(dup, "get_http", lambda: fake)
+    return fake
+
+
+def test_save_after_cached_miss_is_reported_as_duplicate(redis_store, notion):
+    async def scenario():
+        first = await dup.check_if_job_exists(JOB_URL)
+        await dup.remember_saved_job(
+            JOB_URL,
+            "Engineer @ Acme",
+            {"notion_url": "https://notion.so/page", "notion_page_id": "page-1"},
+        )
+        return first, await dup.check_if_job_exists(JOB_URL)
+
+    first, second = asyncio.run(scenario())
+
+    assert first["exists"] is False
+    assert second["exists"] is True
+    assert second["notion_page_id"] == "page-1"
+    # The second answer came from the cache, not from Notion
+    assert notion.queries == 1
+
+
+def test_save_in_another_process_overrides_cached_miss(redis_store, notion):
+    async def scenario():
+        await dup.check_if_job_exists(JOB_URL)
+        # Another worker saves the job: it shares Redis but not our local tier
+        local_tier = dict(dup._local_cache)
+        await dup.remember_saved_job(JOB_URL, "Engineer @ Acme", {})
+        dup._local_cache.clear()
+        dup._local_cache.update(local_tier)
+        return await dup.check_if_job_exists(JOB_URL)
+
+    assert asyncio.run(scenario())["exists"] is True
+
+
+def test_local_tier_only_keeps_positive_results(redis_store, notion):
+    asyncio.run(dup.check_if_job_exists(JOB_URL))
+
+    assert dup._local_get(dup.url_cache_key("dup", JOB_URL)) is None
+
+
+def test_batch_check_follows_every_result_page(redis_store, monkeypatch):
+    urls = [f"https://example.com/jobs/{i}" for i in range(3)]
+    # The first page is filled by repeat saves of job 0; job 2 is on page two
+    notion = FakeNotion(
+        [
+            {
+                "results": [_page(urls[0], "a"), _page(urls[0], "b")],
+                "has_more": True,
+                "next_cursor": "cursor-2",
+            },
+            {"results": [_page(urls[2], "c")], "has_more": False},
+        ]
+    )
+    monkeypatch.setattr(dup, "get_http", lambda: notion)
+
+    results = asyncio.run(dup.check_jobs_exist_batch(urls))
+
+    assert [results[url]["exists"] for url in urls] == [True, False, True]
+    assert notion.payloads[1]["start_cursor"] == "cursor-2"
+
+
+def test_batch_check_uses_one_cache_read_and_one_write(redis_store, notion):
+    urls = [f"https://example.com/jobs/{i}" for i in range(50)]
+
+    asyncio.run(dup.check_jobs_exist_batch(urls))
+
+    assert notion.queries == 1
+    assert redis_store.round_trips == 2
+    assert len(redis_store.store) == 50
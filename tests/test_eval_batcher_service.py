@@ -0,0 +1,75 @@
+# tests/test_eval_batcher_service.py
+import asyncio
+import json
+from types import SimpleNamespace
+
+import services.eval_batcher_service as batcher
+import services.llm_evaluation_service as evaluation
+
+
+def _score(job_text: str) -> int:
+    return int(job_text.rsplit(" ", 1)[-1])
+
+
+def test_co_batched_jobs_get_their_own_scores_in_order(monkeypatch):
+    batches = []
+
+    async def fake_single(job_text, visa_warning=None):
+        # Keeps the batcher busy, so the jobs that follow are batched
+        await asyncio.sleep(0.05)
+        return {"match_score": _score(job_text), "visa_warning": visa_warning}
+
+    async def fake_batch(jobs):
+        batches.append([job_text for job_text, _ in jobs])
+        return [
+            {"match_score": _score(job_text), "visa_warning": visa_warning}
+            for job_text, visa_warning in jobs
+        ]
+
+    monkeypatch.setattr(batcher, "evaluate_job_match", fake_single)
+    monkeypatch.setattr(batcher, "evaluate_jobs_batch", fake_batch)
+
+    async def scenario():
+        first = asyncio.create_task(batcher.submit_evaluation("job 10"))
+        await asyncio.sleep(0.01)
+        rest = await asyncio.gather(
+            *(
+                batcher.submit_evaluation(f"job {score}", visa_warning=f"visa {score}")
+                for score in (71, 42, 93, 55)
+            )
+        )
+        return await first, rest
+
+    first, rest = asyncio.run(scenario())
+
+    assert first["match_score"] == 10
+    assert batches == [["job 71", "job 42", "job 93", "job 55"]]
+    assert [(r["match_score"], r["visa_warning"]) for r in rest] == [
+        (71, "visa 71"),
+        (42, "visa 42"),
+        (93, "visa 93"),
+        (55, "visa 55"),
+    ]
+
+
+def test_batched_evaluations_keep_job_order(monkeypatch):
+    async def fake_create(**request):
+        content = json.dumps(
+            {"evaluations": [{"match_score": 80}, {"match_score": 30}]}
+        )
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    fake_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+    )
+    monkeypatch.setattr(evaluation, "client", fake_client)
+    monkeypatch.setattr(evaluation, "load_master_resume", lambda: "resume")
+
+    results = asyncio.run(
+        evaluation.evaluate_jobs_batch([("job a", None), ("job b", "No sponsorship")])
+    )
+
+    assert [r["match_score"] for r in results] == [80, 30]
+    assert "visa_warning" not in results[0]
+    assert results[1]["visa_warning"] == "No sponsorship"
@@ -0,0 +1,174 @@
+# tests/test_job_processor_service.py
+import asyncio
+
+import pytest
+
+import services.job_processor_service as jp
+
+JOB_URL = "https://example.com/jobs/123"
+
+
+class FakeExtraction:
+    """Replaces the real extraction; finishes only when release() is called."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = False
+        self.released = None
+
+    async def __call__(self, url, force_playwright=False, force_refresh=False):
+        self.calls += 1
+        try:
+            await self.released.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"url": url, "job_title": "Engineer", "skills": ["python"]}
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def extraction(monkeypatch):
+    fake = FakeExtraction()
+    monkeypatch.setattr(jp, "_extract_job_data", fake)
+    monkeypatch.setattr(jp, "_INFLIGHT", {})
+    return fake
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_calls_share_one_extraction(extraction):
+    async def scenario():
+        extraction.released = asyncio.Event()
+        first = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        second = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        await _settle()
+        extraction.release()
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+
+    assert extraction.calls == 1
+    assert first == second
+    # Each caller gets its own copy to mutate
+    assert first is not second and first["skills"] is not second["skills"]
+    assert jp._INFLIGHT == {}
+
+
+def test_cancelling_one_of_two_callers_keeps_the_run(extraction):
+    async def scenario():
+        extraction.released = asyncio.Event()
+        cancelled = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        survivor = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        await _settle()
+
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        await _settle()
+        assert not extraction.cancelled
+
+        extraction.release()
+        return cancelled, await survivor
+
+    cancelled, result = asyncio.run(scenario())
+
+    assert cancelled.cancelled()
+    assert result["job_title"] == "Engineer"
+    assert extraction.calls == 1
+    assert not extraction.cancelled
+
+
+def test_cancelling_the_only_caller_stops_the_run(extraction):
+    async def scenario():
+        extraction.released = asyncio.Event()
+        caller = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        await _settle()
+
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        # The run is gone, so the next call starts a fresh extraction
+        assert jp._INFLIGHT == {}
+        return caller
+
+    caller = asyncio.run(scenario())
+
+    assert caller.cancelled()
+    assert extraction.cancelled
+
+
+def test_cached_extraction_skips_crawling(monkeypatch):
+    async def fake_cache_get(key):
+        return {
+            "url": JOB_URL,
+            "job_title": "Engineer",
+            "extraction_method": "crawl4ai",
+        }
+
+    async def unexpected_crawl(url):
+        raise AssertionError("a cached URL should not be crawled")
+
+    monkeypatch.setattr(jp, "async_cache_get_json", fake_cache_get)
+    monkeypatch.setattr(jp, "_crawl4ai_attempt", unexpected_crawl)
+    monkeypatch.setattr(jp, "_INFLIGHT", {})
+
+    result = asyncio.run(jp.extract_job_data(JOB_URL + "?utm_source=feed"))
+
+    assert result["extraction_method"] == "cache"
+    assert result["cached_extraction_method"] == "crawl4ai"
+    # Saved to Notion under the URL this caller submitted
+    assert result["url"] == JOB_URL + "?utm_source=feed"
+
+
+def test_hedged_playwright_win_counts_as_crawl4ai_failure(monkeypatch):
+    outcomes = []
+
+    async def no_cache(key):
+        return None
+
+    async def ignore_write(key, value, ttl):
+        pass
+
+    async def hanging_crawl(url):
+        await asyncio.sleep(10)
+
+    async def quick_playwright(url):
+        return {"url": url, "job_title": "Engineer", "extraction_method": "playwright"}
+
+    async def fake_prefers(domain):
+        return False
+
+    async def fake_record(domain, path, success):
+        outcomes.append((domain, path, success))
+
+    monkeypatch.setattr(jp, "async_cache_get_json", no_cache)
+    monkeypatch.setattr(jp, "async_cache_set_json", ignore_write)
+    monkeypatch.setattr(jp, "_crawl4ai_attempt", hanging_crawl)
+    monkeypatch.setattr(jp, "_playwright_path", quick_playwright)
+    monkeypatch.setattr(jp, "_prefers_playwright", fake_prefers)
+    monkeypatch.setattr(jp, "_record_domain_outcome", fake_record)
+    monkeypatch.setattr(jp, "HEDGE_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(jp, "_INFLIGHT", {})
+
+    result = asyncio.run(jp.extract_job_data(JOB_URL))
+
+    assert result["extraction_method"] == "playwright"
+    assert outcomes == [("example.com", "crawl4ai", False)]
+
+
+def test_forced_refresh_does_not_join_a_normal_run(extraction):
+    async def scenario():
+        extraction.released = asyncio.Event()
+        normal = asyncio.create_task(jp.extract_job_data(JOB_URL))
+        refresh = asyncio.create_task(jp.extract_job_data(JOB_URL, force_refresh=True))
+        await _settle()
+        extraction.release()
+        await asyncio.gather(normal, refresh)
+
+    asyncio.run(scenario())
+
+    assert extraction.calls == 2
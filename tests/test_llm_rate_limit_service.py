@@ -0,0 +1,69 @@
+# tests/test_llm_rate_limit_service.py
+import asyncio
+import threading
+
+import pytest
+
+import services.llm_rate_limit_service as rl
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = rl._Limiter(2)
+    monkeypatch.setattr(rl, "_limiter", limiter)
+    monkeypatch.setattr(rl, "OPENAI_RPM", 0)
+    return limiter
+
+
+def test_slots_are_shared_across_event_loops(limiter):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    async def request():
+        nonlocal in_flight, peak
+        async with rl.openai_slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+    async def burst():
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    # e.g. the worker loop and the eval batcher loop of one process
+    threads = [threading.Thread(target=asyncio.run, args=(burst(),)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter.free == 2 and not limiter.waiters
+
+
+def test_cancelled_waiter_does_not_leak_a_slot(limiter):
+    async def scenario():
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        limiter.release()
+
+    asyncio.run(scenario())
+
+    assert limiter.free == 2 and not limiter.waiters
+
+
+def test_rpm_spaces_request_starts(limiter, monkeypatch):
+    monkeypatch.setattr(rl, "OPENAI_RPM", 600)  # one start per 0.1s
+
+    delays = [limiter.reserve_start() for _ in range(3)]
+
+    assert delays[0] == 0
+    assert delays[2] == pytest.approx(0.2, abs=0.05)
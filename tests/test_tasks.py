@@ -0,0 +1,145 @@
+# tests/test_tasks.py
+import asyncio
+
+import pytest
+
+import app.tasks as tasks
+import services.job_processor_service as job_processor
+
+JOB_URL = "https://example.com/jobs/123"
+
+NORMALIZED = {
+    "url": JOB_URL,
+    "job_title": "Engineer",
+    "company_name": "Acme",
+    "job_description": "Build things",
+    "extraction_method": "crawl4ai",
+}
+
+
+class FakeProgress:
+    def __init__(self):
+        self.stages = []
+
+    def update_state(self, state=None, meta=None):
+        self.stages.append(meta["stage"])
+
+
+class SlowExtraction:
+    """Extraction that only finishes when released, recording cancellation."""
+
+    def __init__(self):
+        self.cancelled = False
+        self.released = None
+
+    async def __call__(self, url, force_playwright=False, force_refresh=False):
+        try:
+            await self.released.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return dict(NORMALIZED)
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def extraction(monkeypatch):
+    fake = SlowExtraction()
+    monkeypatch.setattr(tasks, "extract_job_data", fake)
+    return fake
+
+
+def test_duplicate_cancels_speculative_extraction(monkeypatch, extraction):
+    async def fake_check(url):
+        await asyncio.sleep(0)  # extraction is under way by now
+        return {"exists": True, "message": "Job already exists: Engineer @ Acme"}
+
+    monkeypatch.setattr(tasks, "check_if_job_exists", fake_check)
+
+    async def scenario():
+        extraction.released = asyncio.Event()
+        return await tasks.process_job_pipeline(FakeProgress(), JOB_URL, False)
+
+    result = asyncio.run(scenario())
+
+    assert result["status"] == "duplicate"
+    assert extraction.cancelled
+
+
+def test_duplicate_stops_the_shared_extraction_run(monkeypatch):
+    """The cancel reaches the real run behind extract_job_data's singleflight."""
+    run = SlowExtraction()
+
+    async def fake_run(url, force_playwright=False, force_refresh=False):
+        return await run(url, force_playwright)
+
+    async def fake_check(url):
+        await asyncio.sleep(0)
+        return {"exists": True, "message": "Job already exists: Engineer @ Acme"}
+
+    monkeypatch.setattr(job_processor, "_extract_job_data", fake_run)
+    monkeypatch.setattr(job_processor, "_INFLIGHT", {})
+    monkeypatch.setattr(tasks, "check_if_job_exists", fake_check)
+
+    async def scenario():
+        run.released = asyncio.Event()
+        return await tasks.process_job_pipeline(FakeProgress(), JOB_URL, False)
+
+    result = asyncio.run(scenario())
+
+    assert result["status"] == "duplicate"
+    assert run.cancelled
+    assert job_processor._INFLIGHT == {}
+
+
+def test_new_job_uses_speculative_extraction(monkeypatch, extraction):
+    saved = []
+
+    async def fake_check(url):
+        extraction.release()
+        return {"exists": False, "message": "Job URL is new"}
+
+    async def fake_evaluation(job_text, visa_warning=None):
+        return {"match_score": 40}
+
+    async def fake_save(job_data, **documents):
+        saved.append(job_data)
+        return {"notion_page_id": "page-1"}
+
+    async def fake_remember(job_url, job_title, notion_result):
+        pass
+
+    monkeypatch.setattr(tasks, "check_if_job_exists", fake_check)
+    monkeypatch.setattr(tasks, "submit_evaluation", fake_evaluation)
+    monkeypatch.setattr(tasks, "save_job_to_notion", fake_save)
+    monkeypatch.setattr(tasks, "remember_saved_job", fake_remember)
+
+    async def scenario():
+        extraction.released = asyncio.Event()
+        return await tasks.process_job_pipeline(FakeProgress(), JOB_URL, False)
+
+    result = asyncio.run(scenario())
+
+    assert result["status"] == "success"
+    assert result["job_info"]["title"] == "Engineer"
+    assert saved[0]["title"] == "Engineer @ Acme"
+    assert not extraction.cancelled
+
+
+def test_unchanged_resume_reuses_uploaded_pdf(monkeypatch):
+    async def fake_cached_url(tex, document_type):
+        return "https://cdn.example.com/resume.pdf"
+
+    async def unexpected_compile(tex):
+        raise AssertionError("cached PDF should not be recompiled")
+
+    monkeypatch.setattr(tasks, "get_cached_pdf_url", fake_cached_url)
+    monkeypatch.setattr(tasks, "compile_resume_to_pdf", unexpected_compile)
+
+    url = asyncio.run(
+        tasks._do_resume({"tailored_content": "\\section{}"}, "Engineer", "Acme")
+    )
+
+    assert url == "https://cdn.example.com/resume.pdf"